@@ -0,0 +1,464 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from datetime import datetime, timedelta
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from gspread.utils import fill_gaps
+from carregamento import executar_uma_vez
+from ingestao import compactar_dtypes
+from particoes import ABAS_PARTICIONADAS, anos_meses, chaves_particao, chaves_particao_valores
+
+# Diretório local dos snapshots (sobrevive a reinícios e ao sleep/wake do Streamlit Cloud)
+# As abas lidas em blocos (vendas, comissão) são gravadas já tipadas; as demais ficam no texto
+# da API: são pequenas, a aba de serviços terceirizados é usada como matriz e as colunas fora
+# do esquema misturam números e textos (numericise), o que não cabe numa coluna Parquet
+DIRETORIO_CACHE = os.environ.get('PAINEL_CACHE_DIR', '.cache_planilhas')
+
+# Chaves de metadados: horário da busca no Google, versão de uma partição e total de linhas da aba
+META_BUSCADO_EM = b'buscado_em'
+META_VERSAO = b'versao'
+META_TOTAL_LINHAS = b'total_linhas'
+# Snapshot de um DataFrame já tipado (abas lidas em blocos), em vez da matriz de textos
+META_TIPADO = b'tipado'
+
+# Arquivo do cabeçalho nos snapshots particionados por mês
+ARQUIVO_CABECALHO = '_cabecalho'
+
+# Idade dos valores servidos a partir da qual a versão da planilha é conferida de novo no Google
+# (em segundo plano; só baixa valores se a planilha mudou, e os caches derivados seguem a versão)
+INTERVALO_ATUALIZACAO = timedelta(seconds=240)
+# Sem leituras neste intervalo a planilha deixa de ser atualizada sozinha
+INTERVALO_SEM_LEITURA = timedelta(minutes=30)
+# Depois de uma atualização com erro, esperar antes de tentar de novo (evita insistir na cota)
+INTERVALO_APOS_FALHA = timedelta(seconds=60)
+
+# Últimos valores bons de cada planilha: planilha_id -> {'valores', 'versoes', 'versao_planilha', 'buscado_em'}
+# Trocados por inteiro sob o lock, então leitores nunca veem uma atualização pela metade
+_lock_snapshots = threading.Lock()
+_valores_memoria = {}
+_ultimas_leituras = {}
+_atualizacoes_em_andamento = set()
+# Última atualização com erro de cada planilha: planilha_id -> (quando, mensagem)
+_falhas_atualizacao = {}
+
+# Função para montar o caminho do snapshot de uma aba
+def caminho_snapshot(planilha_id, aba):
+    """Retorna o caminho do arquivo Parquet da aba (título ou gid)"""
+    nome_aba = re.sub(r'[^\w-]', '_', str(aba))
+    return os.path.join(DIRETORIO_CACHE, f"{planilha_id}__{nome_aba}.parquet")
+
+# Função para montar o diretório do snapshot particionado por mês de uma aba
+def diretorio_particoes(planilha_id, aba):
+    """Diretório com um Parquet por 'AAAA-MM' (e o cabeçalho em _cabecalho.parquet)"""
+    return caminho_snapshot(planilha_id, aba)[:-len('.parquet')]
+
+def _gravar_parquet(df, caminho, metadados_extras, preservar_indice=False):
+    """Grava o DataFrame em arquivo temporário e troca de uma vez (leitores nunca veem arquivo pela metade)"""
+    tabela = pa.Table.from_pandas(df, preserve_index=preservar_indice)
+    metadados = dict(tabela.schema.metadata or {})
+    metadados.update(metadados_extras)
+    tabela = tabela.replace_schema_metadata(metadados)
+
+    caminho_tmp = f"{caminho}.{threading.get_ident()}.tmp"
+    pq.write_table(tabela, caminho_tmp)
+    os.replace(caminho_tmp, caminho)
+
+def _colunas_posicionais(linhas, total_colunas):
+    return pd.DataFrame(linhas, columns=[f"c{i}" for i in range(total_colunas)], dtype='string')
+
+# Função para gravar o snapshot de uma aba
+def salvar_snapshot(planilha_id, aba, valores, buscado_em=None):
+    """Grava os valores da aba em Parquet, com o horário da busca nos metadados
+
+    valores: matriz de textos da API, ou DataFrame já tipado (abas lidas em blocos), gravado
+    com os tipos. Abas particionadas (vendas, paxs, comissão) são gravadas com um arquivo
+    por mês, e só os meses cujo conteúdo mudou são regravados.
+    """
+    os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+    buscado_em = buscado_em or datetime.now()
+
+    if isinstance(valores, pd.DataFrame):
+        _salvar_snapshot_tipado(planilha_id, aba, valores, buscado_em)
+        return
+
+    # Colunas posicionais: o cabeçalho da planilha fica na primeira linha, como veio da API
+    valores = fill_gaps(valores) if valores else []
+    total_colunas = len(valores[0]) if valores else 0
+
+    chaves = chaves_particao_valores(aba, valores) if aba in ABAS_PARTICIONADAS else None
+    if chaves is not None:
+        _salvar_snapshot_particionado(planilha_id, aba, valores, chaves, total_colunas, buscado_em)
+        return
+
+    metadados = {META_BUSCADO_EM: buscado_em.isoformat().encode()}
+    _gravar_parquet(_colunas_posicionais(valores, total_colunas), caminho_snapshot(planilha_id, aba), metadados)
+
+def _salvar_snapshot_particionado(planilha_id, aba, valores, chaves, total_colunas, buscado_em):
+    """Um Parquet por mês com o número original de cada linha; o cabeçalho é gravado por último"""
+    linhas_por_mes = {}
+    for numero_linha, (chave, linha) in enumerate(zip(chaves, valores[1:]), start=1):
+        linhas_por_mes.setdefault(chave, []).append((numero_linha, linha))
+
+    particoes = {}
+    for chave, linhas in linhas_por_mes.items():
+        df = _colunas_posicionais([linha for _, linha in linhas], total_colunas)
+        df.insert(0, 'linha', [numero for numero, _ in linhas])
+        particoes[chave] = (df, versao_valores([[numero] + linha for numero, linha in linhas]))
+
+    metadados = {META_BUSCADO_EM: buscado_em.isoformat().encode(), META_TOTAL_LINHAS: str(len(valores) - 1).encode()}
+    _gravar_particoes(planilha_id, aba, particoes, _colunas_posicionais(valores[:1], total_colunas), metadados)
+
+def _salvar_snapshot_tipado(planilha_id, aba, df, buscado_em):
+    """DataFrame tipado em um Parquet por mês; cada partição guarda o rótulo original das linhas (índice)"""
+    if not _tipos_gravaveis(df):
+        return  # Fica o snapshot anterior; a próxima leitura do Google o substitui em memória
+
+    chaves = anos_meses(df, aba) if aba in ABAS_PARTICIONADAS and not df.empty else None
+    rotulos = chaves_particao(*chaves) if chaves is not None else pd.Series('sem_data', index=df.index)
+    particoes = {
+        chave: (parte, versao_valores(parte))
+        for chave, parte in df.groupby(rotulos.to_numpy(), sort=False)
+    }
+
+    metadados = {
+        META_BUSCADO_EM: buscado_em.isoformat().encode(),
+        META_TOTAL_LINHAS: str(len(df)).encode(),
+        META_TIPADO: b'1',
+    }
+    _gravar_particoes(planilha_id, aba, particoes, df.iloc[0:0], metadados, preservar_indice=True)
+
+def _tipos_gravaveis(df):
+    """Colunas com nomes únicos e texto só de textos (colunas fora do esquema podem misturar números e textos)"""
+    if not df.columns.is_unique:
+        return False
+    return all(
+        pd.api.types.infer_dtype(df.iloc[:, posicao], skipna=True) in ('string', 'empty')
+        for posicao in range(df.shape[1]) if df.dtypes.iloc[posicao] == object
+    )
+
+def _gravar_particoes(planilha_id, aba, particoes, cabecalho, metadados, preservar_indice=False):
+    """Grava as partições {chave: (df, versao)} que mudaram, apaga as que sumiram e grava o cabeçalho por último"""
+    diretorio = diretorio_particoes(planilha_id, aba)
+    os.makedirs(diretorio, exist_ok=True)
+
+    for chave, (df, versao) in particoes.items():
+        # Mês sem alteração (mesmo conteúdo e mesmas posições): manter o arquivo
+        caminho = os.path.join(diretorio, f"{chave}.parquet")
+        if _versao_arquivo(caminho) == versao.encode():
+            continue
+        _gravar_parquet(df, caminho, {META_VERSAO: versao.encode()}, preservar_indice)
+
+    # Meses que deixaram de existir na planilha
+    for arquivo in os.listdir(diretorio):
+        chave = arquivo[:-len('.parquet')]
+        if arquivo.endswith('.parquet') and chave != ARQUIVO_CABECALHO and chave not in particoes:
+            os.remove(os.path.join(diretorio, arquivo))
+
+    _gravar_parquet(cabecalho, os.path.join(diretorio, f"{ARQUIVO_CABECALHO}.parquet"), metadados)
+
+    # Snapshot em arquivo único de versões anteriores
+    if os.path.exists(caminho_snapshot(planilha_id, aba)):
+        os.remove(caminho_snapshot(planilha_id, aba))
+
+def _versao_arquivo(caminho):
+    """Versão gravada nos metadados de uma partição (sem ler os dados), ou None"""
+    try:
+        return (pq.read_schema(caminho).metadata or {}).get(META_VERSAO)
+    except Exception:
+        return None
+
+def _buscado_em(metadados):
+    return datetime.fromisoformat(metadados[META_BUSCADO_EM].decode()) if META_BUSCADO_EM in metadados else None
+
+# Função para ler o snapshot de uma aba
+def carregar_snapshot(planilha_id, aba):
+    """Retorna (valores, buscado_em) do snapshot da aba, ou None se não existir ou estiver corrompido"""
+    diretorio = diretorio_particoes(planilha_id, aba)
+    if os.path.exists(os.path.join(diretorio, f"{ARQUIVO_CABECALHO}.parquet")):
+        return _carregar_snapshot_particionado(diretorio, aba)
+
+    caminho = caminho_snapshot(planilha_id, aba)
+    if not os.path.exists(caminho):
+        return None
+
+    try:
+        tabela = pq.read_table(caminho)
+        valores = tabela.to_pandas().fillna('').values.tolist()
+        return valores, _buscado_em(tabela.schema.metadata or {})
+    except Exception:
+        return None
+
+def _carregar_snapshot_particionado(diretorio, aba):
+    """Junta o cabeçalho e as partições mensais, na ordem original das linhas"""
+    try:
+        cabecalho = pq.read_table(os.path.join(diretorio, f"{ARQUIVO_CABECALHO}.parquet"))
+        metadados = cabecalho.schema.metadata or {}
+
+        arquivos = [arquivo for arquivo in os.listdir(diretorio)
+                    if arquivo.endswith('.parquet') and arquivo != f"{ARQUIVO_CABECALHO}.parquet"]
+        partes = [pq.read_table(os.path.join(diretorio, arquivo)).to_pandas() for arquivo in arquivos]
+
+        if META_TIPADO in metadados:
+            return _juntar_snapshot_tipado(cabecalho.to_pandas(), partes, metadados, aba)
+
+        valores = cabecalho.to_pandas().fillna('').values.tolist()
+        linhas = pd.concat(partes).sort_values('linha') if partes else pd.DataFrame(columns=['linha'])
+
+        # Gravação interrompida no meio: as partições não batem com o total registrado no cabeçalho
+        if META_TOTAL_LINHAS in metadados and len(linhas) != int(metadados[META_TOTAL_LINHAS]):
+            return None
+
+        valores += linhas.drop(columns='linha').fillna('').values.tolist()
+        return valores, _buscado_em(metadados)
+    except Exception:
+        return None
+
+def _juntar_snapshot_tipado(vazio, partes, metadados, aba):
+    """DataFrame tipado a partir das partições, na ordem original e com índice 0..n-1"""
+    df = pd.concat(partes).sort_index() if partes else vazio
+    # Gravação interrompida no meio: as partições não batem com o total registrado no cabeçalho
+    if len(df) != int(metadados[META_TOTAL_LINHAS]):
+        return None
+    df = df.reset_index(drop=True)
+    # Texto volta a object, como sai de montar_dataframe_tipado (o Parquet devolve str)
+    for posicao, tipo in enumerate(df.dtypes):
+        if isinstance(tipo, pd.StringDtype):
+            df.isetitem(posicao, df.iloc[:, posicao].astype(object))
+    # Categorias de cada mês juntadas de novo (como em juntar_dataframes_tipados)
+    df = compactar_dtypes(df, aba)
+    return df, _buscado_em(metadados)
+
+# Função para listar os arquivos do snapshot de uma aba
+def arquivos_snapshot(planilha_id, aba):
+    """Caminhos dos arquivos Parquet do snapshot da aba (arquivo único ou partições mensais)"""
+    diretorio = diretorio_particoes(planilha_id, aba)
+    if os.path.isdir(diretorio):
+        return sorted(os.path.join(diretorio, arquivo) for arquivo in os.listdir(diretorio) if arquivo.endswith('.parquet'))
+    return [caminho_snapshot(planilha_id, aba)]
+
+# Função para montar o caminho da base da sincronização incremental de uma aba
+def caminho_conferencia(planilha_id, aba):
+    """Arquivo JSON com o texto do cabeçalho e das linhas finais e o total de linhas da aba"""
+    return f"{diretorio_particoes(planilha_id, aba)}.conferencia.json"
+
+# Função para gravar a base da sincronização incremental de uma aba
+def salvar_conferencia(planilha_id, aba, base):
+    """Grava a base (o snapshot tipado não guarda o texto da API que a conferência compara)"""
+    os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+    caminho = caminho_conferencia(planilha_id, aba)
+    caminho_tmp = f"{caminho}.{threading.get_ident()}.tmp"
+    with open(caminho_tmp, 'w', encoding='utf-8') as arquivo:
+        json.dump(base, arquivo, ensure_ascii=False)
+    os.replace(caminho_tmp, caminho)
+
+# Função para ler a base da sincronização incremental de uma aba
+def carregar_conferencia(planilha_id, aba):
+    """Retorna o dict gravado por salvar_conferencia, ou None"""
+    try:
+        with open(caminho_conferencia(planilha_id, aba), encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+# Função para ler os snapshots de todas as abas de uma planilha
+def carregar_snapshots_planilha(planilha_id, abas):
+    """Retorna dict aba -> valores apenas se todas as abas tiverem snapshot"""
+    valores_abas = {}
+    for aba in abas:
+        snapshot = carregar_snapshot(planilha_id, aba)
+        if snapshot is None:
+            return None
+        valores_abas[aba] = snapshot[0]
+    return valores_abas
+
+# Função para salvar os snapshots de todas as abas de uma planilha
+def salvar_snapshots_planilha(planilha_id, valores_abas):
+    """Grava um snapshot por aba, todos com o mesmo horário de busca, e retorna esse horário"""
+    buscado_em = datetime.now()
+    for aba, valores in valores_abas.items():
+        salvar_snapshot(planilha_id, aba, valores, buscado_em)
+    return buscado_em
+
+# Função para calcular o token de versão do conteúdo de uma aba
+def versao_valores(valores):
+    """Hash do conteúdo da matriz de valores (ou do DataFrame tipado): muda só quando alguma célula muda"""
+    if isinstance(valores, pd.DataFrame):
+        # Rótulos das linhas, nomes das colunas e valores (category e texto dão o mesmo hash dos valores)
+        hashes = pd.util.hash_pandas_object(valores, index=True).to_numpy()
+        colunas = '\x1f'.join(str(coluna) for coluna in valores.columns).encode('utf-8')
+        return hashlib.blake2b(colunas + hashes.tobytes(), digest_size=16).hexdigest()
+    conteudo = '\x1e'.join('\x1f'.join(str(celula) for celula in linha) for linha in valores)
+    return hashlib.blake2b(conteudo.encode('utf-8'), digest_size=16).hexdigest()
+
+# Função para ler valores servindo o snapshot local enquanto o Google é consultado
+def obter_valores_com_snapshot(planilha_id, abas, buscar, ao_atualizar=None, consultar_versao=None):
+    """Devolve na hora os últimos valores bons e atualiza do Google em segundo plano
+
+    buscar: função (planilha_id, abas) -> dict aba -> valores, que consulta o Google
+    ao_atualizar: função chamada depois que uma atualização em segundo plano muda os valores
+    consultar_versao: função (planilha_id) -> token barato da planilha (ex.: modifiedTime
+    do Drive); com o token igual ao da última busca a atualização não baixa nada
+    Retorna (valores, versoes): dict aba -> valores e dict aba -> token de versão do conteúdo.
+    Na primeira leitura do processo serve o snapshot em disco; sem snapshot a leitura é
+    feita direto no Google. Valores com mais de INTERVALO_ATUALIZACAO são servidos
+    assim mesmo enquanto a nova busca acontece (stale-while-revalidate).
+    """
+    fonte = (buscar, ao_atualizar, consultar_versao)
+    with _lock_snapshots:
+        atual = _valores_memoria.get(planilha_id)
+        _ultimas_leituras[planilha_id] = datetime.now()
+
+    if atual is not None:
+        if datetime.now() - atual['buscado_em'] >= INTERVALO_ATUALIZACAO:
+            _iniciar_atualizacao(planilha_id, abas, fonte)
+        return atual['valores'], atual['versoes']
+
+    atual = _carregar_snapshot_uma_vez(planilha_id, abas)
+    if atual is not None:
+        # Snapshot é de uma execução anterior: buscar a versão atual mesmo que pareça recente
+        _iniciar_atualizacao(planilha_id, abas, fonte)
+        return atual['valores'], atual['versoes']
+
+    atual = _buscar_e_guardar(planilha_id, abas, fonte)
+    if atual is None:
+        return None, {}
+    return atual['valores'], atual['versoes']
+
+# Função para consultar o horário dos dados servidos
+def horario_dados(planilha_id):
+    """Horário em que os valores servidos da planilha foram conferidos no Google (ou None)"""
+    with _lock_snapshots:
+        atual = _valores_memoria.get(planilha_id)
+    return atual['buscado_em'] if atual is not None else None
+
+# Função para consultar a última falha de atualização
+def falha_atualizacao(planilha_id):
+    """Retorna (quando, mensagem) se a última atualização em segundo plano falhou, senão None"""
+    with _lock_snapshots:
+        return _falhas_atualizacao.get(planilha_id)
+
+def _buscar_e_guardar(planilha_id, abas, fonte):
+    """Busca no Google, grava e agenda a próxima atualização, uma vez só entre sessões simultâneas
+
+    Retorna o novo estado da planilha em memória, ou None se a busca não trouxe valores.
+    """
+    buscar, _, consultar_versao = fonte
+
+    def buscar_e_guardar():
+        with _lock_snapshots:
+            atual = _valores_memoria.get(planilha_id)
+
+        # Planilha não foi editada desde a última busca: só renovar o horário
+        versao_planilha = consultar_versao(planilha_id) if consultar_versao is not None else None
+        if atual is not None and versao_planilha is not None and versao_planilha == atual['versao_planilha']:
+            atual = dict(atual, buscado_em=datetime.now())
+        else:
+            valores = buscar(planilha_id, abas)
+            if valores is None:
+                return None
+            atual = _guardar_valores(planilha_id, valores, versao_planilha, atual)
+
+        with _lock_snapshots:
+            _valores_memoria[planilha_id] = atual
+        _agendar_atualizacao(planilha_id, abas, fonte)
+        return atual
+
+    return executar_uma_vez(('buscar', planilha_id, tuple(abas)), buscar_e_guardar)
+
+def _carregar_snapshot_uma_vez(planilha_id, abas):
+    """Lê os snapshots em disco para a memória uma vez só entre sessões simultâneas
+
+    Retorna o estado da planilha em memória, ou None se faltar snapshot de alguma aba.
+    """
+    def carregar():
+        # Outra sessão pode ter terminado a leitura entre a consulta à memória e esta chamada
+        with _lock_snapshots:
+            atual = _valores_memoria.get(planilha_id)
+        if atual is not None:
+            return atual
+        snapshot = _carregar_snapshots_com_horario(planilha_id, abas)
+        if snapshot is None:
+            return None
+        with _lock_snapshots:
+            return _valores_memoria.setdefault(planilha_id, snapshot)
+
+    return executar_uma_vez(('snapshot', planilha_id, tuple(abas)), carregar)
+
+def _carregar_snapshots_com_horario(planilha_id, abas):
+    """Estado da planilha a partir dos snapshots de todas as abas, ou None se faltar alguma"""
+    valores_abas = {}
+    horarios = []
+    for aba in abas:
+        snapshot = carregar_snapshot(planilha_id, aba)
+        if snapshot is None:
+            return None
+        valores_abas[aba] = snapshot[0]
+        horarios.append(snapshot[1] or datetime.min)
+    return {
+        'valores': valores_abas,
+        'versoes': {aba: versao_valores(valores) for aba, valores in valores_abas.items()},
+        'versao_planilha': None,  # Sem token: a primeira atualização sempre baixa os valores
+        'buscado_em': min(horarios, default=datetime.min),
+    }
+
+def _guardar_valores(planilha_id, valores, versao_planilha, anterior):
+    """Monta o novo estado da planilha e regrava apenas os snapshots das abas que mudaram"""
+    versoes = {aba: versao_valores(valores_aba) for aba, valores_aba in valores.items()}
+    versoes_anteriores = anterior['versoes'] if anterior is not None else {}
+    buscado_em = datetime.now()
+
+    for aba, valores_aba in valores.items():
+        if versoes[aba] != versoes_anteriores.get(aba):
+            salvar_snapshot(planilha_id, aba, valores_aba, buscado_em)
+        else:
+            valores[aba] = anterior['valores'][aba]  # Reaproveitar a matriz já em memória
+
+    return {'valores': valores, 'versoes': versoes, 'versao_planilha': versao_planilha, 'buscado_em': buscado_em}
+
+def _iniciar_atualizacao(planilha_id, abas, fonte):
+    """Dispara (uma única vez por planilha) a busca no Google em uma thread de segundo plano"""
+    with _lock_snapshots:
+        if planilha_id in _atualizacoes_em_andamento:
+            return
+        falha = _falhas_atualizacao.get(planilha_id)
+        if falha is not None and datetime.now() - falha[0] < INTERVALO_APOS_FALHA:
+            return
+        _atualizacoes_em_andamento.add(planilha_id)
+        anterior = _valores_memoria.get(planilha_id)
+
+    def atualizar():
+        try:
+            _, ao_atualizar, _ = fonte
+            atual = _buscar_e_guardar(planilha_id, abas, fonte)
+            versoes_anteriores = anterior['versoes'] if anterior is not None else None
+            with _lock_snapshots:
+                _falhas_atualizacao.pop(planilha_id, None)
+            if atual is not None and atual['versoes'] != versoes_anteriores and ao_atualizar is not None:
+                ao_atualizar()
+        except Exception as e:
+            # Mantém os últimos valores bons (memória ou snapshot); nova tentativa após INTERVALO_APOS_FALHA
+            with _lock_snapshots:
+                _falhas_atualizacao[planilha_id] = (datetime.now(), str(e))
+        finally:
+            with _lock_snapshots:
+                _atualizacoes_em_andamento.discard(planilha_id)
+
+    threading.Thread(target=atualizar, name=f"atualizar_snapshot_{planilha_id}", daemon=True).start()
+
+def _agendar_atualizacao(planilha_id, abas, fonte):
+    """Agenda a próxima conferência para daqui a INTERVALO_ATUALIZACAO, enquanto o painel estiver em uso"""
+    def disparar():
+        with _lock_snapshots:
+            ultima_leitura = _ultimas_leituras.get(planilha_id)
+        if ultima_leitura is None or datetime.now() - ultima_leitura > INTERVALO_SEM_LEITURA:
+            return  # Painel ocioso: a próxima leitura serve o valor antigo e dispara a busca
+        _iniciar_atualizacao(planilha_id, abas, fonte)
+
+    timer = threading.Timer(INTERVALO_ATUALIZACAO.total_seconds(), disparar)
+    timer.name = f"agendar_snapshot_{planilha_id}"
+    timer.daemon = True
+    timer.start()
@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Número máximo de fontes buscadas ao mesmo tempo
+MAX_CARREGAMENTOS_PARALELOS = 4
+
+# Buscas em andamento: chave -> Future compartilhado por todas as sessões que pedirem a mesma fonte
+_lock_voo_unico = threading.Lock()
+_buscas_em_andamento = {}
+# Contadores por chave: execuções reais e pedidos agrupados em uma busca já em andamento
+_contadores_voo_unico = {}
+
+# Função para carregar várias fontes de dados em paralelo
+def carregar_em_paralelo(carregadores, max_paralelos=MAX_CARREGAMENTOS_PARALELOS):
+    """Executa os carregadores em um pool limitado de threads e aguarda todos juntos
+
+    carregadores: dict nome -> função sem argumentos
+    Retorna (resultados, erros): dict nome -> valor e dict nome -> exceção.
+    O erro de uma fonte não cancela as demais.
+    """
+    resultados = {}
+    erros = {}
+    if not carregadores:
+        return resultados, erros
+
+    # Contexto da sessão atual, para que st.cache_data e st.error funcionem nas threads
+    ctx = get_script_run_ctx()
+
+    def anexar_contexto():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_paralelos, len(carregadores)),
+        thread_name_prefix='carregar_dados',
+        initializer=anexar_contexto
+    ) as executor:
+        futuros = {nome: executor.submit(funcao) for nome, funcao in carregadores.items()}
+
+        for nome, futuro in futuros.items():
+            try:
+                resultados[nome] = futuro.result()
+            except Exception as e:
+                erros[nome] = e
+
+    return resultados, erros
+
+# Função para executar uma única busca por fonte, compartilhando o resultado
+def executar_uma_vez(chave, funcao):
+    """Executa funcao() uma vez por chave; chamadas simultâneas esperam e recebem o mesmo resultado
+
+    Erros também são repassados a todas as chamadas que estavam esperando.
+    """
+    with _lock_voo_unico:
+        contadores = _contadores_voo_unico.setdefault(chave, {'execucoes': 0, 'agrupadas': 0})
+        futuro = _buscas_em_andamento.get(chave)
+        if futuro is None:
+            futuro = Future()
+            _buscas_em_andamento[chave] = futuro
+            contadores['execucoes'] += 1
+            executar = True
+        else:
+            contadores['agrupadas'] += 1
+            executar = False
+
+    if not executar:
+        return futuro.result()
+
+    try:
+        resultado = funcao()
+        futuro.set_result(resultado)
+        return resultado
+    except BaseException as e:
+        futuro.set_exception(e)
+        raise
+    finally:
+        with _lock_voo_unico:
+            _buscas_em_andamento.pop(chave, None)
+
+# Função para consultar os contadores de buscas agrupadas
+def contadores_voo_unico():
+    """Retorna dict chave -> {'execucoes', 'agrupadas'} desde o início do processo"""
+    with _lock_voo_unico:
+        return {chave: dict(contadores) for chave, contadores in _contadores_voo_unico.items()}
@@ -0,0 +1,99 @@
+from functools import lru_cache
+
+# Campos de cada aba: nome canônico -> nomes aceitos na planilha (o primeiro é o canônico)
+# A ingestão renomeia a coluna encontrada para o nome canônico; o resto do painel só usa
+# os nomes canônicos, sem procurar alternativas
+CAMPOS_ABAS = {
+    'Dados Finais Vendas': {
+        'dia': ['dia', 'Dia', 'DIA'],
+        'mês': ['mês', 'Mês', 'MES', 'Mes'],
+        'ano': ['ano', 'Ano', 'ANO'],
+        'Vendedor': ['Vendedor', 'vendedor', 'VENDEDOR'],
+        'Valor Real': ['Valor Real', 'valor real', 'VALOR REAL'],
+        'Valor Final': ['Valor Final', 'valor final', 'VALOR FINAL'],
+        'Tipo de Serviço': ['Tipo de Serviço', 'tipo de serviço', 'TIPO DE SERVIÇO', 'Tipo de Servico', 'Serviço Buggy', 'Servico Buggy'],
+        'All Inclusive': ['All Inclusive', 'all inclusive', 'ALL INCLUSIVE', 'ALL Inclusive', 'ALL_Inclusive', 'All_Inclusive'],
+        'Data_Venda': ['Data_Venda', 'Data da Venda', 'Data Venda', 'Data'],
+        'Reserva': ['Reserva', 'Código da Reserva', 'Codigo da Reserva', 'Reservation'],
+    },
+    'Dados In de Escala': {
+        'dia': ['dia', 'Dia', 'DIA'],
+        'mês': ['mês', 'Mês', 'MES', 'Mes'],
+        'ano': ['ano', 'Ano', 'ANO'],
+        'Guia': ['Guia', 'guia', 'GUIA'],
+        'Total_Paxs': ['Total_Paxs', 'total_paxs', 'TOTAL_PAXS', 'Total Paxs'],
+        'All Inclusive': ['All Inclusive', 'all inclusive', 'ALL INCLUSIVE'],
+    },
+    'Comissão': {
+        'Data da Venda': ['Data da Venda'],
+        'Vendedor': ['Vendedor'],
+        'Código da Reserva': ['Código da Reserva'],
+        'Serviço': ['Serviço'],
+        'Valor da Venda': ['Valor da Venda'],
+    },
+    'Vendedores': {
+        'Nome Do Vendedor': ['Nome Do Vendedor', 'Nome do Vendedor', 'Vendedor', 'vendedor', 'VENDEDOR'],
+        'Tipo de Vendedor': ['Tipo de Vendedor'],
+        'mês': ['mês', 'Mês', 'MES', 'Mes'],
+        'Ano': ['Ano', 'ano', 'ANO'],
+        'Meta': ['Meta', 'meta', 'META'],
+        'Meta All Inclusive': ['Meta All Inclusive'],
+    },
+    'Meta Diaria': {
+        'Vendedor': ['Vendedor', 'vendedor', 'VENDEDOR', 'Nome do Vendedor', 'Nome Do Vendedor'],
+        'Data': ['Data', 'data', 'DATA'],
+        'Meta Diaria': ['Meta Diaria', 'Meta Diária', 'meta diaria', 'META DIARIA', 'Meta'],
+    },
+}
+
+# Campos sem os quais os cálculos da aba não têm como sair
+CAMPOS_OBRIGATORIOS = {
+    'Dados Finais Vendas': ['dia', 'mês', 'ano', 'Vendedor', 'Valor Real', 'Valor Final', 'Tipo de Serviço', 'All Inclusive'],
+    'Dados In de Escala': ['dia', 'mês', 'ano', 'Guia', 'Total_Paxs', 'All Inclusive'],
+    'Comissão': ['Data da Venda', 'Vendedor', 'Valor da Venda'],
+    'Vendedores': ['Nome Do Vendedor', 'Tipo de Vendedor', 'mês', 'Ano', 'Meta'],
+    'Meta Diaria': ['Vendedor', 'Data', 'Meta Diaria'],
+}
+
+# Função para listar todos os nomes aceitos para os campos de uma aba
+def nomes_aceitos(aba):
+    """Nomes canônicos e alternativos de todos os campos da aba (vazio para abas sem esquema)"""
+    return [nome for alternativas in CAMPOS_ABAS.get(aba, {}).values() for nome in alternativas]
+
+# Função para resolver o esquema de uma aba a partir do cabeçalho
+@lru_cache(maxsize=64)
+def resolver_esquema(aba, cabecalho):
+    """Retorna (renomear, faltando) para o cabeçalho (tupla) da aba
+
+    renomear leva o nome encontrado na planilha ao nome canônico (o primeiro nome aceito
+    presente, na ordem das alternativas); faltando lista os campos obrigatórios ausentes.
+    Fica em cache pelo cabeçalho: a resolução roda uma vez por cabeçalho, não a cada cálculo.
+    """
+    presentes = {str(nome).strip() for nome in cabecalho}
+    renomear = {}
+    encontrados = set()
+    for campo, alternativas in CAMPOS_ABAS.get(aba, {}).items():
+        nome = next((alternativa for alternativa in alternativas if alternativa in presentes), None)
+        if nome is None:
+            continue
+        encontrados.add(campo)
+        if nome != campo:
+            renomear[nome] = campo
+    faltando = tuple(campo for campo in CAMPOS_OBRIGATORIOS.get(aba, ()) if campo not in encontrados)
+    return renomear, faltando
+
+# Função para trocar os nomes do cabeçalho pelos nomes canônicos
+def cabecalho_canonico(aba, cabecalho):
+    """Lista com o cabeçalho renomeado (nomes fora do esquema ficam como estão)"""
+    renomear, _ = resolver_esquema(aba, tuple(cabecalho))
+    return [renomear.get(str(nome).strip(), nome) for nome in cabecalho]
+
+# Função para listar os campos obrigatórios que faltam em uma aba já ingerida
+def campos_faltando(aba, colunas):
+    """Campos obrigatórios ausentes entre as colunas (já canônicas) da aba"""
+    return resolver_esquema(aba, tuple(colunas))[1]
+
+# Função para conferir se um DataFrame tem todas as colunas usadas por um cálculo
+def tem_colunas(df, colunas):
+    """True quando todas as colunas canônicas pedidas existem no DataFrame"""
+    return all(coluna in df.columns for coluna in colunas)
@@ -0,0 +1,126 @@
+import streamlit as st
+from moeda import formatar_centavos_brl, formatar_percentual_brl
+
+# Formatação dos grids só na hora de exibir: os DataFrames dos grids (e o que vai para
+# st.session_state) ficam numéricos. A tabela recebe só números e um NumberColumn por coluna
+# (o navegador formata, sem uma cópia em texto de cada célula); os PDFs recebem o texto pt-BR
+# ('R$ 1.234,56', '12,5', '120,50%'). Os formatos printf do NumberColumn só escrevem ponto
+# decimal, então os grids usam os formatos no idioma do navegador e o R$ vai no título da coluna.
+
+# Como cada coluna numérica dos grids é exibida
+FORMATO_MOEDA = 'moeda'            # centavos (int64) -> reais
+FORMATO_QUANTIDADE = 'quantidade'  # paxs, com 1 casa decimal
+FORMATO_PERCENTUAL = 'percentual'  # razão (1.2 = 120%)
+
+FORMATOS_COLUNAS = {
+    # Grid por tipo de vendedor
+    'Vendas Luck': FORMATO_MOEDA,
+    'Vendas Terceiros': FORMATO_MOEDA,
+    'Meta Diaria': FORMATO_MOEDA,
+    'Meta': FORMATO_MOEDA,
+    'Vendas Luck Sem Adicionais': FORMATO_MOEDA,
+    'Vendas Luck Com Adicionais': FORMATO_MOEDA,
+    'Paxs In': FORMATO_QUANTIDADE,
+    'Ticket Médio': FORMATO_MOEDA,
+    'Ticket Médio Com Adicionais': FORMATO_MOEDA,
+    'Alcance de Meta': FORMATO_PERCENTUAL,
+    # Grid All Inclusive
+    'Vendas Luck Sem Adicionais All Inclusive': FORMATO_MOEDA,
+    'Vendas Luck Com Adicionais All Inclusive': FORMATO_MOEDA,
+    'Paxs In All Inclusive': FORMATO_QUANTIDADE,
+    'Ticket Médio All Inclusive': FORMATO_MOEDA,
+    'Ticket Médio All Inclusive com Adicionais': FORMATO_MOEDA,
+    'Meta All Inclusive': FORMATO_MOEDA,
+    'Alcance de Meta All Inclusive': FORMATO_PERCENTUAL,
+    # Detalhes e resumo da comissão
+    'Valor da Venda': FORMATO_MOEDA,
+    'Valor Comissão Luck': FORMATO_MOEDA,
+    'Valor Comissão Terceiros': FORMATO_MOEDA,
+    'Valor Comissão Premiação': FORMATO_MOEDA,
+    'Valor Comissão Premiação All Inclusive': FORMATO_MOEDA,
+    'Valor Total de Comissão': FORMATO_MOEDA,
+    'Valor Total de Venda': FORMATO_MOEDA,
+    'Valor Total Comissão Luck': FORMATO_MOEDA,
+    'Valor Total Comissão Terceiros': FORMATO_MOEDA,
+    'Valor Total Comissão Premiação': FORMATO_MOEDA,
+    'Valor Total Comissão Premiação All Inclusive': FORMATO_MOEDA,
+}
+
+def _colunas_formatadas(colunas, formato):
+    return [coluna for coluna in colunas if FORMATOS_COLUNAS.get(coluna) == formato]
+
+# Função para formatar uma quantidade de paxs
+def formatar_quantidade_brl(valor):
+    """12.5 -> '12,5' (zero e vazio viram '0', como no grid)"""
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        return '0'
+    return f"{numero:.1f}".replace('.', ',') if numero > 0 else '0'
+
+# Função para montar a configuração das colunas numéricas de um grid
+def configuracao_colunas(df):
+    """Dict coluna -> st.column_config.NumberColumn com o formato da coluna (moeda em reais)"""
+    configuracoes = {}
+    for coluna in df.columns:
+        formato = FORMATOS_COLUNAS.get(coluna)
+        if formato == FORMATO_MOEDA:
+            configuracoes[coluna] = st.column_config.NumberColumn(f"{coluna} (R$)", format='localized', step=0.01)
+        elif formato == FORMATO_QUANTIDADE:
+            configuracoes[coluna] = st.column_config.NumberColumn(format='localized', step=0.1)
+        elif formato == FORMATO_PERCENTUAL:
+            configuracoes[coluna] = st.column_config.NumberColumn(format='percent', step=0.01)
+    return configuracoes
+
+# Função para preparar os valores numéricos de um grid para a tabela
+def dados_exibicao(df):
+    """Cópia rasa do grid com as colunas de moeda em reais (float); as demais como estão"""
+    moedas = {coluna: df[coluna] / 100 for coluna in _colunas_formatadas(df.columns, FORMATO_MOEDA)}
+    return df.assign(**moedas) if moedas else df
+
+# Função para mostrar um grid numérico formatado na exibição
+def mostrar_grid(df, estilo=None):
+    """st.dataframe do grid; estilo (opcional) recebe o DataFrame exibido e devolve um Styler
+
+    Os valores continuam numéricos na tabela (a ordenação por coluna é numérica). Sem estilo
+    vai só o DataFrame; com estilo (cores de linha) o Streamlit manda também o texto de cada
+    célula junto com as cores (cerca de 3,8x o tamanho num grid de 200 linhas), então o estilo
+    fica só nos grids que pintam linhas. O formato é sempre o do NumberColumn.
+    """
+    exibido = dados_exibicao(df)
+    st.dataframe(
+        estilo(exibido) if estilo is not None else exibido,
+        column_config=configuracao_colunas(df),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# Função para converter os valores numéricos de um grid em texto (PDFs)
+def formatar_texto(df):
+    """Cópia rasa do grid com moeda 'R$ 1.234,56', paxs '12,5' e percentuais '120,50%'"""
+    colunas = {}
+    for coluna in df.columns:
+        formato = FORMATOS_COLUNAS.get(coluna)
+        if formato == FORMATO_MOEDA:
+            colunas[coluna] = formatar_centavos_brl(df[coluna])
+        elif formato == FORMATO_QUANTIDADE:
+            colunas[coluna] = df[coluna].map(formatar_quantidade_brl).astype(object)
+        elif formato == FORMATO_PERCENTUAL:
+            colunas[coluna] = formatar_percentual_brl(df[coluna])
+    return df.assign(**colunas)
+
+# Função para converter uma linha de grid (dict) em texto (PDFs)
+def formatar_linha_texto(linha):
+    """Mesma formatação de formatar_texto para o dict de uma linha guardada no session_state"""
+    texto = {}
+    for coluna, valor in (linha or {}).items():
+        formato = FORMATOS_COLUNAS.get(coluna)
+        if formato == FORMATO_MOEDA:
+            texto[coluna] = formatar_centavos_brl(valor)
+        elif formato == FORMATO_QUANTIDADE:
+            texto[coluna] = formatar_quantidade_brl(valor)
+        elif formato == FORMATO_PERCENTUAL:
+            texto[coluna] = formatar_percentual_brl(valor)
+        else:
+            texto[coluna] = valor
+    return texto
@@ -0,0 +1,167 @@
+import os
+import re
+import sqlite3
+import numpy as np
+import pandas as pd
+from planilhas_google import ler_valores_em_lote
+from cache_disco import carregar_snapshots_planilha, arquivos_snapshot
+
+# Fonte dos dados do painel: google (padrão), arquivos, sqlite ou snapshots
+FONTE_GOOGLE = 'google'
+FONTE_ARQUIVOS = 'arquivos'
+FONTE_SQLITE = 'sqlite'
+FONTE_SNAPSHOTS = 'snapshots'
+FONTE_DADOS = os.environ.get('PAINEL_FONTE_DADOS', FONTE_GOOGLE).strip().lower()
+
+# Diretório com um arquivo CSV ou Parquet por aba (fonte "arquivos")
+DIRETORIO_DADOS = os.environ.get('PAINEL_DADOS_DIR', 'dados_locais')
+
+# Banco SQLite com uma tabela por aba (fonte "sqlite")
+ARQUIVO_SQLITE = os.environ.get('PAINEL_DADOS_SQLITE', 'dados_locais.sqlite')
+
+# Função para montar o nome de arquivo/tabela de uma aba
+def nome_local_aba(aba):
+    """Nome usado para a aba (título ou gid) nos arquivos e tabelas locais"""
+    return re.sub(r'[^\w-]', '_', str(aba))
+
+def _texto_numero(valor):
+    """Número como a planilha pt-BR exibe: vírgula decimal e sem notação científica (1234.5 -> '1234,5')"""
+    if isinstance(valor, (bool, np.bool_)):
+        return 'TRUE' if valor else 'FALSE'
+    return np.format_float_positional(valor, trim='-').replace('.', ',') if isinstance(valor, (float, np.floating)) else str(valor)
+
+def _coluna_para_textos(serie):
+    """Textos de uma coluna; colunas numéricas (Parquet, SQLite) seguem o formato pt-BR da planilha"""
+    vazios = serie.isna()
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        # Datas sem hora como a planilha exibe (dd/mm/aaaa)
+        formato = '%d/%m/%Y' if (serie.dropna() == serie.dropna().dt.normalize()).all() else '%d/%m/%Y %H:%M:%S'
+        textos = serie.dt.strftime(formato)
+    elif pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        textos = serie.astype(object).map(lambda valor: '' if pd.isna(valor) else _texto_numero(valor))
+    else:
+        textos = serie.astype(object).map(str)
+    return textos.where(~vazios, '').tolist()
+
+def _dataframe_para_valores(df):
+    """Converte o DataFrame lido localmente na matriz de textos devolvida pela API (cabeçalho na linha 0)
+
+    Sem isso, 1234.56 lido de uma coluna numérica viraria '1234.56' e a leitura de moeda
+    (ponto de milhares) daria 123456 reais: números saem como '1234,56'.
+    """
+    colunas = [_coluna_para_textos(df.iloc[:, posicao]) for posicao in range(df.shape[1])]
+    return [[str(coluna) for coluna in df.columns]] + [list(linha) for linha in zip(*colunas)]
+
+# Função para ler as abas de um diretório de arquivos CSV/Parquet
+def ler_valores_diretorio(planilha_id, abas, diretorio=None):
+    """Mesmo contrato de ler_valores_em_lote, lendo <diretorio>/<aba>.parquet ou .csv
+
+    Colunas de texto devem conter o texto exibido na planilha (ex.: 'R$ 1.234,56'), como a
+    API do Google devolve; colunas numéricas e de data (Parquet) são escritas no formato
+    pt-BR da planilha. planilha_id é ignorado: os nomes das abas não se repetem.
+    """
+    diretorio = diretorio or DIRETORIO_DADOS
+    valores_abas = {}
+    for aba in abas:
+        caminho = os.path.join(diretorio, nome_local_aba(aba))
+        if os.path.exists(f"{caminho}.parquet"):
+            df = pd.read_parquet(f"{caminho}.parquet")
+        elif os.path.exists(f"{caminho}.csv"):
+            df = pd.read_csv(f"{caminho}.csv", dtype=str, keep_default_na=False)
+        else:
+            raise FileNotFoundError(f"Aba '{aba}' não encontrada em {diretorio} (.parquet ou .csv)")
+        valores_abas[aba] = _dataframe_para_valores(df)
+    return valores_abas
+
+# Função para ler as abas de um banco SQLite
+def ler_valores_sqlite(planilha_id, abas, caminho=None):
+    """Mesmo contrato de ler_valores_em_lote, lendo uma tabela por aba do banco SQLite"""
+    caminho = caminho or ARQUIVO_SQLITE
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f"Banco SQLite não encontrado: {caminho}")
+
+    valores_abas = {}
+    with sqlite3.connect(caminho) as conexao:
+        for aba in abas:
+            tabela = nome_local_aba(aba).replace('"', '""')
+            df = pd.read_sql_query(f'SELECT * FROM "{tabela}"', conexao)
+            valores_abas[aba] = _dataframe_para_valores(df)
+    return valores_abas
+
+# Função para ler as abas dos snapshots Parquet do cache em disco
+def ler_valores_snapshots(planilha_id, abas):
+    """Mesmo contrato de ler_valores_em_lote, servindo apenas os snapshots já gravados (sem rede)"""
+    valores_abas = carregar_snapshots_planilha(planilha_id, abas)
+    if valores_abas is None:
+        raise FileNotFoundError(f"Snapshots incompletos para a planilha {planilha_id}")
+    return valores_abas
+
+# Função para gravar abas como arquivos locais (fixtures para testes de carga)
+def gravar_valores_diretorio(valores_abas, diretorio=None, formato='parquet'):
+    """Grava dict aba -> matriz de valores como um arquivo .parquet ou .csv por aba"""
+    diretorio = diretorio or DIRETORIO_DADOS
+    os.makedirs(diretorio, exist_ok=True)
+    for aba, valores in valores_abas.items():
+        df = _valores_para_texto(valores)
+        caminho = os.path.join(diretorio, f"{nome_local_aba(aba)}.{formato}")
+        if formato == 'parquet':
+            df.to_parquet(caminho, index=False)
+        else:
+            df.to_csv(caminho, index=False)
+
+# Função para gravar abas em um banco SQLite (fixtures para testes de carga)
+def gravar_valores_sqlite(valores_abas, caminho=None):
+    """Grava dict aba -> matriz de valores como uma tabela por aba no banco SQLite"""
+    caminho = caminho or ARQUIVO_SQLITE
+    with sqlite3.connect(caminho) as conexao:
+        for aba, valores in valores_abas.items():
+            _valores_para_texto(valores).to_sql(nome_local_aba(aba), conexao, if_exists='replace', index=False)
+
+def _valores_para_texto(valores):
+    """DataFrame só de texto a partir da matriz de valores (cabeçalho na linha 0)"""
+    if not valores:
+        return pd.DataFrame()
+    total_colunas = max(len(linha) for linha in valores)
+    linhas = [list(linha) + [''] * (total_colunas - len(linha)) for linha in valores]
+    return pd.DataFrame(linhas[1:], columns=linhas[0], dtype=str)
+
+# Leitores disponíveis, todos com a assinatura (planilha_id, abas) -> dict aba -> matriz de valores
+LEITORES_VALORES = {
+    FONTE_GOOGLE: ler_valores_em_lote,
+    FONTE_ARQUIVOS: ler_valores_diretorio,
+    FONTE_SQLITE: ler_valores_sqlite,
+    FONTE_SNAPSHOTS: ler_valores_snapshots,
+}
+
+def _estado_arquivo(caminho):
+    try:
+        info = os.stat(caminho)
+    except OSError:
+        return (caminho, None, None)
+    return (caminho, info.st_mtime_ns, info.st_size)
+
+# Função para obter a versão de uma fonte local sem ler os dados
+def versao_fonte_local(planilha_id, abas, fonte=None):
+    """Data de modificação e tamanho dos arquivos que o leitor vai abrir
+
+    Muda sempre que algum arquivo é regravado (ou criado/removido). Retorna None para a
+    fonte google, que tem a própria versão (modifiedTime do Drive).
+    """
+    fonte = fonte or FONTE_DADOS
+    if fonte == FONTE_ARQUIVOS:
+        caminhos = [f"{os.path.join(DIRETORIO_DADOS, nome_local_aba(aba))}.{extensao}" for aba in abas for extensao in ('parquet', 'csv')]
+    elif fonte == FONTE_SQLITE:
+        caminhos = [ARQUIVO_SQLITE]
+    elif fonte == FONTE_SNAPSHOTS:
+        caminhos = [caminho for aba in abas for caminho in arquivos_snapshot(planilha_id, aba)]
+    else:
+        return None
+    return tuple(_estado_arquivo(caminho) for caminho in caminhos)
+
+# Função para escolher o leitor de valores configurado
+def obter_leitor_valores(fonte=None):
+    """Retorna o leitor da fonte configurada em PAINEL_FONTE_DADOS"""
+    fonte = fonte or FONTE_DADOS
+    if fonte not in LEITORES_VALORES:
+        raise ValueError(f"Fonte de dados desconhecida: {fonte} (use {', '.join(LEITORES_VALORES)})")
+    return LEITORES_VALORES[fonte]
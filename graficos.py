@@ -0,0 +1,25 @@
+import matplotlib.pyplot as plt
+import matplotlib.cm as cm
+from moeda import centavos_para_reais, formatar_centavos_brl
+
+# Gráficos do painel (importado só no primeiro uso: matplotlib é pesado para o início do script)
+
+# Função para montar o gráfico de barras de ticket médio por vendedor
+def grafico_ticket_medio(vendedores, centavos, titulo, rotulo_y, paleta='tab10'):
+    """Retorna a figura com uma barra por vendedor (altura em reais) e o valor formatado acima de cada barra
+
+    centavos: valores por vendedor em centavos, como nos grids
+    """
+    valores = [centavos_para_reais(valor) for valor in centavos]
+    largura = max(8, len(vendedores) * 0.6)
+    fig, ax = plt.subplots(figsize=(largura, 4))
+    colors = cm.get_cmap(paleta, len(vendedores))
+    bars = ax.bar(vendedores, valores, color=[colors(i) for i in range(len(vendedores))])
+    ax.set_ylabel(rotulo_y)
+    ax.set_xlabel('Vendedor')
+    ax.set_title(titulo)
+    ax.set_xticklabels(vendedores, rotation=45, ha='right')
+    # Adicionar legenda com valor
+    for bar, valor in zip(bars, centavos):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height(), formatar_centavos_brl(valor), ha='center', va='bottom', fontsize=9)
+    return fig
@@ -0,0 +1,67 @@
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Módulos pesados carregados só no primeiro uso (PDF, ZIP e gráficos)
+MODULOS_TARDIOS = ('relatorios_pdf', 'graficos')
+
+# Módulos importados no início do script, medidos no relatório de importação
+MODULOS_INICIAIS = (
+    'streamlit', 'pandas', 'gspread', 'planilhas_google', 'cache_disco',
+    'ingestao', 'particoes', 'fontes_dados',
+)
+
+# Tempo da primeira importação de cada módulo tardio neste processo (segundos)
+_lock_importacoes = threading.Lock()
+_tempos_importacao = {}
+
+# Função para importar um módulo pesado só quando ele for usado
+def importar_tardio(nome):
+    """Retorna o módulo, importando-o na primeira chamada e registrando o tempo gasto"""
+    modulo = sys.modules.get(nome)
+    if modulo is not None:
+        return modulo
+
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome)
+    with _lock_importacoes:
+        _tempos_importacao.setdefault(nome, time.perf_counter() - inicio)
+    return modulo
+
+# Função para consultar quanto cada importação tardia custou
+def tempos_importacao():
+    """Retorna dict módulo -> segundos da primeira importação neste processo"""
+    with _lock_importacoes:
+        return dict(_tempos_importacao)
+
+# Função para medir a importação de um módulo em um processo novo (importação a frio)
+def medir_importacao_fria(nome):
+    """Segundos para importar o módulo em um interpretador novo (None se a importação falhar)"""
+    codigo = (
+        "import time; inicio = time.perf_counter(); "
+        f"import {nome}; print(time.perf_counter() - inicio)"
+    )
+    resultado = subprocess.run(
+        [sys.executable, '-c', codigo],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+    if resultado.returncode != 0:
+        return None
+    return float(resultado.stdout.strip().splitlines()[-1])
+
+# Função para montar o relatório de tempos de importação
+def relatorio_importacoes(modulos=None):
+    """Lista (módulo, segundos, tardio) com a importação a frio de cada módulo"""
+    modulos = modulos or MODULOS_INICIAIS + MODULOS_TARDIOS
+    return [(nome, medir_importacao_fria(nome), nome in MODULOS_TARDIOS) for nome in modulos]
+
+if __name__ == '__main__':
+    # python importacoes_tardias.py [modulo ...]
+    for nome, segundos, tardio in relatorio_importacoes(sys.argv[1:] or None):
+        momento = 'primeiro uso' if tardio else 'início'
+        tempo = f"{segundos * 1000:9.1f} ms" if segundos is not None else '    falhou'
+        print(f"{nome:<20} {tempo}  ({momento})")
@@ -0,0 +1,424 @@
+import hashlib
+import re
+import unicodedata
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from gspread.utils import numericise_all
+from moeda import converter_moeda_centavos
+from esquemas import cabecalho_canonico
+
+# Tipos declarados para as colunas das abas
+TIPO_INTEIRO = 'inteiro'      # dia, ano: número sem casas decimais (NaN quando vazio)
+TIPO_NUMERO = 'numero'        # quantidades com vírgula decimal (Total_Paxs)
+TIPO_MOEDA = 'moeda'          # texto original + coluna "<nome> Centavos" (int64)
+TIPO_DATA = 'data'            # texto original + colunas "<nome> Convertida" (datetime), "<nome> Ano" e "<nome> Mes"
+TIPO_CATEGORIA = 'categoria'  # texto com poucos valores distintos (Sim/Não, Luck/Terceiro, meses, nomes)
+TIPO_TEXTO = 'texto'          # mantido como veio da planilha (sem numericise)
+
+# Linhas convertidas por vez na montagem do DataFrame (limita a memória intermediária)
+TAMANHO_BLOCO_INGESTAO = 20000
+
+# Sufixos das colunas derivadas (a coluna original continua disponível como texto)
+SUFIXO_CENTAVOS = ' Centavos'
+SUFIXO_DATA = ' Convertida'
+SUFIXO_ANO = ' Ano'
+SUFIXO_MES = ' Mes'
+SUFIXO_NORMALIZADO = ' Normalizado'
+SUFIXO_ID = ' Id'
+
+# Atributo do DataFrame (df.attrs) com os nomes da planilha das colunas renomeadas pelo esquema:
+# nome canônico -> nome no cabeçalho da planilha
+ATRIBUTO_NOMES_PLANILHA = 'nomes_planilha'
+
+# Id dos nomes vazios (linhas sem vendedor)
+SEM_VENDEDOR = 0
+
+# Meses escritos por extenso nas planilhas (com e sem acento)
+MESES_PARA_NUMEROS = {
+    'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4,
+    'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
+    'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
+    'Marco': 3, 'Decembro': 12
+}
+
+# Colunas de calendário montadas na ingestão a partir de dia/mês (por extenso)/ano
+COLUNA_DATA = 'data'              # datetime64 (NaT quando dia, mês ou ano não formam uma data)
+COLUNA_ANO = 'ano_numero'         # ano da data
+COLUNA_MES = 'mes_numero'         # mês da data
+ABAS_CALENDARIO = {'Dados Finais Vendas', 'Dados In de Escala'}
+
+# Colunas de calendário guardadas como inteiros pequenos (ano em int16, dia e mês em int8)
+COLUNAS_CALENDARIO = {'dia', 'ano', COLUNA_ANO, COLUNA_MES}
+
+# Esquema das abas grandes: nome canônico da coluna (esquemas.py) -> tipo
+# Abas fora deste dicionário seguem o comportamento de get_all_records()
+ESQUEMAS_ABAS = {
+    'Dados Finais Vendas': {
+        'dia': TIPO_INTEIRO,
+        'mês': TIPO_CATEGORIA,
+        'ano': TIPO_INTEIRO,
+        'Vendedor': TIPO_CATEGORIA,
+        'Valor Real': TIPO_MOEDA,
+        'Valor Final': TIPO_MOEDA,
+        'Tipo de Serviço': TIPO_CATEGORIA,
+        'All Inclusive': TIPO_CATEGORIA,
+        # Busca de venda All Inclusive da comissão (comparada como texto aaaa-mm-dd)
+        'Data_Venda': TIPO_TEXTO,
+        'Reserva': TIPO_TEXTO,
+    },
+    'Dados In de Escala': {
+        'dia': TIPO_INTEIRO,
+        'mês': TIPO_CATEGORIA,
+        'ano': TIPO_INTEIRO,
+        'Guia': TIPO_CATEGORIA,
+        'Total_Paxs': TIPO_NUMERO,
+        'All Inclusive': TIPO_CATEGORIA,
+    },
+    'Comissão': {
+        'Data da Venda': TIPO_DATA,
+        'Vendedor': TIPO_TEXTO,
+        'Código da Reserva': TIPO_TEXTO,
+        'Serviço': TIPO_CATEGORIA,
+        'Valor da Venda': TIPO_MOEDA,
+    },
+}
+
+# Colunas de moeda das abas sem esquema: ganham a coluna "<nome> Centavos" na ingestão
+# (convertida uma vez por versão dos dados); a coluna original segue como em get_all_records()
+COLUNAS_MOEDA_ABAS = {
+    'Vendedores': ['Meta', 'Meta All Inclusive'],
+    'Meta Diaria': ['Meta Diaria'],
+}
+
+# Colunas de texto repetitivo das abas sem esquema, guardadas como category
+COLUNAS_CATEGORIA_ABAS = {
+    'Vendedores': ['Tipo de Vendedor'],
+}
+
+# Colunas de mês/ano das abas sem esquema (mês em número ou por extenso), guardadas como
+# inteiros pequenos: os filtros por período comparam números direto, sem converter a cada busca
+COLUNAS_PERIODO_ABAS = {
+    'Vendedores': ['mês', 'Ano'],
+    'Dados Vendedores': ['mês', 'Ano'],
+}
+
+# Colunas com nomes de pessoas: ganham as colunas "<nome> Normalizado" (chave de comparação
+# de normalizar_nome) e "<nome> Id" (id do vendedor) na ingestão, uma vez por versão dos dados
+COLUNAS_NOME_ABAS = {
+    'Dados Finais Vendas': ['Vendedor'],
+    'Dados In de Escala': ['Guia'],
+    'Comissão': ['Vendedor'],
+    'Dados Vendedores': ['Vendedor'],
+    'Vendedores': ['Nome Do Vendedor'],
+    'Meta Diaria': ['Vendedor'],
+}
+
+@lru_cache(maxsize=8192)
+def _normalizar_texto(nome):
+    # Converter para string e remover espaços extras
+    nome = nome.strip()
+
+    # Remover acentos
+    nome = unicodedata.normalize('NFD', nome)
+    nome = ''.join(char for char in nome if unicodedata.category(char) != 'Mn')
+
+    # Converter para maiúsculas e remover caracteres especiais
+    nome = re.sub(r'[^A-Za-z0-9\s]', '', nome.upper())
+
+    # Remover espaços duplos
+    return re.sub(r'\s+', ' ', nome).strip()
+
+# Função para normalizar nomes
+def normalizar_nome(nome):
+    """Normaliza nomes para comparação (sem acentos, maiúsculas, só letras/números/espaços)
+
+    Resultados ficam em memória (lru_cache): os mesmos nomes se repetem em todas as abas.
+    """
+    if pd.isna(nome):
+        return ''
+    return _normalizar_texto(str(nome))
+
+# Função para normalizar uma coluna inteira de nomes
+def normalizar_nomes(serie):
+    """Versão vetorizada de normalizar_nome: cada nome distinto é normalizado uma vez"""
+    codigos, distintos = pd.factorize(serie)
+    normalizados = [normalizar_nome(nome) for nome in distintos] + ['']
+    # O código -1 (valor ausente) pega o '' acrescentado no fim
+    return pd.Series([normalizados[codigo] for codigo in codigos], index=serie.index, dtype=object)
+
+# Função para obter os nomes normalizados de uma coluna
+def nomes_normalizados(df, coluna):
+    """Usa a coluna normalizada na ingestão quando existir; senão normaliza na hora"""
+    coluna_normalizada = f"{coluna}{SUFIXO_NORMALIZADO}"
+    if coluna_normalizada in df.columns:
+        return df[coluna_normalizada]
+    return normalizar_nomes(df[coluna])
+
+@lru_cache(maxsize=8192)
+def _id_nome_normalizado(nome_normalizado):
+    if not nome_normalizado:
+        return SEM_VENDEDOR
+    resumo = hashlib.blake2b(nome_normalizado.encode('utf-8'), digest_size=8).digest()
+    # Positivo e dentro de int64; o mesmo nome tem o mesmo id em qualquer aba, versão ou processo
+    return int.from_bytes(resumo, 'big') >> 1
+
+# Função para obter o id de um vendedor a partir de qualquer grafia do nome
+def id_vendedor(nome):
+    """Id inteiro estável do vendedor: grafias com o mesmo normalizar_nome têm o mesmo id"""
+    return _id_nome_normalizado(normalizar_nome(nome))
+
+def _ids_normalizados(normalizados):
+    codigos, distintos = pd.factorize(normalizados)
+    ids = np.array([_id_nome_normalizado(nome) for nome in distintos] + [SEM_VENDEDOR], dtype='int64')
+    # O código -1 (valor ausente) pega o SEM_VENDEDOR acrescentado no fim
+    return pd.Series(ids[codigos], index=normalizados.index)
+
+# Função para obter os ids de vendedor de uma coluna de nomes
+def ids_vendedores(df, coluna):
+    """Usa a coluna de ids da ingestão quando existir; senão calcula a partir dos nomes"""
+    coluna_id = f"{coluna}{SUFIXO_ID}"
+    if coluna_id in df.columns:
+        return df[coluna_id]
+    return _ids_normalizados(nomes_normalizados(df, coluna))
+
+# Formatos de data aceitos, tentados em ordem dentro de cada grupo (barra ou hífen)
+FORMATOS_DATA_BARRA = ('%d/%m/%Y', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%y')
+FORMATOS_DATA_HIFEN = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%d-%m-%Y')
+
+# Função para converter datas da planilha em datetime
+def converter_datas(serie):
+    """Converte datas dd/mm/aaaa, aaaa-mm-dd (e variações com hora) de forma vetorizada
+
+    Cada texto distinto é convertido uma vez só (as datas se repetem muito); cada formato
+    é uma chamada vetorizada de to_datetime sobre os textos que ainda não converteram.
+    Datas com hora ficam só com o dia; textos inválidos viram NaT.
+    """
+    codigos, distintos = pd.factorize(serie.astype(str).str.strip())
+    texto = pd.Series(distintos, dtype=object)
+    datas = pd.Series(pd.NaT, index=texto.index, dtype='datetime64[ns]')
+
+    com_barra = texto.str.contains('/', regex=False)
+    com_hifen = ~com_barra & texto.str.contains('-', regex=False)
+    for grupo, formatos in ((com_barra, FORMATOS_DATA_BARRA), (com_hifen, FORMATOS_DATA_HIFEN)):
+        pendentes = grupo.copy()
+        for formato in formatos:
+            if not pendentes.any():
+                break
+            datas[pendentes] = pd.to_datetime(texto[pendentes], format=formato, errors='coerce')
+            pendentes &= datas.isna()
+
+    outros = ~com_barra & ~com_hifen & ~texto.isin(['', 'nan', 'None', '<NA>'])
+    if outros.any():
+        datas[outros] = pd.to_datetime(texto[outros], format='mixed', errors='coerce')
+
+    # O código -1 (valor ausente) pega o NaT acrescentado no fim
+    datas = np.append(datas.dt.normalize().to_numpy(), np.datetime64('NaT', 'ns'))
+    return pd.Series(datas[codigos], index=serie.index)
+
+# Função para montar a data de cada linha a partir das colunas dia, mês e ano
+def montar_datas_calendario(dia, mes, ano):
+    """Datas (datetime64) de dia/ano numéricos e mês por extenso; combinações inválidas viram NaT"""
+    mes_numero = mes.astype(object).map(MESES_PARA_NUMEROS)
+    partes = pd.DataFrame({
+        'year': pd.to_numeric(ano, errors='coerce'),
+        'month': pd.to_numeric(mes_numero, errors='coerce'),
+        'day': pd.to_numeric(dia, errors='coerce'),
+    })
+    return pd.to_datetime(partes, errors='coerce')
+
+def _adicionar_calendario(df):
+    """Acrescenta data, ano e mês (COLUNA_DATA/ANO/MES) às abas com dia/mês/ano"""
+    if not all(coluna in df.columns for coluna in ('dia', 'mês', 'ano')):
+        return df
+    datas = montar_datas_calendario(df['dia'], df['mês'], df['ano'])
+    return df.assign(**{COLUNA_DATA: datas, COLUNA_ANO: datas.dt.year, COLUNA_MES: datas.dt.month})
+
+def _coluna_derivada(nome, colunas):
+    """Coluna acrescentada na ingestão (sufixos das derivadas ou calendário)"""
+    nome = str(nome)
+    if nome in (COLUNA_DATA, COLUNA_ANO, COLUNA_MES) and all(coluna in colunas for coluna in ('dia', 'mês', 'ano')):
+        return True
+    sufixos = (SUFIXO_CENTAVOS, SUFIXO_DATA, SUFIXO_ANO, SUFIXO_MES, SUFIXO_NORMALIZADO, SUFIXO_ID)
+    return any(nome.endswith(sufixo) and nome[:-len(sufixo)] in colunas for sufixo in sufixos)
+
+def _valores_get_all_records(serie):
+    """category volta a texto; números inteiros voltam a int; vazios viram ''"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.astype(object)
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        preenchidos = serie.dropna()
+        if (preenchidos == preenchidos.round()).all():
+            serie = serie.astype('Int64')
+        return serie.astype(object).where(serie.notna(), '')
+    return serie
+
+# Função para devolver um DataFrame da ingestão no formato de get_all_records()
+def formato_get_all_records(df):
+    """Só as colunas da planilha, com os valores como get_all_records() devolvia
+
+    Para código escrito contra o DataFrame de get_all_records() (como a função externa
+    de vendas All Inclusive com adicionais): sem as colunas derivadas da ingestão, com os
+    nomes do cabeçalho da planilha e índice 0..n-1. Moedas continuam no texto original
+    da planilha ('R$ 1.234,56').
+    """
+    posicoes = [posicao for posicao, nome in enumerate(df.columns) if not _coluna_derivada(nome, df.columns)]
+    planilha = df.iloc[:, posicoes].reset_index(drop=True)
+    nomes_planilha = df.attrs.get(ATRIBUTO_NOMES_PLANILHA, {})
+    planilha.columns = [nomes_planilha.get(nome, nome) for nome in planilha.columns]
+    planilha.attrs = {}
+    for posicao in range(planilha.shape[1]):
+        planilha.isetitem(posicao, _valores_get_all_records(planilha.iloc[:, posicao]))
+    return planilha
+
+# Função para obter os valores em centavos de uma coluna de moeda
+def centavos_moeda(df, coluna):
+    """Usa a coluna convertida na ingestão quando existir; senão converte o texto na hora (int64)"""
+    coluna_centavos = f"{coluna}{SUFIXO_CENTAVOS}"
+    if coluna_centavos in df.columns:
+        return df[coluna_centavos]
+    return converter_moeda_centavos(df[coluna])
+
+def _converter_coluna(nome, tipo, brutos, derivadas):
+    """Converte os textos de uma coluna (ou de um bloco dela) para o tipo declarado"""
+    if tipo == TIPO_INTEIRO:
+        return pd.to_numeric(pd.Series(brutos, dtype=object).astype(str).str.strip(), errors='coerce')
+    if tipo == TIPO_NUMERO:
+        texto = pd.Series(brutos, dtype=object).astype(str).str.strip().str.replace(',', '.', regex=False)
+        return pd.to_numeric(texto, errors='coerce')
+    if tipo in (TIPO_TEXTO, TIPO_MOEDA, TIPO_DATA, TIPO_CATEGORIA):
+        # Categoria vira category só em compactar_dtypes, com as categorias de todos os blocos
+        serie = pd.Series(brutos, dtype=object)
+        if tipo == TIPO_MOEDA:
+            derivadas.append((f"{nome}{SUFIXO_CENTAVOS}", converter_moeda_centavos(serie)))
+        elif tipo == TIPO_DATA:
+            datas = converter_datas(serie)
+            derivadas.append((f"{nome}{SUFIXO_DATA}", datas))
+            derivadas.append((f"{nome}{SUFIXO_ANO}", datas.dt.year))
+            derivadas.append((f"{nome}{SUFIXO_MES}", datas.dt.month))
+        return serie
+    return pd.Series(numericise_all(list(brutos)))
+
+def _montar_bloco(cabecalho, tipos, moedas_extras, nomes_extras, linhas, inicio):
+    """DataFrame tipado de um bloco de linhas, com índice contínuo a partir de inicio"""
+    colunas_brutas = list(zip(*linhas)) if linhas else [() for _ in cabecalho]
+    series = []
+    derivadas = []
+    for nome, tipo, brutos in zip(cabecalho, tipos, colunas_brutas):
+        series.append(_converter_coluna(nome, tipo, brutos, derivadas))
+        # Derivadas das abas sem esquema (moeda) e das colunas de nomes, a partir do texto original
+        if str(nome).strip() in moedas_extras:
+            derivadas.append((f"{nome}{SUFIXO_CENTAVOS}", converter_moeda_centavos(pd.Series(brutos, dtype=object))))
+        if str(nome).strip() in nomes_extras:
+            normalizados = normalizar_nomes(pd.Series(brutos, dtype=object))
+            derivadas.append((f"{nome}{SUFIXO_NORMALIZADO}", normalizados))
+            derivadas.append((f"{nome}{SUFIXO_ID}", _ids_normalizados(normalizados)))
+    series.extend(serie for _, serie in derivadas)
+
+    bloco = pd.DataFrame(dict(enumerate(series)), index=pd.RangeIndex(len(linhas)))
+    bloco.index = pd.RangeIndex(inicio, inicio + len(linhas))
+    return bloco, [nome for nome, _ in derivadas]
+
+# Função para montar o DataFrame tipado a partir da matriz de valores da planilha
+def montar_dataframe_tipado(valores, aba=None, tamanho_bloco=TAMANHO_BLOCO_INGESTAO, compactar=True):
+    """Monta o DataFrame a partir da matriz de get_all_values(), em blocos de linhas
+
+    O cabeçalho passa pelo esquema da aba (nomes alternativos viram o nome canônico).
+    Colunas declaradas em ESQUEMAS_ABAS[aba] já saem com o tipo final; as demais
+    recebem o mesmo tratamento de get_all_records() (numericise célula a célula).
+    Abas com dia/mês/ano (ABAS_CALENDARIO) ganham as colunas data, ano e mês numéricos.
+    Cada bloco é convertido e só então juntado, então os objetos intermediários
+    (transposição, Series de texto) ficam proporcionais a tamanho_bloco.
+    Com compactar=True o resultado passa por compactar_dtypes.
+    """
+    if not valores or valores == [[]]:
+        return pd.DataFrame()
+
+    total_colunas = max(len(linha) for linha in valores)
+    cabecalho_planilha = list(valores[0]) + [''] * (total_colunas - len(valores[0]))
+    # Nomes alternativos viram o nome canônico da aba (esquemas.py), antes de tipar as colunas
+    cabecalho = cabecalho_canonico(aba, cabecalho_planilha)
+    nomes_planilha = {canonico: original for canonico, original in zip(cabecalho, cabecalho_planilha) if canonico != original}
+    esquema = ESQUEMAS_ABAS.get(aba, {})
+    tipos = [esquema.get(str(nome).strip()) for nome in cabecalho]
+    moedas_extras = set(COLUNAS_MOEDA_ABAS.get(aba, ()))
+    nomes_extras = set(COLUNAS_NOME_ABAS.get(aba, ()))
+    total_linhas = len(valores) - 1
+
+    blocos = []
+    nomes_derivadas = []
+    for inicio in range(0, max(total_linhas, 1), tamanho_bloco):
+        # Completar linhas curtas (a API omite células vazias no fim da linha)
+        linhas = [
+            list(linha) + [''] * (total_colunas - len(linha))
+            for linha in valores[1 + inicio:1 + inicio + tamanho_bloco]
+        ]
+        bloco, nomes_derivadas = _montar_bloco(cabecalho, tipos, moedas_extras, nomes_extras, linhas, inicio)
+        blocos.append(bloco)
+
+    df = pd.concat(blocos) if len(blocos) > 1 else blocos[0]
+
+    # Montar por posição para aceitar cabeçalhos repetidos, como o DataFrame de linhas aceitava
+    df.columns = cabecalho + nomes_derivadas
+    if nomes_planilha:
+        df.attrs[ATRIBUTO_NOMES_PLANILHA] = nomes_planilha
+    if aba in ABAS_CALENDARIO:
+        df = _adicionar_calendario(df)
+    return compactar_dtypes(df, aba) if compactar else df
+
+# Função para juntar DataFrames tipados de janelas consecutivas da mesma aba
+def juntar_dataframes_tipados(partes, aba=None):
+    """Concatena as partes (montadas com o mesmo cabeçalho) na ordem, com índice 0..n-1
+
+    Os tipos compactos são aplicados uma vez no resultado: as categorias passam a ser
+    as de todas as partes e os inteiros de calendário cabem em todas elas.
+    """
+    partes = [parte for parte in partes if parte is not None]
+    if not partes:
+        return pd.DataFrame()
+    df = pd.concat(partes, ignore_index=True) if len(partes) > 1 else partes[0].reset_index(drop=True)
+    return compactar_dtypes(df, aba)
+
+def _inteiro_compacto(serie, meses_por_extenso=False):
+    """Menor inteiro que comporta a coluna; float32 quando há vazios (NaN)
+
+    Com meses_por_extenso=True, 'Janeiro'...'Dezembro' viram 1...12.
+    """
+    numeros = pd.to_numeric(serie, errors='coerce')
+    if meses_por_extenso:
+        numeros = numeros.fillna(serie.astype(str).str.strip().str.capitalize().map(MESES_PARA_NUMEROS))
+    if numeros.isna().any():
+        return numeros.astype('float32')
+    return pd.to_numeric(numeros, downcast='integer')
+
+# Função para aplicar o plano de tipos compactos a um DataFrame da ingestão
+def compactar_dtypes(df, aba=None):
+    """Texto repetitivo vira category e campos de calendário viram inteiros pequenos
+
+    Category: colunas TIPO_CATEGORIA do esquema, COLUNAS_CATEGORIA_ABAS e os nomes
+    normalizados. Inteiros: COLUNAS_CALENDARIO inteiras no esquema, o ano/mês
+    das colunas TIPO_DATA e COLUNAS_PERIODO_ABAS.
+    Os valores não mudam, só a representação em memória.
+    """
+    esquema = ESQUEMAS_ABAS.get(aba, {})
+    categorias = {nome for nome, tipo in esquema.items() if tipo == TIPO_CATEGORIA}
+    categorias.update(COLUNAS_CATEGORIA_ABAS.get(aba, ()))
+    categorias.update(f"{nome}{SUFIXO_NORMALIZADO}" for nome in COLUNAS_NOME_ABAS.get(aba, ()))
+    calendario = {nome for nome, tipo in esquema.items() if tipo == TIPO_INTEIRO and nome in COLUNAS_CALENDARIO}
+    if aba in ABAS_CALENDARIO:
+        calendario.update((COLUNA_ANO, COLUNA_MES))
+    for nome, tipo in esquema.items():
+        if tipo == TIPO_DATA:
+            calendario.update((f"{nome}{SUFIXO_ANO}", f"{nome}{SUFIXO_MES}"))
+    periodo = set(COLUNAS_PERIODO_ABAS.get(aba, ()))
+
+    # Por posição, para aceitar cabeçalhos repetidos
+    for posicao, nome in enumerate(df.columns):
+        nome = str(nome).strip()
+        if nome in categorias and not isinstance(df.dtypes.iloc[posicao], pd.CategoricalDtype):
+            df.isetitem(posicao, df.iloc[:, posicao].astype('category'))
+        elif nome in calendario:
+            df.isetitem(posicao, _inteiro_compacto(df.iloc[:, posicao]))
+        elif nome in periodo:
+            df.isetitem(posicao, _inteiro_compacto(df.iloc[:, posicao], meses_por_extenso=True))
+    return df
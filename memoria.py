@@ -0,0 +1,60 @@
+import pandas as pd
+from ingestao import montar_dataframe_tipado
+
+# Colunas do relatório de memória
+COLUNAS_RELATORIO = ['aba', 'linhas', 'antes', 'depois', 'economia']
+
+# Função para medir a memória ocupada por um DataFrame
+def uso_memoria(df):
+    """Bytes do DataFrame, contando o conteúdo dos textos (deep=True)"""
+    return int(df.memory_usage(deep=True).sum())
+
+# Função para comparar a memória de cada aba antes e depois de compactar os tipos
+def relatorio_memoria(valores_abas):
+    """valores_abas: iterável de (aba, valores). Retorna um DataFrame com uma linha por aba
+
+    'antes' é o DataFrame tipado sem compactar_dtypes e 'depois' o que o painel usa.
+    """
+    linhas = []
+    for aba, valores in valores_abas:
+        if isinstance(valores, pd.DataFrame):
+            # Aba lida em blocos, já tipada: 'antes' volta as categorias a texto
+            if valores.empty:
+                continue
+            depois = valores
+            antes = valores.astype({
+                coluna: object for coluna, tipo in valores.dtypes.items() if isinstance(tipo, pd.CategoricalDtype)
+            })
+        elif not valores or len(valores) < 2:
+            continue
+        else:
+            antes = montar_dataframe_tipado(valores, aba, compactar=False)
+            depois = montar_dataframe_tipado(valores, aba)
+        linhas.append((aba, len(depois), uso_memoria(antes), uso_memoria(depois)))
+
+    relatorio = pd.DataFrame(linhas, columns=COLUNAS_RELATORIO[:-1])
+    relatorio['economia'] = 1 - relatorio['depois'] / relatorio['antes'].where(relatorio['antes'] > 0)
+    return relatorio[COLUNAS_RELATORIO]
+
+# Função para montar o relatório a partir das abas lidas da fonte configurada
+def relatorio_da_fonte(leitor, abas_por_planilha):
+    """abas_por_planilha: iterável de (planilha_id, abas)"""
+    valores_abas = []
+    for planilha_id, abas in abas_por_planilha:
+        valores_abas.extend(leitor(planilha_id, list(abas)).items())
+    return relatorio_memoria(valores_abas)
+
+if __name__ == '__main__':
+    # python memoria.py  (lê da fonte de PAINEL_FONTE_DADOS)
+    from fontes_dados import obter_leitor_valores
+    from planilhas_google import (
+        PLANILHA_PRINCIPAL_ID, PLANILHA_VENDEDORES_ID, ABAS_PLANILHA_PRINCIPAL, ABAS_PLANILHA_VENDEDORES
+    )
+    relatorio = relatorio_da_fonte(obter_leitor_valores(), (
+        (PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL), (PLANILHA_VENDEDORES_ID, ABAS_PLANILHA_VENDEDORES)
+    ))
+    for linha in relatorio.itertuples(index=False):
+        print(f"{linha.aba:<25} {linha.linhas:>8} linhas  {linha.antes / 2**20:>8.2f} MiB -> "
+              f"{linha.depois / 2**20:>8.2f} MiB  ({linha.economia:.0%})")
+    print(f"{'Total':<25} {relatorio['linhas'].sum():>8} linhas  {relatorio['antes'].sum() / 2**20:>8.2f} MiB -> "
+          f"{relatorio['depois'].sum() / 2**20:>8.2f} MiB")
@@ -0,0 +1,158 @@
+import math
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Valores de moeda circulam como inteiros em centavos (int64): somas e divisões de comissão
+# ficam exatas; reais (float) e textos 'R$ 1.234,56' só aparecem na exibição
+CENTAVOS_POR_REAL = 100
+
+# Percentuais em inteiros: 1_000_000 = 100% (3,5% -> 35000), exatos até a 4ª casa do percentual
+ESCALA_PERCENTUAL = 1_000_000
+
+# Troca de separadores do formato americano (1,234.56) para o brasileiro (1.234,56)
+_SEPARADORES_BRL = str.maketrans({',': '.', '.': ','})
+
+def _limpar_texto(texto):
+    """Remove 'R$', espaços e pontos de milhares e troca a vírgula decimal por ponto
+
+    A planilha separa 'R$' do número com espaço não separável e escreve negativos como
+    '-R$ 1,50' ou 'R$ -1,50': sem os espaços os dois viram '-1.50'.
+    """
+    texto = texto.replace('R$', '')
+    texto = ''.join(texto.split())  # Remove espaços (inclusive o não separável)
+    texto = texto.replace('.', '')  # Remove pontos de milhares
+    return texto.replace(',', '.')  # Converte vírgula decimal para ponto
+
+def _decimal_para_centavos(numero):
+    return int((numero * CENTAVOS_POR_REAL).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+@lru_cache(maxsize=4096)
+def _texto_para_centavos(limpo):
+    """'1234.56' (já sem R$ e milhares) -> 123456; vazios e inválidos viram 0"""
+    try:
+        numero = Decimal(limpo) if limpo else Decimal(0)
+    except InvalidOperation:
+        return 0
+    return _decimal_para_centavos(numero) if numero.is_finite() else 0
+
+def _numero_para_centavos(valor):
+    # repr do float é o menor texto que volta ao mesmo número (0.1 -> '0.1', não 0.1000000000000000055)
+    valor = valor.item() if isinstance(valor, np.generic) else valor
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return 0
+    return _decimal_para_centavos(Decimal(repr(valor)))
+
+# Função para converter textos de moeda brasileira em centavos
+def converter_moeda_centavos(serie):
+    """Converte 'R$ 1.234,56' em 123456 (int64) de forma vetorizada (valores inválidos viram 0)
+
+    O texto vai direto para centavos, sem passar por float; meio centavo é arredondado
+    para longe do zero (0,005 -> 1 e -0,005 -> -1), também para colunas float.
+    Cada valor distinto é convertido uma vez só.
+    """
+    if pd.api.types.is_integer_dtype(serie):
+        return serie.astype('int64') * CENTAVOS_POR_REAL
+
+    codigos, distintos = pd.factorize(serie)
+    centavos = [valor_moeda_centavos(valor) for valor in distintos]
+    # O código -1 (valor ausente) pega o zero acrescentado no fim
+    centavos = np.array(centavos + [0], dtype='int64')
+    return pd.Series(centavos[codigos], index=serie.index)
+
+# Função para converter um único valor de moeda brasileira em centavos
+def valor_moeda_centavos(valor):
+    """Versão escalar de converter_moeda_centavos: 'R$ 1.234,56' -> 123456 (inválidos e vazios viram 0)"""
+    if isinstance(valor, (int, float, np.integer, np.floating)) and not isinstance(valor, (bool, np.bool_)):
+        return _numero_para_centavos(valor)
+    if valor is None or valor is pd.NA:
+        return 0
+    return _texto_para_centavos(_limpar_texto(str(valor)))
+
+@lru_cache(maxsize=1024)
+def _texto_para_percentual(limpo):
+    """'3.5' (pontos percentuais, já sem '%') -> 35000; vazios e inválidos viram 0"""
+    try:
+        numero = Decimal(limpo) if limpo else Decimal(0)
+    except InvalidOperation:
+        return 0
+    if not numero.is_finite():
+        return 0
+    return int((numero * ESCALA_PERCENTUAL / 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def _percentual_para_escala(valor):
+    valor = valor.item() if isinstance(valor, np.generic) else valor
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return _texto_para_percentual(repr(valor)) if math.isfinite(valor) else 0
+    if valor is None or valor is pd.NA:
+        return 0
+    limpo = ''.join(str(valor).replace('%', '').split()).replace(',', '.')
+    return _texto_para_percentual(limpo)
+
+# Função para aplicar percentuais sobre valores em centavos
+def aplicar_percentual_centavos(centavos, percentuais):
+    """Parcela de cada valor em centavos: 12345 a '5%' -> 617 (int64)
+
+    percentuais: Series alinhada a centavos, com textos '5%', '3,5%' ou números em pontos
+    percentuais (5 = 5%); inválidos e vazios valem 0%. A conta é feita em inteiros e o
+    meio centavo é arredondado para longe do zero, como na conversão dos textos.
+    """
+    codigos, distintos = pd.factorize(percentuais)
+    escalas = np.array([_percentual_para_escala(valor) for valor in distintos] + [0], dtype='int64')[codigos]
+    produtos = centavos.to_numpy(dtype='int64') * escalas
+    parcelas = (np.abs(produtos) + ESCALA_PERCENTUAL // 2) // ESCALA_PERCENTUAL
+    return pd.Series(np.sign(produtos) * parcelas, index=centavos.index)
+
+# Função para converter centavos em reais
+def centavos_para_reais(centavos):
+    """123456 -> 1234.56 (float); aceita um número ou uma Series. Só para exibição e gráficos"""
+    if isinstance(centavos, pd.Series):
+        return pd.to_numeric(centavos, errors='coerce').fillna(0) / CENTAVOS_POR_REAL
+    return float(centavos) / CENTAVOS_POR_REAL
+
+def _centavos_para_texto(centavos):
+    sinal = '-' if centavos < 0 else ''
+    reais, resto = divmod(abs(centavos), CENTAVOS_POR_REAL)
+    return f"{sinal}{reais:,}".translate(_SEPARADORES_BRL) + f",{resto:02d}"
+
+# Função para formatar centavos como moeda brasileira
+def formatar_centavos_brl(centavos):
+    """Formata 123450 como 'R$ 1.234,50' sem passar por float; aceita um número ou uma Series
+
+    Valores fracionários (ticket médio em centavos) são arredondados para o centavo;
+    NaN vira 'R$ 0,00'.
+    """
+    if isinstance(centavos, pd.Series):
+        inteiros = pd.to_numeric(centavos, errors='coerce').fillna(0).round().astype('int64')
+        return inteiros.map(lambda valor: f"R$ {_centavos_para_texto(valor)}").astype(object)
+
+    numero = float(centavos)
+    if math.isnan(numero):
+        numero = 0.0
+    return f"R$ {_centavos_para_texto(round(numero))}"
+
+# Função para formatar números no padrão brasileiro
+def formatar_numero_brl(valor, casas=2):
+    """Formata 1234.5 como '1.234,50'; aceita um número ou uma Series (NaN vira zero)"""
+    padrao = f"{{:,.{casas}f}}"
+    if isinstance(valor, pd.Series):
+        numeros = pd.to_numeric(valor, errors='coerce').astype(float).fillna(0)
+        return numeros.map(padrao.format).str.translate(_SEPARADORES_BRL).astype(object)
+
+    numero = float(valor)
+    if math.isnan(numero):
+        numero = 0.0
+    return padrao.format(numero).translate(_SEPARADORES_BRL)
+
+# Função para formatar razões como percentual brasileiro
+def formatar_percentual_brl(valor):
+    """Formata 0.1234 como '12,34%'; aceita um número ou uma Series (NaN vira '0,00%')"""
+    if isinstance(valor, pd.Series):
+        numeros = pd.to_numeric(valor, errors='coerce').astype(float).fillna(0) * 100
+        return numeros.map('{:.2f}%'.format).str.replace('.', ',', regex=False).astype(object)
+
+    numero = float(valor)
+    if math.isnan(numero):
+        numero = 0.0
+    return f"{numero:.2%}".replace('.', ',')
@@ -1,43 +1,28 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import gspread
-from google.oauth2.service_account import Credentials
 import calendar
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib import colors as rl_colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import io
 from funcao_vendas_luck_com_adic_ai import calcular_vendas_luck_com_adicionais_all_inclusive
-
-# Função para carregar credenciais (Streamlit Cloud ou local)
-def get_google_credentials():
-    """Carrega credenciais do Google - Streamlit Secrets ou arquivo local"""
-    try:
-        # Tentar carregar do Streamlit Secrets (produção)
-        if hasattr(st, 'secrets') and 'gcp_service_account' in st.secrets:
-            return Credentials.from_service_account_info(
-                st.secrets["gcp_service_account"],
-                scopes=['https://spreadsheets.google.com/feeds',
-                       'https://www.googleapis.com/auth/drive']
-            )
-    except:
-        pass
-    
-    # Fallback: arquivo local (desenvolvimento)
-    try:
-        return Credentials.from_service_account_file(
-            'bustling-day-459711-q8-e889589cda14.json',
-            scopes=['https://spreadsheets.google.com/feeds',
-                   'https://www.googleapis.com/auth/drive']
-        )
-    except Exception as e:
-        st.error(f"❌ Erro ao carregar credenciais: {e}")
-        st.info("💡 Configure os secrets no Streamlit Cloud ou adicione o arquivo JSON localmente")
-        return None
+from planilhas_google import (
+    ler_valores_em_lote, versao_planilha,
+    PLANILHA_PRINCIPAL_ID, PLANILHA_VENDEDORES_ID, SERVICOS_TERCEIROS_GID,
+    ABAS_PLANILHA_PRINCIPAL, ABAS_PLANILHA_VENDEDORES
+)
+from carregamento import carregar_em_paralelo, executar_uma_vez
+from cache_disco import obter_valores_com_snapshot, horario_dados, versao_valores, falha_atualizacao
+from ingestao import montar_dataframe_tipado, formato_get_all_records, centavos_moeda, converter_datas, MESES_PARA_NUMEROS, COLUNA_DATA, normalizar_nome, nomes_normalizados, id_vendedor, ids_vendedores
+from moeda import converter_moeda_centavos, aplicar_percentual_centavos, formatar_centavos_brl, formatar_numero_brl
+from exibicao import mostrar_grid, formatar_texto, formatar_linha_texto
+from particoes import particionar, selecionar_periodo, mascara_periodo
+from esquemas import tem_colunas, campos_faltando
+from vendedores import somar_por_vendedor, paxs_in_do_grid, somar_por_vendedor_mes, somar_periodo_por_vendedor, filtrar_vendedores, linhas_por_vendedor, unificar_vendedores
+from fontes_dados import obter_leitor_valores, versao_fonte_local, FONTE_DADOS, FONTE_GOOGLE
+from importacoes_tardias import importar_tardio
+
+# Copy-on-Write: os DataFrames preparados são compartilhados entre sessões e entregues como
+# visões rasas; alterar uma visão nunca altera o original (sempre ligado a partir do pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
 
 # Dicionário de meses
 meses = {
@@ -77,24 +62,75 @@ def ordenar_tipos_vendedor(tipos):
     
     return tipos_ordenados
 
+# Função para ler todas as abas de uma planilha em uma única chamada
+def carregar_valores_planilha(planilha_id, abas):
+    """Retorna (valores, versoes): dict aba -> matriz de valores (ou DataFrame tipado) e dict aba -> token de versão
+    Compartilhado pelos carregar_* da mesma planilha (os valores ficam em memória no cache_disco)
+    Após reinício, serve o snapshot em disco e atualiza do Google em segundo plano
+    Com PAINEL_FONTE_DADOS = arquivos, sqlite ou snapshots a leitura é local (sem rede)
+    """
+    if FONTE_DADOS != FONTE_GOOGLE:
+        return carregar_valores_locais(planilha_id, abas, versao_fonte_local(planilha_id, abas))
+
+    # Planilha sem edição no Drive desde a última busca: a atualização não baixa nada
+    return obter_valores_com_snapshot(planilha_id, abas, ler_valores_em_lote, consultar_versao=versao_planilha)
+
+# Função para ler as abas de uma fonte local (arquivos, SQLite ou snapshots)
+@st.cache_resource(max_entries=4)
+def carregar_valores_locais(planilha_id, abas, versao_fonte):
+    """Mesmo retorno de carregar_valores_planilha; matrizes compartilhadas, somente leitura
+
+    versao_fonte (versao_fonte_local) só entra na chave do cache: arquivos regravados
+    são lidos de novo e os DataFrames seguem as versões do conteúdo de cada aba.
+    """
+    valores = executar_uma_vez(('ler_local', planilha_id, abas, versao_fonte), lambda: obter_leitor_valores()(planilha_id, abas))
+    return valores, {aba: versao_valores(valores_aba) for aba, valores_aba in valores.items()}
+
+# Função para preparar o DataFrame de uma aba, uma vez por versão do conteúdo e por processo
+@st.cache_resource(max_entries=20)
+def preparar_dataframe_aba(aba, versao, _valores):
+    """DataFrame tipado compartilhado por todas as sessões; nunca é alterado depois de pronto
+
+    Abas lidas em blocos (ABAS_EM_BLOCOS) já chegam tipadas do leitor e são usadas como vieram.
+    """
+    if isinstance(_valores, pd.DataFrame):
+        return _valores
+    return montar_dataframe_tipado(_valores, aba)
+
+# Função para obter o DataFrame de uma aba sem copiar os dados
+def montar_dataframe_aba(aba, versao, valores):
+    """Visão rasa do DataFrame preparado: com copy-on-write, o que o chamador alterar fica só na visão"""
+    return preparar_dataframe_aba(aba, versao, valores).copy(deep=False)
+
+# Função para dividir uma aba em partições (ano, mês), em cache pela versão do conteúdo
+@st.cache_resource(max_entries=6)
+def particionar_aba(aba, versao, _valores):
+    """Partições compartilhadas e somente leitura; os recortes de período são visões rasas"""
+    return particionar(preparar_dataframe_aba(aba, versao, _valores), aba)
+
+# Função para carregar só os meses do período selecionado de uma aba
+def carregar_periodo(planilha_id, abas, aba, ano_inicial, mes_inicial, ano_final, mes_final):
+    """DataFrame com as partições (ano, mês) do período: o custo acompanha o período, não o histórico"""
+    try:
+        valores, versoes = carregar_valores_planilha(planilha_id, abas)
+        if valores is None:
+            return pd.DataFrame()
+        
+        particoes = particionar_aba(aba, versoes[aba], valores[aba])
+        return selecionar_periodo(particoes, ano_inicial, mes_inicial, ano_final, mes_final)
+    except Exception as e:
+        st.error(f"Erro ao carregar o período de {aba}: {e}")
+        return pd.DataFrame()
+
 # Função para conectar ao Google Sheets
-@st.cache_data(ttl=300)
 def carregar_dados_google_sheets():
     try:
-        # Configurar credenciais
-        creds = get_google_credentials()
-        if not creds:
+        # Ler a aba Vendedores (busca em lote com as demais abas da planilha)
+        valores, versoes = carregar_valores_planilha(PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL)
+        if valores is None:
             return pd.DataFrame()
         
-        client = gspread.authorize(creds)
-        
-        # Abrir a planilha
-        sheet = client.open_by_url('https://docs.google.com/spreadsheets/d/1tkjltVrS_8SI4assF0Wlp2CwHhCZbmMt2Lfwi9BVuxY/edit?gid=753037688#gid=753037688')
-        
-        # Ler a aba Vendedores
-        worksheet = sheet.worksheet('Vendedores')
-        dados = worksheet.get_all_records()
-        df = pd.DataFrame(dados)
+        df = montar_dataframe_aba('Vendedores', versoes['Vendedores'], valores['Vendedores'])
         
         return df
     except Exception as e:
@@ -102,23 +138,14 @@ def carregar_dados_google_sheets():
         return pd.DataFrame()
 
 # Função para carregar dados de vendas da aba "Dados Finais Vendas"
-@st.cache_data(ttl=300)
 def carregar_dados_vendas():
     try:
-        # Configurar credenciais
-        creds = get_google_credentials()
-        if not creds:
+        # Ler a aba Dados Finais Vendas (busca em lote com as demais abas da planilha)
+        valores, versoes = carregar_valores_planilha(PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL)
+        if valores is None:
             return pd.DataFrame()
         
-        client = gspread.authorize(creds)
-        
-        # Abrir a planilha
-        sheet = client.open_by_url('https://docs.google.com/spreadsheets/d/1tkjltVrS_8SI4assF0Wlp2CwHhCZbmMt2Lfwi9BVuxY/edit?gid=1889628361#gid=1889628361')
-        
-        # Ler a aba Dados Finais Vendas
-        worksheet = sheet.worksheet('Dados Finais Vendas')
-        dados = worksheet.get_all_records()
-        df_vendas = pd.DataFrame(dados)
+        df_vendas = montar_dataframe_aba('Dados Finais Vendas', versoes['Dados Finais Vendas'], valores['Dados Finais Vendas'])
         
         return df_vendas
     except Exception as e:
@@ -126,23 +153,14 @@ def carregar_dados_vendas():
         return pd.DataFrame()
 
 # Função para carregar dados de Paxs In da aba "Dados In de Escala"
-@st.cache_data(ttl=300)
 def carregar_dados_paxs_in():
     try:
-        # Configurar credenciais
-        creds = get_google_credentials()
-        if not creds:
+        # Ler a aba Dados In de Escala (busca em lote com as demais abas da planilha)
+        valores, versoes = carregar_valores_planilha(PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL)
+        if valores is None:
             return pd.DataFrame()
         
-        client = gspread.authorize(creds)
-        
-        # Abrir a planilha
-        sheet = client.open_by_url('https://docs.google.com/spreadsheets/d/1tkjltVrS_8SI4assF0Wlp2CwHhCZbmMt2Lfwi9BVuxY/edit?gid=453466581#gid=453466581')
-        
-        # Ler a aba Dados In de Escala
-        worksheet = sheet.worksheet('Dados In de Escala')
-        dados = worksheet.get_all_records()
-        df_paxs = pd.DataFrame(dados)
+        df_paxs = montar_dataframe_aba('Dados In de Escala', versoes['Dados In de Escala'], valores['Dados In de Escala'])
         
         return df_paxs
     except Exception as e:
@@ -150,37 +168,24 @@ def carregar_dados_paxs_in():
         return pd.DataFrame()
 
 # Função para carregar serviços terceirizados
-@st.cache_data(ttl=300)
 def carregar_servicos_terceiros():
     """Carrega a lista de serviços terceirizados do Google Sheets"""
     try:
-        # Configurar credenciais
-        creds = get_google_credentials()
-        if not creds:
-            return []
-        
-        client = gspread.authorize(creds)
-        
-        # ID da planilha de valores finais onde estão os serviços terceirizados
-        ALL_INCLUSIVE_SPREADSHEET_ID = '1tkjltVrS_8SI4assF0Wlp2CwHhCZbmMt2Lfwi9BVuxY'
-        SERVICOS_TERCEIROS_GID = 1111997089  # ID da aba de serviços terceirizados
+        # Aba de serviços terceirizados (busca em lote com as demais abas da planilha principal)
+        valores_planilha, _ = carregar_valores_planilha(PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL)
         
-        # Abrir planilha e aba específica de serviços
-        spreadsheet = client.open_by_key(ALL_INCLUSIVE_SPREADSHEET_ID)
-        worksheet = spreadsheet.get_worksheet_by_id(SERVICOS_TERCEIROS_GID)
-        
-        if not worksheet:
+        if valores_planilha is None or SERVICOS_TERCEIROS_GID not in valores_planilha:
             st.error("Não foi possível encontrar a aba de serviços terceirizados")
             return []
             
         # Pegar todos os valores da coluna Nome do Serviço
         try:
-            valores = worksheet.get_all_values()
+            valores = valores_planilha[SERVICOS_TERCEIROS_GID]
             if len(valores) > 1:  # Se tiver pelo menos cabeçalho e uma linha
                 # Encontrar índice da coluna Nome do Serviço
                 header = valores[0]
                 servico_idx = header.index("Nome do Serviço") if "Nome do Serviço" in header else 0
-                return [row[servico_idx] for row in valores[1:] if row and row[servico_idx]]
+                return [row[servico_idx] for row in valores[1:] if len(row) > servico_idx and row[servico_idx]]
         except Exception as e:
             st.error(f"Erro ao ler serviços terceirizados: {e}")
             return []
@@ -192,27 +197,15 @@ def carregar_servicos_terceiros():
         return []
 
 # Função para carregar dados de vendedores (para comissão Luck)
-@st.cache_data(ttl=300)
 def carregar_dados_vendedores():
     """Carrega dados de vendedores da aba Dados Vendedores para buscar comissões"""
     try:
-        # Configurar credenciais
-        creds = get_google_credentials()
-        if not creds:
+        # Ler a aba Dados Vendedores (busca em lote com as demais abas da planilha)
+        valores, versoes = carregar_valores_planilha(PLANILHA_VENDEDORES_ID, ABAS_PLANILHA_VENDEDORES)
+        if valores is None:
             return pd.DataFrame()
         
-        client = gspread.authorize(creds)
-        
-        # ID da planilha principal onde estão os dados de vendedores
-        VENDEDORES_SPREADSHEET_ID = '1--dYU8SplKM8wdYtag2MzdggWujtsgAx2lRCmFBPlJs'
-        
-        # Abrir planilha e aba Dados Vendedores
-        spreadsheet = client.open_by_key(VENDEDORES_SPREADSHEET_ID)
-        worksheet = spreadsheet.worksheet('Dados Vendedores')
-        
-        # Pegar todos os dados
-        dados = worksheet.get_all_records()
-        df_vendedores = pd.DataFrame(dados)
+        df_vendedores = montar_dataframe_aba('Dados Vendedores', versoes['Dados Vendedores'], valores['Dados Vendedores'])
         
         return df_vendedores
             
@@ -221,54 +214,21 @@ def carregar_dados_vendedores():
         return pd.DataFrame()
 
 # Função para carregar dados de Meta Diaria
-@st.cache_data(ttl=300)
 def carregar_dados_meta_diaria():
     """Carrega dados da aba Meta Diaria"""
     try:
-        # Configurar credenciais
-        creds = get_google_credentials()
-        if not creds:
+        # Ler a aba Meta Diaria (busca em lote com as demais abas da planilha)
+        valores, versoes = carregar_valores_planilha(PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL)
+        if valores is None:
             return pd.DataFrame()
         
-        client = gspread.authorize(creds)
-        
-        # Abrir a planilha
-        sheet = client.open_by_url('https://docs.google.com/spreadsheets/d/1tkjltVrS_8SI4assF0Wlp2CwHhCZbmMt2Lfwi9BVuxY/edit?gid=2134646456#gid=2134646456')
-        
-        # Ler a aba Meta Diaria
-        worksheet = sheet.worksheet('Meta Diaria')
-        dados = worksheet.get_all_records()
-        df_meta = pd.DataFrame(dados)
+        df_meta = montar_dataframe_aba('Meta Diaria', versoes['Meta Diaria'], valores['Meta Diaria'])
         
         return df_meta
     except Exception as e:
         st.error(f"Erro ao carregar dados de Meta Diaria: {e}")
         return pd.DataFrame()
 
-# Função para normalizar nomes
-def normalizar_nome(nome):
-    """Normaliza nomes para comparação"""
-    if pd.isna(nome):
-        return ''
-    
-    import unicodedata
-    import re
-    
-    # Converter para string e remover espaços extras
-    nome = str(nome).strip()
-    
-    # Remover acentos
-    nome = unicodedata.normalize('NFD', nome)
-    nome = ''.join(char for char in nome if unicodedata.category(char) != 'Mn')
-    
-    # Converter para maiúsculas e remover caracteres especiais
-    nome = re.sub(r'[^A-Za-z0-9\s]', '', nome.upper())
-    
-    # Remover espaços duplos
-    nome = re.sub(r'\s+', ' ', nome).strip()
-    
-    return nome
-
 # Função para buscar comissão Luck
 def buscar_comissao_luck(vendedor, mes, ano, df_vendedores):
     """Busca comissão Luck baseada em vendedor, mês e ano"""
@@ -328,24 +288,24 @@ def buscar_comissao_luck(vendedor, mes, ano, df_vendedores):
                 st.error(f"❌ Colunas faltando: {set(colunas_necessarias) - set(colunas_existentes)}")
             return ''
         
-        # Filtrar dados - converter mês para int para comparação
+        # Filtrar dados - mês e Ano já são numéricos desde a ingestão (COLUNAS_PERIODO_ABAS)
         mes_int = int(mes_str)
         
         filtro = (
-            (df_vendedores['Vendedor'].apply(normalizar_nome) == vendedor_norm) &
-            (df_vendedores['mês'].apply(lambda x: int(x) if pd.notna(x) else 0) == mes_int) &
+            (nomes_normalizados(df_vendedores, 'Vendedor') == vendedor_norm) &
+            (df_vendedores['mês'] == mes_int) &
             (df_vendedores['Ano'] == ano)
         )
         
         if debug_ativo:
-            vendedores_unicos = df_vendedores['Vendedor'].apply(normalizar_nome).unique()
+            vendedores_unicos = nomes_normalizados(df_vendedores, 'Vendedor').unique()
             st.write(f"- Total de vendedores únicos: {len(vendedores_unicos)}")
             st.write(f"- Primeiros 30 vendedores (normalizados): {sorted(vendedores_unicos)[:30]}")
             st.write(f"- '{vendedor_norm}' está na lista? {vendedor_norm in vendedores_unicos}")
             st.write(f"- Total de linhas que atendem o filtro: {filtro.sum()}")
             
             # Verificar registros do vendedor (independente de mês/ano)
-            filtro_vendedor_apenas = df_vendedores['Vendedor'].apply(normalizar_nome) == vendedor_norm
+            filtro_vendedor_apenas = nomes_normalizados(df_vendedores, 'Vendedor') == vendedor_norm
             st.write(f"- Total de registros deste vendedor (qualquer período): {filtro_vendedor_apenas.sum()}")
             
             if filtro_vendedor_apenas.sum() > 0:
@@ -434,12 +394,12 @@ def buscar_comissao_terceiros(vendedor, mes, ano, df_vendedores):
                 st.error(f"❌ Colunas faltando: {set(colunas_necessarias) - set(colunas_existentes)}")
             return ''
         
-        # Filtrar dados - converter mês para int para comparação
+        # Filtrar dados - mês e Ano já são numéricos desde a ingestão (COLUNAS_PERIODO_ABAS)
         mes_int = int(mes_str)
         
         filtro = (
-            (df_vendedores['Vendedor'].apply(normalizar_nome) == vendedor_norm) &
-            (df_vendedores['mês'].apply(lambda x: int(x) if pd.notna(x) else 0) == mes_int) &
+            (nomes_normalizados(df_vendedores, 'Vendedor') == vendedor_norm) &
+            (df_vendedores['mês'] == mes_int) &
             (df_vendedores['Ano'] == ano)
         )
         
@@ -447,7 +407,7 @@ def buscar_comissao_terceiros(vendedor, mes, ano, df_vendedores):
             st.write(f"- Total de linhas que atendem o filtro: {filtro.sum()}")
             
             # Verificar registros do vendedor (independente de mês/ano)
-            filtro_vendedor_apenas = df_vendedores['Vendedor'].apply(normalizar_nome) == vendedor_norm
+            filtro_vendedor_apenas = nomes_normalizados(df_vendedores, 'Vendedor') == vendedor_norm
             st.write(f"- Total de registros deste vendedor (qualquer período): {filtro_vendedor_apenas.sum()}")
             
             if filtro_vendedor_apenas.sum() > 0:
@@ -484,33 +444,6 @@ def buscar_comissao_terceiros(vendedor, mes, ano, df_vendedores):
             st.error(f"💥 Erro na busca Terceiros: {str(e)}")
             st.code(traceback.format_exc())
         return f'Erro: {str(e)}'
-        
-        # Verificar se as colunas necessárias existem
-        colunas_necessarias = ['Vendedor', 'mês', 'Ano', 'Comissão Terceiros']
-        colunas_existentes = [col for col in colunas_necessarias if col in df_vendedores.columns]
-        
-        if len(colunas_existentes) < 4:
-            return ''
-        
-        # Filtrar dados
-        filtro = (
-            (df_vendedores['Vendedor'].apply(normalizar_nome) == vendedor_norm) &
-            (df_vendedores['mês'].apply(lambda x: str(x).zfill(2)) == mes_str) &
-            (df_vendedores['Ano'] == ano)
-        )
-        
-        resultado = df_vendedores.loc[filtro, 'Comissão Terceiros']
-        
-        if not resultado.empty:
-            valor = resultado.iloc[0]
-            # Retornar valor se não for nulo/vazio
-            if pd.notna(valor) and str(valor).strip() != '':
-                return str(valor).strip()
-        
-        return ''
-        
-    except Exception as e:
-        return f'Erro: {str(e)}'
 
 # Função auxiliar para buscar ticket médio real do vendedor (aproximação)
 def calcular_ticket_medio_aproximado(vendedor, mes, ano, df_vendas_global=None):
@@ -529,21 +462,24 @@ def calcular_ticket_medio_aproximado(vendedor, mes, ano, df_vendas_global=None):
     except:
         return 1000.0
 
+# Função para calcular o ticket médio de cada linha de um grid
+def calcular_ticket_medio(vendas_centavos, paxs):
+    """Centavos por pax, arredondados ao centavo (zero quando não há paxs)"""
+    return (vendas_centavos / paxs).where(paxs > 0, 0).round().astype('int64')
+
+# Função para calcular o alcance de meta de cada linha de um grid
+def calcular_alcance_meta(ticket_centavos, meta_centavos):
+    """Razão ticket médio / meta (1.2 = 120%), com as 2 casas do percentual (zero quando não há meta)"""
+    return (ticket_centavos / meta_centavos).where(meta_centavos > 0, 0).round(4)
+
 # Função para calcular premiação baseada no alcance da meta
-def calcular_premiacao_transferista(alcance_meta_str):
-    """Calcula a premiação baseada no alcance da meta para Transferistas"""
+def calcular_premiacao_transferista(alcance_meta):
+    """Calcula a premiação baseada no alcance da meta (razão, 1.2 = 120%) para Transferistas"""
     try:
-        if not alcance_meta_str or alcance_meta_str == '':
+        if alcance_meta is None or pd.isna(alcance_meta):
             return '0%'
         
-        # Converter string de percentual para número
-        # Formato esperado: "120,50%" ou "95,25%"
-        alcance_limpo = str(alcance_meta_str).replace('%', '').replace(',', '.').strip()
-        
-        if not alcance_limpo:
-            return '0%'
-        
-        alcance_num = float(alcance_limpo)
+        alcance_num = float(alcance_meta) * 100
         
         # Aplicar lógica de premiação escalonada
         if alcance_num >= 150.0:
@@ -563,396 +499,36 @@ def calcular_premiacao_transferista(alcance_meta_str):
         return '0%'
 
 # ================== FUNÇÕES DE GERAÇÃO DE PDF ==================
+# A geração fica em relatorios_pdf.py, importado só quando o primeiro PDF é pedido
+
+# Os dados guardados no session_state são numéricos; o texto do PDF é formatado aqui (exibicao.py)
 
 def gerar_pdf_estatistico(vendedor, periodo_texto, dados_grid1, dados_grid2, dados_resumo):
     """Gera PDF com relatório estatístico do vendedor"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=15*mm, leftMargin=15*mm, topMargin=15*mm, bottomMargin=15*mm)
-    elementos = []
-    styles = getSampleStyleSheet()
-    
-    # Estilo customizado
-    titulo_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        textColor=rl_colors.HexColor('#1f77b4'),
-        spaceAfter=6,
-        alignment=TA_CENTER
-    )
-    
-    subtitulo_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=rl_colors.grey,
-        spaceAfter=8,
-        alignment=TA_CENTER
+    relatorios_pdf = importar_tardio('relatorios_pdf')
+    return relatorios_pdf.gerar_pdf_estatistico(
+        vendedor, periodo_texto,
+        formatar_linha_texto(dados_grid1), formatar_linha_texto(dados_grid2), formatar_linha_texto(dados_resumo)
     )
-    
-    secao_style = ParagraphStyle(
-        'CustomSection',
-        parent=styles['Heading2'],
-        fontSize=11,
-        textColor=rl_colors.HexColor('#2ca02c'),
-        spaceAfter=4,
-        spaceBefore=6
-    )
-    
-    # Título
-    elementos.append(Paragraph("RELATÓRIO ESTATÍSTICO", titulo_style))
-    elementos.append(Paragraph(f"Vendedor: <b>{vendedor}</b> | Período: {periodo_texto}", subtitulo_style))
-    elementos.append(Spacer(1, 4*mm))
-    
-    # Seção 1: Vendas Luck Sem Adicionais
-    elementos.append(Paragraph("📊 VENDAS LUCK SEM ADICIONAIS", secao_style))
-    
-    if dados_grid1:
-        data_grid1 = [
-            ['Métrica', 'Valor'],
-            ['Vendas Luck Sem Adicionais', dados_grid1.get('Vendas Luck Sem Adicionais', 'R$ 0,00')],
-            ['Paxs In', dados_grid1.get('Paxs In', '0')],
-            ['Ticket Médio', dados_grid1.get('Ticket Médio', 'R$ 0,00')],
-            ['Meta', dados_grid1.get('Meta', 'R$ 0,00')],
-            ['Alcance de Meta', dados_grid1.get('Alcance de Meta', '0,00%')],
-        ]
-        
-        if 'Premiação' in dados_grid1:
-            data_grid1.append(['Premiação', dados_grid1.get('Premiação', '0%')])
-        
-        table1 = Table(data_grid1, colWidths=[90*mm, 60*mm])
-        table1.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#1f77b4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
-            ('GRID', (0, 0), (-1, -1), 0.5, rl_colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [rl_colors.white, rl_colors.lightgrey]),
-        ]))
-        elementos.append(table1)
-    else:
-        elementos.append(Paragraph("Sem dados disponíveis", styles['Normal']))
-    
-    elementos.append(Spacer(1, 4*mm))
-    
-    # Seção 2: All Inclusive
-    elementos.append(Paragraph("📊 ALL INCLUSIVE", secao_style))
-    
-    if dados_grid2:
-        data_grid2 = [
-            ['Métrica', 'Valor'],
-            ['Vendas Luck Sem Adicionais AI', dados_grid2.get('Vendas Luck Sem Adicionais All Inclusive', 'R$ 0,00')],
-            ['Paxs In All Inclusive', dados_grid2.get('Paxs In All Inclusive', '0')],
-            ['Ticket Médio All Inclusive', dados_grid2.get('Ticket Médio All Inclusive', 'R$ 0,00')],
-            ['Meta All Inclusive', dados_grid2.get('Meta All Inclusive', 'R$ 0,00')],
-            ['Alcance de Meta All Inclusive', dados_grid2.get('Alcance de Meta All Inclusive', '0,00%')],
-        ]
-        
-        if 'Premiação All Inclusive' in dados_grid2:
-            data_grid2.append(['Premiação All Inclusive', dados_grid2.get('Premiação All Inclusive', '0%')])
-        
-        table2 = Table(data_grid2, colWidths=[90*mm, 60*mm])
-        table2.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#1f77b4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
-            ('GRID', (0, 0), (-1, -1), 0.5, rl_colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [rl_colors.white, rl_colors.lightgrey]),
-        ]))
-        elementos.append(table2)
-    else:
-        elementos.append(Paragraph("Sem dados disponíveis", styles['Normal']))
-    
-    elementos.append(Spacer(1, 4*mm))
-    
-    # Seção 3: Resumo de Comissão
-    elementos.append(Paragraph("💰 RESUMO DE COMISSÃO", secao_style))
-    
-    if dados_resumo:
-        data_resumo = [
-            ['Descrição', 'Valor'],
-            ['Valor Total de Venda', dados_resumo.get('Valor Total de Venda', 'R$ 0,00')],
-            ['Valor Total Comissão Luck', dados_resumo.get('Valor Total Comissão Luck', 'R$ 0,00')],
-            ['Valor Total Comissão Terceiros', dados_resumo.get('Valor Total Comissão Terceiros', 'R$ 0,00')],
-        ]
-        
-        if 'Valor Total Comissão Premiação' in dados_resumo:
-            data_resumo.append(['Valor Total Comissão Premiação', dados_resumo.get('Valor Total Comissão Premiação', 'R$ 0,00')])
-        
-        if 'Valor Total Comissão Premiação All Inclusive' in dados_resumo:
-            data_resumo.append(['Valor Total Comissão Premiação AI', dados_resumo.get('Valor Total Comissão Premiação All Inclusive', 'R$ 0,00')])
-        
-        data_resumo.append(['VALOR TOTAL DE COMISSÃO', dados_resumo.get('Valor Total de Comissão', 'R$ 0,00')])
-        
-        table3 = Table(data_resumo, colWidths=[90*mm, 60*mm])
-        table3.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#2ca02c')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
-            ('GRID', (0, 0), (-1, -1), 0.5, rl_colors.black),
-            ('FONTSIZE', (0, 1), (-1, -2), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -2), [rl_colors.white, rl_colors.lightgrey]),
-            ('BACKGROUND', (0, -1), (-1, -1), rl_colors.HexColor('#2ca02c')),
-            ('TEXTCOLOR', (0, -1), (-1, -1), rl_colors.whitesmoke),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, -1), (-1, -1), 10),
-        ]))
-        elementos.append(table3)
-    else:
-        elementos.append(Paragraph("Sem dados disponíveis", styles['Normal']))
-    
-    # Construir PDF
-    doc.build(elementos)
-    buffer.seek(0)
-    return buffer
 
 def gerar_pdf_comissao(vendedor, periodo_texto, dados_detalhes, dados_resumo, tipo_vendedor):
     """Gera PDF com relatório de comissão detalhado do vendedor"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), rightMargin=10*mm, leftMargin=10*mm, topMargin=10*mm, bottomMargin=10*mm)
-    elementos = []
-    styles = getSampleStyleSheet()
-    
-    # Estilos
-    titulo_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        textColor=rl_colors.HexColor('#1f77b4'),
-        spaceAfter=4,
-        alignment=TA_CENTER
-    )
-    
-    subtitulo_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=rl_colors.grey,
-        spaceAfter=6,
-        alignment=TA_CENTER
-    )
-    
-    secao_style = ParagraphStyle(
-        'CustomSection',
-        parent=styles['Heading2'],
-        fontSize=11,
-        textColor=rl_colors.HexColor('#d62728'),
-        spaceAfter=4,
-        spaceBefore=4
-    )
-    
-    # Título
-    elementos.append(Paragraph("RELATÓRIO DE COMISSÃO", titulo_style))
-    elementos.append(Paragraph(f"Vendedor: <b>{vendedor}</b> | Período: {periodo_texto}", subtitulo_style))
-    elementos.append(Spacer(1, 2*mm))
-    
-    # Detalhes das Vendas
-    elementos.append(Paragraph("📋 DETALHES DAS VENDAS", secao_style))
-    
-    if dados_detalhes is not None and not dados_detalhes.empty:
-        # Calcular largura disponível
-        largura_disponivel = landscape(A4)[0] - 20*mm  # 277mm disponível
-        
-        # Preparar cabeçalhos com larguras específicas otimizadas para caber na página
-        colunas_config = [
-            ('Data da Venda', 18*mm),
-            ('Código da Reserva', 22*mm),
-            ('Serviço', 38*mm),
-            ('Valor da Venda', 18*mm),
-            ('Venda All Inclusive', 15*mm),
-            ('Tipo de Serviço', 18*mm),
-            ('Comissão Luck', 15*mm),
-            ('Comissão Terceiros', 18*mm),
-        ]
-        
-        # Adicionar colunas de premiação apenas para Transferistas
-        if tipo_vendedor == 'Transferistas':
-            colunas_config.extend([
-                ('Premiação', 15*mm),
-                ('Premiação All Inclusive', 18*mm),
-            ])
-        
-        colunas_config.extend([
-            ('Valor Comissão Luck', 20*mm),
-            ('Valor Comissão Terceiros', 22*mm),
-        ])
-        
-        if tipo_vendedor == 'Transferistas':
-            colunas_config.extend([
-                ('Valor Comissão Premiação', 22*mm),
-                ('Valor Comissão Premiação All Inclusive', 25*mm),
-            ])
-        
-        colunas_config.append(('Valor Total de Comissão', 22*mm))
-        
-        # Filtrar apenas colunas que existem
-        colunas_existentes = []
-        col_widths = []
-        for col_nome, col_largura in colunas_config:
-            if col_nome in dados_detalhes.columns:
-                colunas_existentes.append(col_nome)
-                col_widths.append(col_largura)
-        
-        # Ajustar larguras proporcionalmente se exceder a largura disponível
-        largura_total = sum(col_widths)
-        if largura_total > largura_disponivel:
-            fator_ajuste = largura_disponivel / largura_total
-            col_widths = [w * fator_ajuste for w in col_widths]
-        
-        # Criar estilo para células com quebra de texto
-        cell_style = ParagraphStyle(
-            'CellStyle',
-            fontSize=6,
-            leading=7,
-            wordWrap='CJK',
-            alignment=TA_CENTER
-        )
-        
-        # Processar dados em lotes de 25 linhas por página
-        total_registros = len(dados_detalhes)
-        linhas_por_pagina = 25
-        
-        for inicio in range(0, total_registros, linhas_por_pagina):
-            fim = min(inicio + linhas_por_pagina, total_registros)
-            
-            # Se não for a primeira página, adicionar quebra
-            if inicio > 0:
-                elementos.append(PageBreak())
-                elementos.append(Paragraph("📋 DETALHES DAS VENDAS (continuação)", secao_style))
-            
-            # Criar cabeçalho da tabela com quebra de linha
-            header_row = []
-            for col in colunas_existentes:
-                header_row.append(Paragraph(f"<b>{col}</b>", 
-                    ParagraphStyle('HeaderStyle', fontSize=6, leading=7, wordWrap='CJK', 
-                                 alignment=TA_CENTER, textColor=rl_colors.whitesmoke)))
-            data_table = [header_row]
-            
-            # Adicionar linhas deste lote
-            for idx, row in dados_detalhes.iloc[inicio:fim].iterrows():
-                linha = []
-                for col in colunas_existentes:
-                    valor = str(row.get(col, ''))
-                    # Sempre usar Paragraph para garantir quebra de texto
-                    linha.append(Paragraph(valor, cell_style))
-                data_table.append(linha)
-            
-            # Criar tabela
-            table_detalhes = Table(data_table, colWidths=col_widths, repeatRows=1)
-            table_detalhes.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#d62728')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 4),
-                ('TOPPADDING', (0, 0), (-1, 0), 4),
-                ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
-                ('GRID', (0, 0), (-1, -1), 0.5, rl_colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [rl_colors.white, rl_colors.lightgrey]),
-                ('LEFTPADDING', (0, 0), (-1, -1), 2),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-                ('TOPPADDING', (0, 1), (-1, -1), 3),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 3),
-            ]))
-            elementos.append(table_detalhes)
-            elementos.append(Spacer(1, 3*mm))
-        
-        # Informação sobre total de registros
-        if total_registros > linhas_por_pagina:
-            elementos.append(Paragraph(f"<i>Total de {total_registros} registros exibidos</i>", 
-                                      ParagraphStyle('Italic', fontSize=8, textColor=rl_colors.grey)))
-    else:
-        elementos.append(Paragraph("Sem dados de comissão disponíveis", styles['Normal']))
-    
-    # Criar elementos do resumo para KeepTogether
-    elementos_resumo = []
-    elementos_resumo.append(Spacer(1, 8*mm))
-    elementos_resumo.append(Paragraph("💰 RESUMO FINAL DE COMISSÃO", secao_style))
-    elementos_resumo.append(Spacer(1, 3*mm))
-    
-    if dados_resumo:
-        data_resumo = [
-            ['Descrição', 'Valor'],
-            ['Valor Total de Venda', dados_resumo.get('Valor Total de Venda', 'R$ 0,00')],
-            ['Valor Total Comissão Luck', dados_resumo.get('Valor Total Comissão Luck', 'R$ 0,00')],
-            ['Valor Total Comissão Terceiros', dados_resumo.get('Valor Total Comissão Terceiros', 'R$ 0,00')],
-        ]
-        
-        if tipo_vendedor == 'Transferistas':
-            if 'Valor Total Comissão Premiação' in dados_resumo:
-                data_resumo.append(['Valor Total Comissão Premiação', dados_resumo.get('Valor Total Comissão Premiação', 'R$ 0,00')])
-            
-            if 'Valor Total Comissão Premiação All Inclusive' in dados_resumo:
-                data_resumo.append(['Valor Total Comissão Premiação AI', dados_resumo.get('Valor Total Comissão Premiação All Inclusive', 'R$ 0,00')])
-        
-        data_resumo.append(['VALOR TOTAL DE COMISSÃO', dados_resumo.get('Valor Total de Comissão', 'R$ 0,00')])
-        
-        table_resumo = Table(data_resumo, colWidths=[120*mm, 80*mm])
-        table_resumo.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#d62728')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, rl_colors.black),
-            ('FONTSIZE', (0, 1), (-1, -2), 12),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -2), [rl_colors.white, rl_colors.lightgrey]),
-            ('BACKGROUND', (0, -1), (-1, -1), rl_colors.HexColor('#d62728')),
-            ('TEXTCOLOR', (0, -1), (-1, -1), rl_colors.whitesmoke),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, -1), (-1, -1), 16),
-        ]))
-        elementos_resumo.append(table_resumo)
-    else:
-        elementos_resumo.append(Paragraph("Sem dados de resumo disponíveis", styles['Normal']))
-    
-    # Usar KeepTogether para manter o resumo na mesma página
-    from reportlab.platypus import KeepTogether
-    elementos.append(KeepTogether(elementos_resumo))
-    
-    # Construir PDF
-    doc.build(elementos)
-    buffer.seek(0)
-    return buffer
+    relatorios_pdf = importar_tardio('relatorios_pdf')
+    if dados_detalhes is not None:
+        dados_detalhes = formatar_texto(dados_detalhes)
+    return relatorios_pdf.gerar_pdf_comissao(vendedor, periodo_texto, dados_detalhes, formatar_linha_texto(dados_resumo), tipo_vendedor)
 
 # ================== FIM DAS FUNÇÕES DE PDF ==================
 
 # Função para carregar dados da aba "Comissão"
-@st.cache_data(ttl=300)
 def carregar_dados_comissao():
     try:
-        # Configurar credenciais
-        creds = get_google_credentials()
-        if not creds:
+        # Ler a aba Comissão (busca em lote com as demais abas da planilha)
+        valores, versoes = carregar_valores_planilha(PLANILHA_VENDEDORES_ID, ABAS_PLANILHA_VENDEDORES)
+        if valores is None:
             return pd.DataFrame()
         
-        client = gspread.authorize(creds)
-        
-        # Abrir a planilha da aba Comissão
-        sheet = client.open_by_url('https://docs.google.com/spreadsheets/d/1--dYU8SplKM8wdYtag2MzdggWujtsgAx2lRCmFBPlJs/edit?gid=1274112565#gid=1274112565')
-        
-        # Ler a aba Comissão
-        worksheet = sheet.worksheet('Comissão')
-        dados = worksheet.get_all_records()
-        df_comissao = pd.DataFrame(dados)
+        df_comissao = montar_dataframe_aba('Comissão', versoes['Comissão'], valores['Comissão'])
         
         return df_comissao
     except Exception as e:
@@ -963,75 +539,33 @@ def carregar_dados_comissao():
 def calcular_vendas_luck_sem_adicionais(df_vendas, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final):
     """
     Calcula as vendas Luck Sem Adicionais para uma lista de vendedores no período especificado
-    NOTA: Filtro por dia não é usado pois a coluna 'dia' contém códigos, não dias reais
+    O período é filtrado pela coluna data (dia, mês e ano montados na ingestão)
     """
     try:
         if df_vendas.empty:
             return {}
         
-        # Verificar se existem as colunas necessárias
-        colunas_alternativas = {
-            'dia': ['dia', 'Dia', 'DIA'],
-            'mês': ['mês', 'Mês', 'MES', 'Mes'],
-            'ano': ['ano', 'Ano', 'ANO'],
-            'vendedor': ['Vendedor', 'vendedor', 'VENDEDOR'],
-            'valor': ['Valor Real', 'valor real', 'VALOR REAL'],
-            'tipo_servico': ['Tipo de Serviço', 'tipo de serviço', 'TIPO DE SERVIÇO', 'Tipo de Servico', 'Serviço Buggy', 'Servico Buggy'],
-            'all_inclusive': ['All Inclusive', 'all inclusive', 'ALL INCLUSIVE']
+        # Colunas usadas (nomes canônicos: os alternativos já foram resolvidos na ingestão, esquemas.py)
+        colunas_mapeadas = {
+            'data': COLUNA_DATA,
+            'vendedor': 'Vendedor',
+            'valor': 'Valor Real',
+            'tipo_servico': 'Tipo de Serviço',
+            'all_inclusive': 'All Inclusive'
         }
         
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_vendas.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas foram encontradas
-        if len(colunas_mapeadas) < 7:
+        # Verificar se todas as colunas existem
+        if not tem_colunas(df_vendas, colunas_mapeadas.values()):
             return {}
         
-        # Converter colunas para tipos adequados
-        
-        # DIA e ANO são números
-        df_vendas[colunas_mapeadas['dia']] = pd.to_numeric(df_vendas[colunas_mapeadas['dia']], errors='coerce')
-        df_vendas[colunas_mapeadas['ano']] = pd.to_numeric(df_vendas[colunas_mapeadas['ano']], errors='coerce')
-        
-        # VALOR REAL - limpar formatação antes de converter
-        # Limpar formatação de moeda brasileira
-        df_vendas['valor_limpo'] = df_vendas[colunas_mapeadas['valor']].astype(str)
-        df_vendas['valor_limpo'] = df_vendas['valor_limpo'].str.replace('R$', '', regex=False)
-        df_vendas['valor_limpo'] = df_vendas['valor_limpo'].str.replace('.', '', regex=False)  # Remove pontos de milhares
-        df_vendas['valor_limpo'] = df_vendas['valor_limpo'].str.replace(',', '.', regex=False)  # Converte vírgula decimal para ponto
-        df_vendas['valor_limpo'] = df_vendas['valor_limpo'].str.strip()
-        df_vendas['valor_limpo'] = pd.to_numeric(df_vendas['valor_limpo'], errors='coerce').fillna(0)
+        # VALOR REAL em centavos (convertido uma vez na ingestão)
+        df_vendas = df_vendas.assign(valor_limpo=centavos_moeda(df_vendas, colunas_mapeadas['valor']))
         
         # Atualizar referência da coluna valor
         colunas_mapeadas['valor'] = 'valor_limpo'
         
-        # MÊS é STRING - converter nomes de meses para números
-        meses_para_numeros = {
-            'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-            'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
-            'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
-            # Versões sem acento também
-            'Marco': 3, 'Decembro': 12
-        }
-        
-        # Converter meses de string para número
-        df_vendas['mes_numero'] = df_vendas[colunas_mapeadas['mês']].map(meses_para_numeros)
-        
-        # Filtrar por período usando dia, mês e ano separadamente
-        # Filtrar por período usando dia (número), mês (convertido para número) e ano (número)
-        mask_periodo = (
-            (df_vendas[colunas_mapeadas['ano']] >= ano_inicial) & 
-            (df_vendas[colunas_mapeadas['ano']] <= ano_final) &
-            (df_vendas['mes_numero'] >= mes_inicial) & 
-            (df_vendas['mes_numero'] <= mes_final) &
-            (df_vendas[colunas_mapeadas['dia']] >= dia_inicial) & 
-            (df_vendas[colunas_mapeadas['dia']] <= dia_final)
-        )
+        # Filtrar por período pela data montada na ingestão (dia, mês por extenso e ano)
+        mask_periodo = mascara_periodo(df_vendas, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final)
         
         df_periodo = df_vendas[mask_periodo]
         
@@ -1044,15 +578,8 @@ def calcular_vendas_luck_sem_adicionais(df_vendas, vendedores_list, dia_inicial,
         
         df_luck = df_periodo[mask_luck]
         
-        # Calcular soma por vendedor
-        vendas_por_vendedor = {}
-        
-        for vendedor in vendedores_list:
-            vendedor_dados = df_luck[df_luck[colunas_mapeadas['vendedor']] == vendedor]
-            soma = vendedor_dados[colunas_mapeadas['valor']].sum()
-            vendas_por_vendedor[vendedor] = soma
-        
-        return vendas_por_vendedor
+        # Calcular soma por vendedor (groupby pelo id do vendedor)
+        return somar_por_vendedor(df_luck, colunas_mapeadas['vendedor'], colunas_mapeadas['valor'], vendedores_list)
         
     except Exception as e:
         st.error(f"Erro ao calcular vendas Luck sem adicionais: {e}")
@@ -1070,60 +597,24 @@ def calcular_vendas_luck_com_adicionais(df_vendas, vendedores_list, dia_inicial,
         if df_vendas.empty:
             return {}
         
-        # Verificar se existem as colunas necessárias
-        colunas_alternativas = {
-            'dia': ['dia', 'Dia', 'DIA'],
-            'mês': ['mês', 'Mês', 'MES', 'Mes'],
-            'ano': ['ano', 'Ano', 'ANO'],
-            'vendedor': ['Vendedor', 'vendedor', 'VENDEDOR'],
-            'valor_final': ['Valor Final', 'valor final', 'VALOR FINAL'],
-            'tipo_servico': ['Tipo de Serviço', 'tipo de serviço', 'TIPO DE SERVIÇO', 'Tipo de Servico', 'Serviço Buggy', 'Servico Buggy'],
-            'all_inclusive': ['All Inclusive', 'all inclusive', 'ALL INCLUSIVE']
+        # Colunas usadas (nomes canônicos: os alternativos já foram resolvidos na ingestão, esquemas.py)
+        colunas_mapeadas = {
+            'data': COLUNA_DATA,
+            'vendedor': 'Vendedor',
+            'valor_final': 'Valor Final',
+            'tipo_servico': 'Tipo de Serviço',
+            'all_inclusive': 'All Inclusive'
         }
         
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_vendas.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas foram encontradas
-        if len(colunas_mapeadas) < 7:
+        # Verificar se todas as colunas existem
+        if not tem_colunas(df_vendas, colunas_mapeadas.values()):
             return {}
         
-        # Converter colunas para tipos adequados
-        df_vendas[colunas_mapeadas['dia']] = pd.to_numeric(df_vendas[colunas_mapeadas['dia']], errors='coerce')
-        df_vendas[colunas_mapeadas['ano']] = pd.to_numeric(df_vendas[colunas_mapeadas['ano']], errors='coerce')
-        
-        # VALOR FINAL - limpar formatação antes de converter
-        df_vendas['valor_final_com_adic_limpo'] = df_vendas[colunas_mapeadas['valor_final']].astype(str)
-        df_vendas['valor_final_com_adic_limpo'] = df_vendas['valor_final_com_adic_limpo'].str.replace('R$', '', regex=False)
-        df_vendas['valor_final_com_adic_limpo'] = df_vendas['valor_final_com_adic_limpo'].str.replace('.', '', regex=False)
-        df_vendas['valor_final_com_adic_limpo'] = df_vendas['valor_final_com_adic_limpo'].str.replace(',', '.', regex=False)
-        df_vendas['valor_final_com_adic_limpo'] = df_vendas['valor_final_com_adic_limpo'].str.strip()
-        df_vendas['valor_final_com_adic_limpo'] = pd.to_numeric(df_vendas['valor_final_com_adic_limpo'], errors='coerce').fillna(0)
-        
-        # MÊS - converter nomes de meses para números
-        meses_para_numeros = {
-            'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-            'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
-            'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
-            'Marco': 3, 'Decembro': 12
-        }
+        # VALOR FINAL em centavos (convertido uma vez na ingestão)
+        df_vendas = df_vendas.assign(valor_final_com_adic_limpo=centavos_moeda(df_vendas, colunas_mapeadas['valor_final']))
         
-        df_vendas['mes_numero_com_adic'] = df_vendas[colunas_mapeadas['mês']].map(meses_para_numeros)
-        
-        # Filtrar por período
-        mask_periodo = (
-            (df_vendas[colunas_mapeadas['ano']] >= ano_inicial) & 
-            (df_vendas[colunas_mapeadas['ano']] <= ano_final) &
-            (df_vendas['mes_numero_com_adic'] >= mes_inicial) & 
-            (df_vendas['mes_numero_com_adic'] <= mes_final) &
-            (df_vendas[colunas_mapeadas['dia']] >= dia_inicial) & 
-            (df_vendas[colunas_mapeadas['dia']] <= dia_final)
-        )
+        # Filtrar por período pela data montada na ingestão (dia, mês por extenso e ano)
+        mask_periodo = mascara_periodo(df_vendas, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final)
         
         df_periodo = df_vendas[mask_periodo]
         
@@ -1135,15 +626,8 @@ def calcular_vendas_luck_com_adicionais(df_vendas, vendedores_list, dia_inicial,
         
         df_luck_com_adic = df_periodo[mask_luck_com_adic]
         
-        # Calcular soma por vendedor
-        vendas_por_vendedor = {}
-        
-        for vendedor in vendedores_list:
-            vendedor_dados = df_luck_com_adic[df_luck_com_adic[colunas_mapeadas['vendedor']] == vendedor]
-            soma = vendedor_dados['valor_final_com_adic_limpo'].sum()
-            vendas_por_vendedor[vendedor] = soma
-        
-        return vendas_por_vendedor
+        # Calcular soma por vendedor (groupby pelo id do vendedor)
+        return somar_por_vendedor(df_luck_com_adic, colunas_mapeadas['vendedor'], 'valor_final_com_adic_limpo', vendedores_list)
         
     except Exception as e:
         st.error(f"Erro ao calcular Vendas Luck Com Adicionais: {e}")
@@ -1159,60 +643,24 @@ def calcular_vendas_luck_all_inclusive(df_vendas, vendedores_list, dia_inicial,
         if df_vendas.empty:
             return {}
         
-        # Verificar se existem as colunas necessárias
-        colunas_alternativas = {
-            'dia': ['dia', 'Dia', 'DIA'],
-            'mês': ['mês', 'Mês', 'MES', 'Mes'],
-            'ano': ['ano', 'Ano', 'ANO'],
-            'vendedor': ['Vendedor', 'vendedor', 'VENDEDOR'],
-            'valor': ['Valor Real', 'valor real', 'VALOR REAL'],
-            'tipo_servico': ['Tipo de Serviço', 'tipo de serviço', 'TIPO DE SERVIÇO', 'Tipo de Servico', 'Serviço Buggy', 'Servico Buggy'],
-            'all_inclusive': ['All Inclusive', 'all inclusive', 'ALL INCLUSIVE']
+        # Colunas usadas (nomes canônicos: os alternativos já foram resolvidos na ingestão, esquemas.py)
+        colunas_mapeadas = {
+            'data': COLUNA_DATA,
+            'vendedor': 'Vendedor',
+            'valor': 'Valor Real',
+            'tipo_servico': 'Tipo de Serviço',
+            'all_inclusive': 'All Inclusive'
         }
         
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_vendas.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas foram encontradas
-        if len(colunas_mapeadas) < 7:
+        # Verificar se todas as colunas existem
+        if not tem_colunas(df_vendas, colunas_mapeadas.values()):
             return {}
         
-        # Converter colunas para tipos adequados
-        df_vendas[colunas_mapeadas['dia']] = pd.to_numeric(df_vendas[colunas_mapeadas['dia']], errors='coerce')
-        df_vendas[colunas_mapeadas['ano']] = pd.to_numeric(df_vendas[colunas_mapeadas['ano']], errors='coerce')
-        
-        # VALOR REAL - limpar formatação antes de converter
-        df_vendas['valor_limpo_ai'] = df_vendas[colunas_mapeadas['valor']].astype(str)
-        df_vendas['valor_limpo_ai'] = df_vendas['valor_limpo_ai'].str.replace('R$', '', regex=False)
-        df_vendas['valor_limpo_ai'] = df_vendas['valor_limpo_ai'].str.replace('.', '', regex=False)
-        df_vendas['valor_limpo_ai'] = df_vendas['valor_limpo_ai'].str.replace(',', '.', regex=False)
-        df_vendas['valor_limpo_ai'] = df_vendas['valor_limpo_ai'].str.strip()
-        df_vendas['valor_limpo_ai'] = pd.to_numeric(df_vendas['valor_limpo_ai'], errors='coerce').fillna(0)
-        
-        # MÊS - converter nomes de meses para números
-        meses_para_numeros = {
-            'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-            'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
-            'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
-            'Marco': 3, 'Decembro': 12
-        }
-        
-        df_vendas['mes_numero_ai'] = df_vendas[colunas_mapeadas['mês']].map(meses_para_numeros)
+        # VALOR REAL em centavos (convertido uma vez na ingestão)
+        df_vendas = df_vendas.assign(valor_limpo_ai=centavos_moeda(df_vendas, colunas_mapeadas['valor']))
         
-        # Filtrar por período
-        mask_periodo = (
-            (df_vendas[colunas_mapeadas['ano']] >= ano_inicial) & 
-            (df_vendas[colunas_mapeadas['ano']] <= ano_final) &
-            (df_vendas['mes_numero_ai'] >= mes_inicial) & 
-            (df_vendas['mes_numero_ai'] <= mes_final) &
-            (df_vendas[colunas_mapeadas['dia']] >= dia_inicial) & 
-            (df_vendas[colunas_mapeadas['dia']] <= dia_final)
-        )
+        # Filtrar por período pela data montada na ingestão (dia, mês por extenso e ano)
+        mask_periodo = mascara_periodo(df_vendas, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final)
         
         df_periodo = df_vendas[mask_periodo]
         
@@ -1224,15 +672,8 @@ def calcular_vendas_luck_all_inclusive(df_vendas, vendedores_list, dia_inicial,
         
         df_luck_ai = df_periodo[mask_luck_ai]
         
-        # Calcular soma por vendedor
-        vendas_por_vendedor = {}
-        
-        for vendedor in vendedores_list:
-            vendedor_dados = df_luck_ai[df_luck_ai[colunas_mapeadas['vendedor']] == vendedor]
-            soma = vendedor_dados['valor_limpo_ai'].sum()
-            vendas_por_vendedor[vendedor] = soma
-        
-        return vendas_por_vendedor
+        # Calcular soma por vendedor (groupby pelo id do vendedor)
+        return somar_por_vendedor(df_luck_ai, colunas_mapeadas['vendedor'], 'valor_limpo_ai', vendedores_list)
         
     except Exception as e:
         st.error(f"Erro ao calcular vendas Luck All Inclusive: {e}")
@@ -1247,59 +688,23 @@ def calcular_vendas_luck_online_desks(df_vendas, vendedores_list, dia_inicial, m
         if df_vendas.empty:
             return {}
         
-        # Mapear colunas da aba "Dados Finais Vendas"
-        colunas_alternativas = {
-            'dia': ['dia', 'Dia', 'DIA'],
-            'mês': ['mês', 'Mês', 'MES', 'Mes'],
-            'ano': ['ano', 'Ano', 'ANO'],
-            'vendedor': ['Vendedor', 'vendedor', 'VENDEDOR'],
-            'valor_final': ['Valor Final', 'valor final', 'VALOR FINAL'],
-            'tipo_servico': ['Tipo de Serviço', 'tipo de serviço', 'TIPO DE SERVIÇO', 'Tipo de Servico']
+        # Mapear colunas da aba "Dados Finais Vendas" (nomes canônicos: os alternativos já foram resolvidos na ingestão, esquemas.py)
+        colunas_mapeadas = {
+            'data': COLUNA_DATA,
+            'vendedor': 'Vendedor',
+            'valor_final': 'Valor Final',
+            'tipo_servico': 'Tipo de Serviço'
         }
         
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_vendas.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas necessárias existem
-        if len(colunas_mapeadas) < 6:
+        # Verificar se todas as colunas existem
+        if not tem_colunas(df_vendas, colunas_mapeadas.values()):
             return {}
         
-        # Converter colunas para tipos adequados
-        df_vendas[colunas_mapeadas['dia']] = pd.to_numeric(df_vendas[colunas_mapeadas['dia']], errors='coerce')
-        df_vendas[colunas_mapeadas['ano']] = pd.to_numeric(df_vendas[colunas_mapeadas['ano']], errors='coerce')
-        
-        # Limpar e converter Valor Final
-        df_vendas['valor_final_limpo'] = df_vendas[colunas_mapeadas['valor_final']].astype(str)
-        df_vendas['valor_final_limpo'] = df_vendas['valor_final_limpo'].str.replace('R$', '', regex=False)
-        df_vendas['valor_final_limpo'] = df_vendas['valor_final_limpo'].str.replace('.', '', regex=False)
-        df_vendas['valor_final_limpo'] = df_vendas['valor_final_limpo'].str.replace(',', '.', regex=False)
-        df_vendas['valor_final_limpo'] = df_vendas['valor_final_limpo'].str.strip()
-        df_vendas['valor_final_limpo'] = pd.to_numeric(df_vendas['valor_final_limpo'], errors='coerce').fillna(0)
-        
-        # Converter meses de string para número
-        meses_para_numeros = {
-            'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-            'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
-            'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
-            'Marco': 3, 'Decembro': 12
-        }
+        # Valor Final em centavos (convertido uma vez na ingestão)
+        df_vendas = df_vendas.assign(valor_final_limpo=centavos_moeda(df_vendas, colunas_mapeadas['valor_final']))
         
-        df_vendas['mes_numero'] = df_vendas[colunas_mapeadas['mês']].map(meses_para_numeros)
-        
-        # Filtrar por período
-        mask_periodo = (
-            (df_vendas[colunas_mapeadas['ano']] >= ano_inicial) & 
-            (df_vendas[colunas_mapeadas['ano']] <= ano_final) &
-            (df_vendas['mes_numero'] >= mes_inicial) & 
-            (df_vendas['mes_numero'] <= mes_final) &
-            (df_vendas[colunas_mapeadas['dia']] >= dia_inicial) & 
-            (df_vendas[colunas_mapeadas['dia']] <= dia_final)
-        )
+        # Filtrar por período pela data montada na ingestão (dia, mês por extenso e ano)
+        mask_periodo = mascara_periodo(df_vendas, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final)
         
         df_periodo = df_vendas[mask_periodo]
         
@@ -1307,19 +712,8 @@ def calcular_vendas_luck_online_desks(df_vendas, vendedores_list, dia_inicial, m
         mask_luck = (df_periodo[colunas_mapeadas['tipo_servico']] == 'Luck')
         df_luck = df_periodo[mask_luck]
         
-        # Normalizar vendedor para comparação case-insensitive
-        df_luck['vendedor_normalizado'] = df_luck[colunas_mapeadas['vendedor']].str.strip().str.upper()
-        
-        # Calcular soma por vendedor
-        vendas_por_vendedor = {}
-        
-        for vendedor in vendedores_list:
-            vendedor_normalizado = vendedor.strip().upper()
-            vendedor_dados = df_luck[df_luck['vendedor_normalizado'] == vendedor_normalizado]
-            soma = vendedor_dados['valor_final_limpo'].sum()
-            vendas_por_vendedor[vendedor] = soma
-        
-        return vendas_por_vendedor
+        # Calcular soma por vendedor (groupby pelo id do vendedor)
+        return somar_por_vendedor(df_luck, colunas_mapeadas['vendedor'], 'valor_final_limpo', vendedores_list)
         
     except Exception as e:
         st.error(f"Erro ao calcular Vendas Luck para Online/Desks: {e}")
@@ -1334,59 +728,23 @@ def calcular_vendas_terceiros_online_desks(df_vendas, vendedores_list, dia_inici
         if df_vendas.empty:
             return {}
         
-        # Mapear colunas da aba "Dados Finais Vendas"
-        colunas_alternativas = {
-            'dia': ['dia', 'Dia', 'DIA'],
-            'mês': ['mês', 'Mês', 'MES', 'Mes'],
-            'ano': ['ano', 'Ano', 'ANO'],
-            'vendedor': ['Vendedor', 'vendedor', 'VENDEDOR'],
-            'valor_final': ['Valor Final', 'valor final', 'VALOR FINAL'],
-            'tipo_servico': ['Tipo de Serviço', 'tipo de serviço', 'TIPO DE SERVIÇO', 'Tipo de Servico']
+        # Mapear colunas da aba "Dados Finais Vendas" (nomes canônicos: os alternativos já foram resolvidos na ingestão, esquemas.py)
+        colunas_mapeadas = {
+            'data': COLUNA_DATA,
+            'vendedor': 'Vendedor',
+            'valor_final': 'Valor Final',
+            'tipo_servico': 'Tipo de Serviço'
         }
         
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_vendas.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas necessárias existem
-        if len(colunas_mapeadas) < 6:
+        # Verificar se todas as colunas existem
+        if not tem_colunas(df_vendas, colunas_mapeadas.values()):
             return {}
         
-        # Converter colunas para tipos adequados
-        df_vendas[colunas_mapeadas['dia']] = pd.to_numeric(df_vendas[colunas_mapeadas['dia']], errors='coerce')
-        df_vendas[colunas_mapeadas['ano']] = pd.to_numeric(df_vendas[colunas_mapeadas['ano']], errors='coerce')
-        
-        # Limpar e converter Valor Final
-        df_vendas['valor_final_terceiro_limpo'] = df_vendas[colunas_mapeadas['valor_final']].astype(str)
-        df_vendas['valor_final_terceiro_limpo'] = df_vendas['valor_final_terceiro_limpo'].str.replace('R$', '', regex=False)
-        df_vendas['valor_final_terceiro_limpo'] = df_vendas['valor_final_terceiro_limpo'].str.replace('.', '', regex=False)
-        df_vendas['valor_final_terceiro_limpo'] = df_vendas['valor_final_terceiro_limpo'].str.replace(',', '.', regex=False)
-        df_vendas['valor_final_terceiro_limpo'] = df_vendas['valor_final_terceiro_limpo'].str.strip()
-        df_vendas['valor_final_terceiro_limpo'] = pd.to_numeric(df_vendas['valor_final_terceiro_limpo'], errors='coerce').fillna(0)
-        
-        # Converter meses de string para número
-        meses_para_numeros = {
-            'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-            'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
-            'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
-            'Marco': 3, 'Decembro': 12
-        }
-        
-        df_vendas['mes_numero_terceiro'] = df_vendas[colunas_mapeadas['mês']].map(meses_para_numeros)
+        # Valor Final em centavos (convertido uma vez na ingestão)
+        df_vendas = df_vendas.assign(valor_final_terceiro_limpo=centavos_moeda(df_vendas, colunas_mapeadas['valor_final']))
         
-        # Filtrar por período
-        mask_periodo = (
-            (df_vendas[colunas_mapeadas['ano']] >= ano_inicial) & 
-            (df_vendas[colunas_mapeadas['ano']] <= ano_final) &
-            (df_vendas['mes_numero_terceiro'] >= mes_inicial) & 
-            (df_vendas['mes_numero_terceiro'] <= mes_final) &
-            (df_vendas[colunas_mapeadas['dia']] >= dia_inicial) & 
-            (df_vendas[colunas_mapeadas['dia']] <= dia_final)
-        )
+        # Filtrar por período pela data montada na ingestão (dia, mês por extenso e ano)
+        mask_periodo = mascara_periodo(df_vendas, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final)
         
         df_periodo = df_vendas[mask_periodo]
         
@@ -1394,19 +752,8 @@ def calcular_vendas_terceiros_online_desks(df_vendas, vendedores_list, dia_inici
         mask_terceiro = (df_periodo[colunas_mapeadas['tipo_servico']] == 'Terceiro')
         df_terceiro = df_periodo[mask_terceiro]
         
-        # Normalizar vendedor para comparação case-insensitive
-        df_terceiro['vendedor_normalizado'] = df_terceiro[colunas_mapeadas['vendedor']].str.strip().str.upper()
-        
-        # Calcular soma por vendedor
-        vendas_por_vendedor = {}
-        
-        for vendedor in vendedores_list:
-            vendedor_normalizado = vendedor.strip().upper()
-            vendedor_dados = df_terceiro[df_terceiro['vendedor_normalizado'] == vendedor_normalizado]
-            soma = vendedor_dados['valor_final_terceiro_limpo'].sum()
-            vendas_por_vendedor[vendedor] = soma
-        
-        return vendas_por_vendedor
+        # Calcular soma por vendedor (groupby pelo id do vendedor)
+        return somar_por_vendedor(df_terceiro, colunas_mapeadas['vendedor'], 'valor_final_terceiro_limpo', vendedores_list)
         
     except Exception as e:
         st.error(f"Erro ao calcular Vendas Terceiros para Online/Desks: {e}")
@@ -1427,48 +774,34 @@ def calcular_meta_diaria_online_desks(df_meta_diaria, vendedores_list, dia_inici
         data_final = date(ano_final, mes_final, dia_final)
         total_dias = (data_final - data_inicial).days + 1
         
-        # Mapear colunas da aba "Meta Diaria"
-        colunas_alternativas = {
-            'vendedor': ['Vendedor', 'vendedor', 'VENDEDOR', 'Nome do Vendedor', 'Nome Do Vendedor'],
-            'data': ['Data', 'data', 'DATA'],
-            'meta_diaria': ['Meta Diaria', 'Meta Diária', 'meta diaria', 'META DIARIA', 'Meta']
+        # Mapear colunas da aba "Meta Diaria" (nomes canônicos: os alternativos já foram resolvidos na ingestão, esquemas.py)
+        colunas_mapeadas = {
+            'vendedor': 'Vendedor',
+            'data': 'Data',
+            'meta_diaria': 'Meta Diaria'
         }
         
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_meta_diaria.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas necessárias existem
-        if len(colunas_mapeadas) < 3:
+        # Verificar se todas as colunas existem
+        if not tem_colunas(df_meta_diaria, colunas_mapeadas.values()):
             st.warning(f"Colunas disponíveis em Meta Diaria: {list(df_meta_diaria.columns)}")
             return {}
         
         # Converter coluna Data para datetime (normalizar para date)
-        df_meta_diaria['data_convertida'] = pd.to_datetime(df_meta_diaria[colunas_mapeadas['data']], format='%d/%m/%Y', errors='coerce')
+        df_meta_diaria = df_meta_diaria.assign(data_convertida=pd.to_datetime(df_meta_diaria[colunas_mapeadas['data']], format='%d/%m/%Y', errors='coerce'))
         
-        # Limpar e converter Meta Diaria primeiro
-        df_meta_diaria['meta_diaria_limpa'] = df_meta_diaria[colunas_mapeadas['meta_diaria']].astype(str)
-        df_meta_diaria['meta_diaria_limpa'] = df_meta_diaria['meta_diaria_limpa'].str.replace('R$', '', regex=False)
-        df_meta_diaria['meta_diaria_limpa'] = df_meta_diaria['meta_diaria_limpa'].str.replace('.', '', regex=False)
-        df_meta_diaria['meta_diaria_limpa'] = df_meta_diaria['meta_diaria_limpa'].str.replace(',', '.', regex=False)
-        df_meta_diaria['meta_diaria_limpa'] = df_meta_diaria['meta_diaria_limpa'].str.strip()
-        df_meta_diaria['meta_diaria_limpa'] = pd.to_numeric(df_meta_diaria['meta_diaria_limpa'], errors='coerce').fillna(0)
+        # Meta Diaria em centavos primeiro
+        df_meta_diaria = df_meta_diaria.assign(meta_diaria_limpa=centavos_moeda(df_meta_diaria, colunas_mapeadas['meta_diaria']))
         
-        # Normalizar nomes de vendedores para comparação case-insensitive
-        df_meta_diaria['vendedor_normalizado'] = df_meta_diaria[colunas_mapeadas['vendedor']].str.strip().str.upper()
+        # Separar as linhas de cada vendedor pelo id (um único groupby)
+        linhas_vendedores = linhas_por_vendedor(df_meta_diaria, colunas_mapeadas['vendedor'])
         
         # Calcular meta por vendedor
         meta_por_vendedor = {}
         
         for vendedor in vendedores_list:
-            vendedor_normalizado = vendedor.strip().upper()
-            vendedor_dados = df_meta_diaria[df_meta_diaria['vendedor_normalizado'] == vendedor_normalizado]
+            vendedor_dados = linhas_vendedores.get(id_vendedor(vendedor))
             
-            if not vendedor_dados.empty:
+            if vendedor_dados is not None and not vendedor_dados.empty:
                 # Filtrar por período se possível, senão pegar qualquer meta do vendedor
                 data_inicial_ts = pd.Timestamp(data_inicial)
                 data_final_ts = pd.Timestamp(data_final)
@@ -1512,78 +845,41 @@ def calcular_meta_online_desks(df_vendedores, vendedores_list, mes_inicial, ano_
         if df_vendedores.empty:
             return {}
         
-        # Mapear colunas da aba "Vendedores"
-        colunas_alternativas = {
-            'vendedor': ['Nome Do Vendedor', 'Nome do Vendedor', 'Vendedor', 'vendedor', 'VENDEDOR'],
-            'mes': ['Mês', 'mês', 'MES', 'Mes'],
-            'ano': ['Ano', 'ano', 'ANO'],
-            'meta': ['Meta', 'meta', 'META']
+        # Mapear colunas da aba "Vendedores" (nomes canônicos: os alternativos já foram resolvidos na ingestão, esquemas.py)
+        colunas_mapeadas = {
+            'vendedor': 'Nome Do Vendedor',
+            'mes': 'mês',
+            'ano': 'Ano',
+            'meta': 'Meta'
         }
         
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_vendedores.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas necessárias existem
-        if len(colunas_mapeadas) < 4:
+        # Verificar se todas as colunas existem
+        if not tem_colunas(df_vendedores, colunas_mapeadas.values()):
             st.warning(f"Colunas disponíveis em Vendedores para Meta: {list(df_vendedores.columns)}")
             return {}
         
         # Converter coluna Ano para numérico
-        df_vendedores['ano_numerico'] = pd.to_numeric(df_vendedores[colunas_mapeadas['ano']], errors='coerce')
-        
-        # Limpar e converter Meta
-        df_vendedores['meta_limpa'] = df_vendedores[colunas_mapeadas['meta']].astype(str)
-        df_vendedores['meta_limpa'] = df_vendedores['meta_limpa'].str.replace('R$', '', regex=False)
-        df_vendedores['meta_limpa'] = df_vendedores['meta_limpa'].str.replace('.', '', regex=False)
-        df_vendedores['meta_limpa'] = df_vendedores['meta_limpa'].str.replace(',', '.', regex=False)
-        df_vendedores['meta_limpa'] = df_vendedores['meta_limpa'].str.strip()
-        df_vendedores['meta_limpa'] = pd.to_numeric(df_vendedores['meta_limpa'], errors='coerce').fillna(0)
-        
-        # Normalizar vendedor para comparação case-insensitive
-        df_vendedores['vendedor_normalizado'] = df_vendedores[colunas_mapeadas['vendedor']].str.strip().str.upper()
-        
-        # Converter meses de string para número (se necessário)
-        meses_para_numeros = {
-            'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-            'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
-            'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
-            'Marco': 3, 'Decembro': 12
-        }
+        df_vendedores = df_vendedores.assign(ano_numerico=pd.to_numeric(df_vendedores[colunas_mapeadas['ano']], errors='coerce'))
+        
+        # Meta em centavos
+        df_vendedores = df_vendedores.assign(meta_limpa=centavos_moeda(df_vendedores, colunas_mapeadas['meta']))
         
         # Tentar converter mês (pode ser string ou número)
         if df_vendedores[colunas_mapeadas['mes']].dtype == 'object':
-            df_vendedores['mes_numerico'] = df_vendedores[colunas_mapeadas['mes']].map(meses_para_numeros)
+            df_vendedores = df_vendedores.assign(mes_numerico=df_vendedores[colunas_mapeadas['mes']].map(MESES_PARA_NUMEROS))
         else:
-            df_vendedores['mes_numerico'] = pd.to_numeric(df_vendedores[colunas_mapeadas['mes']], errors='coerce')
-        
-        # Calcular meta por vendedor
-        meta_por_vendedor = {}
-        
-        for vendedor in vendedores_list:
-            vendedor_normalizado = vendedor.strip().upper()
-            
-            # Filtrar por vendedor e período (mês e ano)
-            vendedor_dados = df_vendedores[
-                (df_vendedores['vendedor_normalizado'] == vendedor_normalizado) &
-                (df_vendedores['ano_numerico'] >= ano_inicial) &
-                (df_vendedores['ano_numerico'] <= ano_final) &
-                (df_vendedores['mes_numerico'] >= mes_inicial) &
-                (df_vendedores['mes_numerico'] <= mes_final)
-            ]
-            
-            if not vendedor_dados.empty:
-                # Somar todas as metas do período
-                meta_total = vendedor_dados['meta_limpa'].sum()
-                meta_por_vendedor[vendedor] = meta_total
-            else:
-                meta_por_vendedor[vendedor] = 0
+            df_vendedores = df_vendedores.assign(mes_numerico=pd.to_numeric(df_vendedores[colunas_mapeadas['mes']], errors='coerce'))
+        
+        # Filtrar por período (mês e ano)
+        df_periodo = df_vendedores[
+            (df_vendedores['ano_numerico'] >= ano_inicial) &
+            (df_vendedores['ano_numerico'] <= ano_final) &
+            (df_vendedores['mes_numerico'] >= mes_inicial) &
+            (df_vendedores['mes_numerico'] <= mes_final)
+        ]
         
-        return meta_por_vendedor
+        # Somar todas as metas do período por vendedor (groupby pelo id do vendedor)
+        return somar_por_vendedor(df_periodo, colunas_mapeadas['vendedor'], 'meta_limpa', vendedores_list)
         
     except Exception as e:
         st.error(f"Erro ao calcular Meta para Online/Desks: {e}")
@@ -1591,316 +887,63 @@ def calcular_meta_online_desks(df_vendedores, vendedores_list, mes_inicial, ano_
         st.error(traceback.format_exc())
         return {}
 
-# Função para calcular Paxs In para Transferistas e Guias
-def calcular_paxs_in(df_paxs, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final):
-    """
-    Calcula os Paxs In para uma lista de vendedores no período especificado
-    Filtra por Guia (match com Vendedor) + All Inclusive = Não + período selecionado
-    Soma a coluna Total_Paxs
-    """
-    try:
-        if df_paxs.empty:
-            return {}
-        
-        # Verificar se existem as colunas necessárias
-        colunas_alternativas = {
-            'dia': ['dia', 'Dia', 'DIA'],
-            'mês': ['mês', 'Mês', 'MES', 'Mes'],
-            'ano': ['ano', 'Ano', 'ANO'],
-            'guia': ['Guia', 'guia', 'GUIA'],
-            'total_paxs': ['Total_Paxs', 'total_paxs', 'TOTAL_PAXS', 'Total Paxs'],
-            'all_inclusive': ['All Inclusive', 'all inclusive', 'ALL INCLUSIVE']
-        }
-        
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_paxs.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas foram encontradas
-        if len(colunas_mapeadas) < 6:
-            return {}
-        
-        # Converter colunas para tipos adequados
-        
-        # DIA e ANO são números
-        df_paxs[colunas_mapeadas['dia']] = pd.to_numeric(df_paxs[colunas_mapeadas['dia']], errors='coerce')
-        df_paxs[colunas_mapeadas['ano']] = pd.to_numeric(df_paxs[colunas_mapeadas['ano']], errors='coerce')
-        
-        # TOTAL_PAXS - converter para numérico
-        df_paxs[colunas_mapeadas['total_paxs']] = pd.to_numeric(df_paxs[colunas_mapeadas['total_paxs']], errors='coerce').fillna(0)
-        
-        # MÊS é STRING - converter nomes de meses para números
-        meses_para_numeros = {
-            'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-            'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
-            'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
-            # Versões sem acento também
-            'Marco': 3, 'Decembro': 12
-        }
-        
-        # Converter meses de string para número
-        df_paxs['mes_numero'] = df_paxs[colunas_mapeadas['mês']].map(meses_para_numeros)
-        
-        # Filtrar por período usando dia, mês e ano separadamente
-        mask_periodo = (
-            (df_paxs[colunas_mapeadas['ano']] >= ano_inicial) & 
-            (df_paxs[colunas_mapeadas['ano']] <= ano_final) &
-            (df_paxs['mes_numero'] >= mes_inicial) & 
-            (df_paxs['mes_numero'] <= mes_final) &
-            (df_paxs[colunas_mapeadas['dia']] >= dia_inicial) & 
-            (df_paxs[colunas_mapeadas['dia']] <= dia_final)
-        )
-        
-        df_periodo = df_paxs[mask_periodo]
-        
-        # Filtrar por All Inclusive = Não
-        mask_all_inclusive = (df_periodo[colunas_mapeadas['all_inclusive']] == 'Não')
-        
-        df_filtrado = df_periodo[mask_all_inclusive]
-        
-        # Calcular soma por vendedor (matching Guia com Vendedor)
-        paxs_por_vendedor = {}
-        
-        for vendedor in vendedores_list:
-            vendedor_dados = df_filtrado[df_filtrado[colunas_mapeadas['guia']] == vendedor]
-            soma = vendedor_dados[colunas_mapeadas['total_paxs']].sum()
-            paxs_por_vendedor[vendedor] = soma
-        
-        return paxs_por_vendedor
-        
-    except Exception as e:
-        st.error(f"Erro ao calcular Paxs In: {e}")
-        return {}
+# Valores da coluna 'All Inclusive' de Dados Finais Vendas que marcam a venda como All Inclusive
+VALORES_SIM_ALL_INCLUSIVE = ['sim', 'yes', '1', 'true', 's']
 
-# Função para calcular Paxs In All Inclusive para Transferistas e Guias
-def calcular_paxs_in_all_inclusive(df_paxs, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final):
-    """
-    Calcula os Paxs In COM All Inclusive para uma lista de vendedores no período especificado
-    Mesma lógica da função anterior, mas com All Inclusive = "Sim"
-    """
-    try:
-        if df_paxs.empty:
-            return {}
-        
-        # Verificar se existem as colunas necessárias
-        colunas_alternativas = {
-            'dia': ['dia', 'Dia', 'DIA'],
-            'mês': ['mês', 'Mês', 'MES', 'Mes'],
-            'ano': ['ano', 'Ano', 'ANO'],
-            'guia': ['Guia', 'guia', 'GUIA'],
-            'total_paxs': ['Total_Paxs', 'total_paxs', 'TOTAL_PAXS', 'Total Paxs'],
-            'all_inclusive': ['All Inclusive', 'all inclusive', 'ALL INCLUSIVE']
-        }
-        
-        # Mapear colunas existentes
-        colunas_mapeadas = {}
-        for campo, alternativas in colunas_alternativas.items():
-            for alt in alternativas:
-                if alt in df_paxs.columns:
-                    colunas_mapeadas[campo] = alt
-                    break
-        
-        # Verificar se todas as colunas foram encontradas
-        if len(colunas_mapeadas) < 6:
-            return {}
-        
-        # Converter colunas para tipos adequados
-        df_paxs[colunas_mapeadas['dia']] = pd.to_numeric(df_paxs[colunas_mapeadas['dia']], errors='coerce')
-        df_paxs[colunas_mapeadas['ano']] = pd.to_numeric(df_paxs[colunas_mapeadas['ano']], errors='coerce')
-        
-        # TOTAL_PAXS - converter para numérico
-        df_paxs[colunas_mapeadas['total_paxs']] = pd.to_numeric(df_paxs[colunas_mapeadas['total_paxs']], errors='coerce').fillna(0)
-        
-        # MÊS é STRING - converter nomes de meses para números
-        meses_para_numeros = {
-            'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-            'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
-            'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12,
-            'Marco': 3, 'Decembro': 12
-        }
-        
-        # Converter meses de string para número
-        df_paxs['mes_numero_ai'] = df_paxs[colunas_mapeadas['mês']].map(meses_para_numeros)
-        
-        # Filtrar por período usando dia, mês e ano separadamente
-        mask_periodo = (
-            (df_paxs[colunas_mapeadas['ano']] >= ano_inicial) & 
-            (df_paxs[colunas_mapeadas['ano']] <= ano_final) &
-            (df_paxs['mes_numero_ai'] >= mes_inicial) & 
-            (df_paxs['mes_numero_ai'] <= mes_final) &
-            (df_paxs[colunas_mapeadas['dia']] >= dia_inicial) & 
-            (df_paxs[colunas_mapeadas['dia']] <= dia_final)
-        )
-        
-        df_periodo = df_paxs[mask_periodo]
-        
-        # DIFERENÇA: Filtrar por All Inclusive = "Sim"
-        mask_all_inclusive = (df_periodo[colunas_mapeadas['all_inclusive']] == 'Sim')
-        
-        df_filtrado = df_periodo[mask_all_inclusive]
-        
-        # Calcular soma por vendedor (matching Guia com Vendedor)
-        paxs_por_vendedor = {}
-        
-        for vendedor in vendedores_list:
-            vendedor_dados = df_filtrado[df_filtrado[colunas_mapeadas['guia']] == vendedor]
-            soma = vendedor_dados[colunas_mapeadas['total_paxs']].sum()
-            paxs_por_vendedor[vendedor] = soma
-        
-        return paxs_por_vendedor
-        
-    except Exception as e:
-        st.error(f"Erro ao calcular Paxs In All Inclusive: {e}")
-        return {}
+# Função para montar a tabela de vendas All Inclusive (mesma regra do painel_vendedores.py)
+def tabela_vendas_all_inclusive(vendas_finais_df):
+    """Monta uma vez, a partir de Dados Finais Vendas, as marcações All Inclusive usadas na comissão
 
-# Função para buscar Meta por vendedor
-def formatar_meta(valor):
-    # Remove 'R$', pontos e converte vírgula para ponto
-    if isinstance(valor, str):
-        valor = valor.replace('R$', '').replace('.', '').replace(',', '.').strip()
-    try:
-        return float(valor)
-    except:
-        return 0.0
-
-def buscar_meta_vendedor(df_vendedores, vendedor, mes_inicial, mes_final, ano_inicial, ano_final):
+    Retorna (por_reserva, por_data): Series booleanas com índice (id do vendedor, data aaaa-mm-dd, reserva)
+    e (id do vendedor, data); em cada chave vale a primeira linha da planilha, como na busca linha a linha.
     """
-    Busca a meta de um vendedor específico baseado no período selecionado
+    # Colunas canônicas de Dados Finais Vendas (nomes alternativos resolvidos na ingestão, esquemas.py)
+    coluna_data, coluna_reserva, coluna_all_inclusive = 'Data_Venda', 'Reserva', 'All Inclusive'
+    if vendas_finais_df.empty or not tem_colunas(vendas_finais_df, ['Vendedor', coluna_data, coluna_reserva, coluna_all_inclusive]):
+        return None
+    vendas = pd.DataFrame({
+        'id': ids_vendedores(vendas_finais_df, 'Vendedor'),
+        'data': vendas_finais_df[coluna_data].astype(str).str.strip(),
+        'reserva': vendas_finais_df[coluna_reserva].fillna('').astype(str).str.strip(),
+        'sim': vendas_finais_df[coluna_all_inclusive].astype(str).str.strip().str.lower().isin(VALORES_SIM_ALL_INCLUSIVE),
+    })
+    por_reserva = vendas.drop_duplicates(['id', 'data', 'reserva']).set_index(['id', 'data', 'reserva'])['sim']
+    por_data = vendas.drop_duplicates(['id', 'data']).set_index(['id', 'data'])['sim']
+    return por_reserva, por_data
+
+# Função para marcar as vendas All Inclusive de um recorte da comissão
+def marcar_vendas_all_inclusive(df_comissao, tabela):
+    """'Sim'/'Não' por linha, juntando a tabela_vendas_all_inclusive pelo id do vendedor e a data da venda
+
+    Primeiro tenta a chave com o código da reserva; sem ela, vale a primeira venda do vendedor no dia.
+    Linhas sem data dd/mm/aaaa, vendedor ou reserva ficam 'Não'.
     """
-    try:
-        if df_vendedores.empty:
-            return 0.0
-        # Filtrar por vendedor
-        df_vendedor = df_vendedores[df_vendedores['Nome Do Vendedor'] == vendedor]
-        if df_vendedor.empty:
-            return 0.0
-        # Converter colunas para tipos adequados
-        df_vendedor = df_vendedor.copy()
-        df_vendedor['Ano'] = pd.to_numeric(df_vendedor['Ano'], errors='coerce')
-        df_vendedor['mês'] = pd.to_numeric(df_vendedor['mês'], errors='coerce')
-        # Remover linhas com valores inválidos
-        df_vendedor = df_vendedor.dropna(subset=['Ano', 'mês'])
-        if df_vendedor.empty:
-            return 0.0
-        # Filtrar por período (mesmo que no filtro principal)
-        df_periodo = df_vendedor[
-            (df_vendedor['Ano'] >= ano_inicial) & 
-            (df_vendedor['Ano'] <= ano_final) &
-            (df_vendedor['mês'] >= mes_inicial) & 
-            (df_vendedor['mês'] <= mes_final)
-        ]
-        if df_periodo.empty:
-            return 0.0
-        # Se existe coluna Meta, somar os valores (tratando formato)
-        if 'Meta' in df_periodo.columns:
-            metas = df_periodo['Meta'].apply(formatar_meta)
-            meta_total = metas.sum()
-            return float(meta_total) if pd.notna(meta_total) else 0.0
-        else:
-            return 0.0
-    except Exception as e:
-        return 0.0
-
-# Função para buscar se a venda é All Inclusive (mesma lógica do painel_vendedores.py)
-def buscar_venda_all_inclusive(data_venda, vendedor, codigo_reserva, servico, vendas_finais_df):
-    """Busca se a venda é All Inclusive na planilha externa"""
-    try:
-        from datetime import datetime
-        
-        # Validações iniciais
-        if pd.isna(data_venda) or pd.isna(vendedor) or pd.isna(codigo_reserva):
-            return 'Não'
-        
-        # Converter data de dd/mm/aaaa para aaaa-mm-dd
-        def converter_data_para_iso(data_str):
-            try:
-                if pd.isna(data_str) or str(data_str).strip() == '':
-                    return None
-                # Formato dd/mm/aaaa → aaaa-mm-dd
-                data_obj = datetime.strptime(str(data_str).strip(), '%d/%m/%Y')
-                return data_obj.strftime('%Y-%m-%d')
-            except:
-                return None
-        
-        data_iso = converter_data_para_iso(data_venda)
-        if not data_iso:
-            return 'Não'
-        
-        # Normalizar strings para comparação
-        def normalizar_string(s):
-            if pd.isna(s):
-                return ''
-            return str(s).strip()
-        
-        # Tentar diferentes variações de match
-        vendedor_norm = normalizar_string(vendedor)
-        codigo_norm = normalizar_string(codigo_reserva)
-        
-        # Verificar se as colunas existem na planilha
-        colunas_disponíveis = vendas_finais_df.columns.tolist()
-        
-        # Tentar diferentes nomes de coluna para Data_Venda
-        coluna_data = None
-        for col in ['Data_Venda', 'Data da Venda', 'Data Venda', 'Data']:
-            if col in colunas_disponíveis:
-                coluna_data = col
-                break
-        
-        # Tentar diferentes nomes de coluna para Reserva
-        coluna_reserva = None
-        for col in ['Reserva', 'Código da Reserva', 'Codigo da Reserva', 'Reservation']:
-            if col in colunas_disponíveis:
-                coluna_reserva = col
-                break
-        
-        # Tentar diferentes nomes de coluna para ALL Inclusive
-        coluna_all_inclusive = None
-        for col in ['ALL Inclusive', 'All Inclusive', 'ALL_Inclusive', 'All_Inclusive']:
-            if col in colunas_disponíveis:
-                coluna_all_inclusive = col
-                break
-        
-        if not all([coluna_data, coluna_reserva, coluna_all_inclusive]):
-            return 'Não'
-        
-        # Filtrar por data e vendedor primeiro (match mais provável)
-        filtro_inicial = (
-            (vendas_finais_df[coluna_data].astype(str).str.strip() == data_iso) &
-            (vendas_finais_df['Vendedor'].apply(normalizar_string) == vendedor_norm)
-        )
-        
-        # Se encontrou registros, tentar match com reserva
-        registros_data_vendedor = vendas_finais_df[filtro_inicial]
-        
-        if not registros_data_vendedor.empty:
-            # Tentar match exato com código da reserva
-            filtro_reserva = registros_data_vendedor[coluna_reserva].apply(normalizar_string) == codigo_norm
-            registros_com_reserva = registros_data_vendedor[filtro_reserva]
-            
-            if not registros_com_reserva.empty:
-                # Encontrou match completo
-                valor_all_inclusive = registros_com_reserva[coluna_all_inclusive].iloc[0]
-                valor_str = str(valor_all_inclusive).strip().lower()
-                return 'Sim' if valor_str in ['sim', 'yes', '1', 'true', 's'] else 'Não'
-            else:
-                # Não encontrou match com reserva, tentar apenas data + vendedor
-                valor_all_inclusive = registros_data_vendedor[coluna_all_inclusive].iloc[0]
-                valor_str = str(valor_all_inclusive).strip().lower()
-                return 'Sim' if valor_str in ['sim', 'yes', '1', 'true', 's'] else 'Não'
-        
-        return 'Não'
-            
-    except Exception as e:
-        return 'Não'
+    if tabela is None or df_comissao.empty or not tem_colunas(df_comissao, ['Data da Venda', 'Vendedor', 'Código da Reserva']):
+        return pd.Series('Não', index=df_comissao.index, dtype=object)
+    por_reserva, por_data = tabela
+    datas = pd.to_datetime(df_comissao['Data da Venda'].astype(str).str.strip(), format='%d/%m/%Y', errors='coerce')
+    validas = datas.notna() & df_comissao['Vendedor'].notna() & df_comissao['Código da Reserva'].notna()
+    ids = ids_vendedores(df_comissao, 'Vendedor')
+    datas_iso = datas.dt.strftime('%Y-%m-%d')
+    reservas = df_comissao['Código da Reserva'].astype(str).str.strip()
+    chaves_reserva = pd.MultiIndex.from_arrays([ids, datas_iso, reservas])
+    chaves_data = pd.MultiIndex.from_arrays([ids, datas_iso])
+    com_reserva = pd.Series(por_reserva.reindex(chaves_reserva).to_numpy(), index=df_comissao.index)
+    so_data = pd.Series(por_data.reindex(chaves_data).to_numpy(), index=df_comissao.index)
+    sim = com_reserva.fillna(so_data).fillna(False).astype(bool) & validas
+    return sim.map({True: 'Sim', False: 'Não'}).astype(object)
+
+# Colunas de valores da comissão, em centavos (formatadas só na exibição e nos PDFs)
+COLUNAS_CENTAVOS_COMISSAO = [
+    'Valor da Venda', 'Valor Comissão Luck', 'Valor Comissão Terceiros',
+    'Valor Comissão Premiação', 'Valor Comissão Premiação All Inclusive', 'Valor Total de Comissão'
+]
 
 # Função para filtrar dados de comissão por período e vendedor
 def filtrar_comissao_por_periodo_vendedor(df_comissao, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final):
     """
     Filtra os dados de comissão por período de data e lista de vendedores
+    Os valores (COLUNAS_CENTAVOS_COMISSAO) saem em centavos (int64)
     """
     try:
         if df_comissao.empty:
@@ -1913,54 +956,23 @@ def filtrar_comissao_por_periodo_vendedor(df_comissao, vendedores_list, dia_inic
         if len(colunas_existentes) < 4:  # Pelo menos 4 colunas principais
             return pd.DataFrame()
         
-        # Converter coluna Data da Venda para datetime
-        def converter_data_comissao(data_str):
-            try:
-                if pd.isna(data_str) or str(data_str).strip() == '':
-                    return None
-                # Tentar diferentes formatos de data
-                data_str = str(data_str).strip()
-                
-                # Formato dd/mm/yyyy
-                if '/' in data_str:
-                    return pd.to_datetime(data_str, format='%d/%m/%Y', errors='coerce')
-                # Formato yyyy-mm-dd
-                elif '-' in data_str:
-                    return pd.to_datetime(data_str, format='%Y-%m-%d', errors='coerce')
-                else:
-                    return pd.to_datetime(data_str, errors='coerce')
-            except:
-                return None
-        
-        # Aplicar conversão de data
-        df_comissao['data_convertida'] = df_comissao['Data da Venda'].apply(converter_data_comissao)
-        
-        # Remover linhas com datas inválidas
-        df_comissao = df_comissao.dropna(subset=['data_convertida'])
-        
-        if df_comissao.empty:
-            return pd.DataFrame()
-        
-        # Criar data inicial e final para filtro
-        from datetime import datetime
-        data_inicial_filtro = datetime(ano_inicial, mes_inicial, dia_inicial)
-        data_final_filtro = datetime(ano_final, mes_final, dia_final)
-        
-        # Filtrar por período
-        mask_periodo = (
-            (df_comissao['data_convertida'] >= data_inicial_filtro) &
-            (df_comissao['data_convertida'] <= data_final_filtro)
-        )
+        # Datas da venda convertidas na ingestão (converter_datas, vetorizado e com vários formatos)
+        if 'Data da Venda Convertida' in df_comissao.columns:
+            datas_venda = df_comissao['Data da Venda Convertida']
+        else:
+            datas_venda = converter_datas(df_comissao['Data da Venda'])
         
-        df_periodo = df_comissao[mask_periodo]
+        # Filtrar por período (datas inválidas ficam de fora)
+        data_inicial_filtro = pd.Timestamp(ano_inicial, mes_inicial, dia_inicial)
+        data_final_filtro = pd.Timestamp(ano_final, mes_final, dia_final)
+        df_periodo = df_comissao[datas_venda.between(data_inicial_filtro, data_final_filtro)]
         
         if df_periodo.empty:
             return pd.DataFrame()
         
-        # Filtrar por vendedores
+        # Filtrar por vendedores (pelo id do vendedor)
         if vendedores_list:
-            mask_vendedores = df_periodo['Vendedor'].isin(vendedores_list)
-            df_filtrado = df_periodo[mask_vendedores]
+            df_filtrado = filtrar_vendedores(df_periodo, 'Vendedor', vendedores_list)
         else:
             df_filtrado = df_periodo
         
@@ -1975,18 +987,8 @@ def filtrar_comissao_por_periodo_vendedor(df_comissao, vendedores_list, dia_inic
         
         # NOVA COLUNA: Venda All Inclusive
         # Buscar se a venda é All Inclusive usando dados de vendas finais
-        if 'df_vendas' in globals() and not df_vendas.empty:
-            resultado['Venda All Inclusive'] = resultado.apply(
-                lambda row: buscar_venda_all_inclusive(
-                    row.get('Data da Venda', ''),
-                    row.get('Vendedor', ''),
-                    row.get('Código da Reserva', ''),
-                    row.get('Serviço', ''),
-                    df_vendas
-                ), axis=1
-            )
-        else:
-            resultado['Venda All Inclusive'] = 'Não'
+        # (tabela montada uma vez por execução no fluxo principal, juntada aqui pelo id e pela data)
+        resultado['Venda All Inclusive'] = marcar_vendas_all_inclusive(resultado, globals().get('vendas_all_inclusive'))
         
         # NOVA COLUNA: Tipo de Serviço
         # Carregar lista de serviços terceirizados e classificar cada serviço
@@ -2001,65 +1003,45 @@ def filtrar_comissao_por_periodo_vendedor(df_comissao, vendedores_list, dia_inic
         
         resultado['Tipo de Serviço'] = resultado.apply(classificar_tipo_servico, axis=1)
         
-        # NOVA COLUNA: Comissão Luck
-        # Carregar dados de vendedores e buscar comissão por vendedor/período
+        # Carregar dados de vendedores para buscar as comissões por vendedor/período
         df_vendedores = carregar_dados_vendedores()
         
-        def buscar_comissao_luck_row(row):
-            try:
-                # Extrair mês e ano da data de venda
-                data_venda = str(row.get('Data da Venda', '')).strip()
-                if not data_venda:
-                    return ''
-                
-                # Converter data de dd/mm/yyyy para extrair mês e ano
+        # Mês e ano de cada venda vêm da data convertida na ingestão, sem repartir o texto da data
+        if 'Data da Venda Ano' in df_filtrado.columns:
+            anos_venda, meses_venda = df_filtrado['Data da Venda Ano'], df_filtrado['Data da Venda Mes']
+        else:
+            datas_filtradas = datas_venda.loc[df_filtrado.index]
+            anos_venda, meses_venda = datas_filtradas.dt.year, datas_filtradas.dt.month
+        chaves_comissao = list(zip(
+            resultado['Vendedor'].astype(str).str.strip(), meses_venda.astype(int), anos_venda.astype(int)
+        )) if 'Vendedor' in resultado.columns else []
+        
+        # Uma busca por combinação distinta de vendedor, mês e ano (as linhas repetem as mesmas)
+        def buscar_comissao_por_chave(buscar_comissao):
+            comissoes = {}
+            for vendedor, mes, ano in set(chaves_comissao):
                 try:
-                    if '/' in data_venda:
-                        partes = data_venda.split('/')
-                        if len(partes) >= 3:
-                            mes = int(partes[1])  # mês
-                            ano = int(partes[2])  # ano
-                    else:
-                        return ''
-                except:
-                    return ''
-                
-                vendedor = str(row.get('Vendedor', '')).strip()
-                
-                return buscar_comissao_luck(vendedor, mes, ano, df_vendedores)
-            except:
-                return ''
+                    comissoes[(vendedor, mes, ano)] = buscar_comissao(vendedor, mes, ano, df_vendedores)
+                except Exception:
+                    comissoes[(vendedor, mes, ano)] = ''
+            return [comissoes[chave] for chave in chaves_comissao] if chaves_comissao else ''
         
-        resultado['Comissão Luck'] = resultado.apply(buscar_comissao_luck_row, axis=1)
+        # NOVA COLUNA: Comissão Luck
+        resultado['Comissão Luck'] = buscar_comissao_por_chave(buscar_comissao_luck)
         
         # NOVA COLUNA: Comissão Terceiros
         # Buscar comissão terceiros por vendedor/período
-        def buscar_comissao_terceiros_row(row):
-            try:
-                # Extrair mês e ano da data de venda
-                data_venda = str(row.get('Data da Venda', '')).strip()
-                if not data_venda:
-                    return ''
-                
-                # Converter data de dd/mm/yyyy para extrair mês e ano
-                try:
-                    if '/' in data_venda:
-                        partes = data_venda.split('/')
-                        if len(partes) >= 3:
-                            mes = int(partes[1])  # mês
-                            ano = int(partes[2])  # ano
-                    else:
-                        return ''
-                except:
-                    return ''
-                
-                vendedor = str(row.get('Vendedor', '')).strip()
-                
-                return buscar_comissao_terceiros(vendedor, mes, ano, df_vendedores)
-            except:
-                return ''
+        resultado['Comissão Terceiros'] = buscar_comissao_por_chave(buscar_comissao_terceiros)
         
-        resultado['Comissão Terceiros'] = resultado.apply(buscar_comissao_terceiros_row, axis=1)
+        # Índices nome normalizado -> premiação (o primeiro nome de cada chave prevalece, como na busca em ordem)
+        def indexar_por_nome_normalizado(premiacoes):
+            indice = {}
+            for vend_key, premiacao_valor in premiacoes.items():
+                indice.setdefault(normalizar_nome(vend_key), premiacao_valor)
+            return indice
+        
+        premiacao_normalizada = indexar_por_nome_normalizado(globals().get('premiacao_por_vendedor', {}))
+        premiacao_ai_normalizada = indexar_por_nome_normalizado(globals().get('premiacao_ai_por_vendedor', {}))
         
         # NOVA COLUNA: Premiação (versão simplificada que funciona)
         # Aplica premiação baseada no vendedor ser Transferista
@@ -2081,9 +1063,8 @@ def filtrar_comissao_por_periodo_vendedor(df_comissao, vendedores_list, dia_inic
                     
                     # Tentar buscar normalizando os nomes
                     vendedor_norm = normalizar_nome(vendedor)
-                    for vend_key, premiacao_valor in premiacao_dict.items():
-                        if normalizar_nome(vend_key) == vendedor_norm:
-                            return premiacao_valor
+                    if vendedor_norm in premiacao_normalizada:
+                        return premiacao_normalizada[vendedor_norm]
                 
                 return '0%'  # Default se não encontrar
                 
@@ -2112,9 +1093,8 @@ def filtrar_comissao_por_periodo_vendedor(df_comissao, vendedores_list, dia_inic
                     
                     # Tentar buscar normalizando os nomes
                     vendedor_norm = normalizar_nome(vendedor)
-                    for vend_key, premiacao_ai_valor in premiacao_ai_dict.items():
-                        if normalizar_nome(vend_key) == vendedor_norm:
-                            return premiacao_ai_valor
+                    if vendedor_norm in premiacao_ai_normalizada:
+                        return premiacao_ai_normalizada[vendedor_norm]
                 
                 return '0%'  # Default se não encontrar
                 
@@ -2123,173 +1103,45 @@ def filtrar_comissao_por_periodo_vendedor(df_comissao, vendedores_list, dia_inic
         
         resultado['Premiação All Inclusive'] = resultado.apply(buscar_premiacao_all_inclusive_row, axis=1)
         
+        # Valor da Venda em centavos (convertido uma vez na ingestão) e percentuais como decimal
+        if 'Valor da Venda' in df_filtrado.columns:
+            valor_venda = centavos_moeda(df_filtrado, 'Valor da Venda').reindex(resultado.index).fillna(0).astype('int64')
+        else:
+            valor_venda = pd.Series(0, index=resultado.index, dtype='int64')
+        tipo_servico = resultado['Tipo de Serviço'].astype(str).str.strip()
+        venda_all_inclusive = resultado['Venda All Inclusive'].astype(str).str.strip()
+        
+        # Parcela da venda em centavos inteiros (conta exata, arredondada ao centavo)
+        def parcela_centavos(coluna_percentual, condicao):
+            return aplicar_percentual_centavos(valor_venda, resultado[coluna_percentual]).where(condicao, 0)
+        
         # NOVA COLUNA: Valor Comissão Luck (POSICIÓN 12 - Última coluna)
         # Multiplica Valor da Venda pela Comissão Luck se Tipo de Serviço for "Luck"
-        def calcular_valor_comissao_luck(row):
-            try:
-                # Verificar se o Tipo de Serviço é "Luck"
-                tipo_servico = str(row.get('Tipo de Serviço', '')).strip()
-                
-                if tipo_servico != 'Luck':
-                    return 'R$ 0,00'
-                
-                # Obter Valor da Venda
-                valor_venda_str = str(row.get('Valor da Venda', 'R$ 0,00'))
-                valor_venda_limpo = valor_venda_str.replace('R$', '').replace('.', '').replace(',', '.').strip()
-                valor_venda = float(valor_venda_limpo) if valor_venda_limpo not in ['', '0', '0,00'] else 0
-                
-                # Obter Comissão Luck (converter percentual para decimal)
-                comissao_luck_str = str(row.get('Comissão Luck', '0%')).replace('%', '').strip()
-                comissao_luck = float(comissao_luck_str) / 100 if comissao_luck_str not in ['', '0'] else 0
-                
-                # Calcular valor da comissão
-                valor_comissao = valor_venda * comissao_luck
-                
-                # Formatar como moeda
-                return f"R$ {valor_comissao:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                
-            except Exception:
-                return 'R$ 0,00'
-        
-        resultado['Valor Comissão Luck'] = resultado.apply(calcular_valor_comissao_luck, axis=1)
+        comissao_luck = parcela_centavos('Comissão Luck', tipo_servico == 'Luck')
+        resultado['Valor Comissão Luck'] = comissao_luck
         
         # NOVA COLUNA: Valor Comissão Terceiros (POSIÇÃO 13 - após Valor Comissão Luck)
         # Multiplica Valor da Venda pela Comissão Terceiros se Tipo de Serviço for "Terceiro"
-        def calcular_valor_comissao_terceiros(row):
-            try:
-                # Verificar se o Tipo de Serviço é "Terceiro"
-                tipo_servico = str(row.get('Tipo de Serviço', '')).strip()
-                
-                if tipo_servico != 'Terceiro':
-                    return 'R$ 0,00'
-                
-                # Obter Valor da Venda
-                valor_venda_str = str(row.get('Valor da Venda', 'R$ 0,00'))
-                valor_venda_limpo = valor_venda_str.replace('R$', '').replace('.', '').replace(',', '.').strip()
-                valor_venda = float(valor_venda_limpo) if valor_venda_limpo not in ['', '0', '0,00'] else 0
-                
-                # Obter Comissão Terceiros (converter percentual para decimal)
-                comissao_terceiros_str = str(row.get('Comissão Terceiros', '0%')).replace('%', '').strip()
-                comissao_terceiros = float(comissao_terceiros_str) / 100 if comissao_terceiros_str not in ['', '0'] else 0
-                
-                # Calcular valor da comissão
-                valor_comissao = valor_venda * comissao_terceiros
-                
-                # Formatar como moeda
-                return f"R$ {valor_comissao:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                
-            except Exception:
-                return 'R$ 0,00'
-        
-        resultado['Valor Comissão Terceiros'] = resultado.apply(calcular_valor_comissao_terceiros, axis=1)
+        comissao_terceiros = parcela_centavos('Comissão Terceiros', tipo_servico == 'Terceiro')
+        resultado['Valor Comissão Terceiros'] = comissao_terceiros
         
         # NOVA COLUNA: Valor Comissão Premiação (apenas para Transferistas)
         # Multiplica Valor da Venda pela Premiação se Venda All Inclusive = "Não" e Tipo de Serviço = "Luck"
-        def calcular_valor_comissao_premiacao(row):
-            try:
-                # Verificar condições: Venda All Inclusive = "Não" E Tipo de Serviço = "Luck"
-                venda_all_inclusive = str(row.get('Venda All Inclusive', '')).strip()
-                tipo_servico = str(row.get('Tipo de Serviço', '')).strip()
-                
-                if venda_all_inclusive != 'Não' or tipo_servico != 'Luck':
-                    return 'R$ 0,00'
-                
-                # Obter Valor da Venda
-                valor_venda_str = str(row.get('Valor da Venda', 'R$ 0,00'))
-                valor_venda_limpo = valor_venda_str.replace('R$', '').replace('.', '').replace(',', '.').strip()
-                valor_venda = float(valor_venda_limpo) if valor_venda_limpo not in ['', '0', '0,00'] else 0
-                
-                # Obter Premiação (converter percentual para decimal)
-                premiacao_str = str(row.get('Premiação', '0%')).replace('%', '').strip()
-                premiacao = float(premiacao_str) / 100 if premiacao_str not in ['', '0'] else 0
-                
-                # Calcular valor da comissão
-                valor_comissao = valor_venda * premiacao
-                
-                # Formatar como moeda
-                return f"R$ {valor_comissao:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                
-            except Exception:
-                return 'R$ 0,00'
-        
-        resultado['Valor Comissão Premiação'] = resultado.apply(calcular_valor_comissao_premiacao, axis=1)
+        comissao_premiacao = parcela_centavos('Premiação', (venda_all_inclusive == 'Não') & (tipo_servico == 'Luck'))
+        resultado['Valor Comissão Premiação'] = comissao_premiacao
         
         # NOVA COLUNA: Valor Comissão Premiação All Inclusive (apenas para Transferistas)
         # Multiplica Valor da Venda pela Premiação All Inclusive se Venda All Inclusive = "Sim" e Tipo de Serviço = "Luck"
-        def calcular_valor_comissao_premiacao_ai(row):
-            try:
-                # Verificar condições: Venda All Inclusive = "Sim" E Tipo de Serviço = "Luck"
-                venda_all_inclusive = str(row.get('Venda All Inclusive', '')).strip()
-                tipo_servico = str(row.get('Tipo de Serviço', '')).strip()
-                
-                if venda_all_inclusive != 'Sim' or tipo_servico != 'Luck':
-                    return 'R$ 0,00'
-                
-                # Obter Valor da Venda
-                valor_venda_str = str(row.get('Valor da Venda', 'R$ 0,00'))
-                valor_venda_limpo = valor_venda_str.replace('R$', '').replace('.', '').replace(',', '.').strip()
-                valor_venda = float(valor_venda_limpo) if valor_venda_limpo not in ['', '0', '0,00'] else 0
-                
-                # Obter Premiação All Inclusive (converter percentual para decimal)
-                premiacao_ai_str = str(row.get('Premiação All Inclusive', '0%')).replace('%', '').strip()
-                premiacao_ai = float(premiacao_ai_str) / 100 if premiacao_ai_str not in ['', '0'] else 0
-                
-                # Calcular valor da comissão
-                valor_comissao = valor_venda * premiacao_ai
-                
-                # Formatar como moeda
-                return f"R$ {valor_comissao:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                
-            except Exception:
-                return 'R$ 0,00'
-        
-        resultado['Valor Comissão Premiação All Inclusive'] = resultado.apply(calcular_valor_comissao_premiacao_ai, axis=1)
+        comissao_premiacao_ai = parcela_centavos('Premiação All Inclusive', (venda_all_inclusive == 'Sim') & (tipo_servico == 'Luck'))
+        resultado['Valor Comissão Premiação All Inclusive'] = comissao_premiacao_ai
         
         # NOVA COLUNA: Valor Total de Comissão (POSIÇÃO 16 - última coluna)
-        # Soma de todas as comissões: Luck + Terceiros + Premiação + Premiação All Inclusive
-        def calcular_valor_total_comissao(row):
-            try:
-                # Obter todos os valores de comissão
-                valores_str = [
-                    str(row.get('Valor Comissão Luck', 'R$ 0,00')),
-                    str(row.get('Valor Comissão Terceiros', 'R$ 0,00')),
-                    str(row.get('Valor Comissão Premiação', 'R$ 0,00')),
-                    str(row.get('Valor Comissão Premiação All Inclusive', 'R$ 0,00'))
-                ]
-                
-                # Converter para float e somar
-                total = 0
-                for valor_str in valores_str:
-                    valor_limpo = valor_str.replace('R$', '').replace('.', '').replace(',', '.').strip()
-                    valor_float = float(valor_limpo) if valor_limpo not in ['', '0', '0,00'] else 0
-                    total += valor_float
-                
-                # Formatar como moeda
-                return f"R$ {total:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                
-            except Exception:
-                return 'R$ 0,00'
-        
-        resultado['Valor Total de Comissão'] = resultado.apply(calcular_valor_total_comissao, axis=1)
+        # Soma de todas as comissões: Luck + Terceiros + Premiação + Premiação All Inclusive (exata, em centavos)
+        resultado['Valor Total de Comissão'] = comissao_luck + comissao_terceiros + comissao_premiacao + comissao_premiacao_ai
         
-        # Formatar Valor da Venda como moeda se necessário
+        # Valor da Venda também em centavos (o texto é formatado de novo na exibição)
         if 'Valor da Venda' in resultado.columns:
-            def formatar_moeda_comissao(valor):
-                try:
-                    if pd.isna(valor) or str(valor).strip() == '':
-                        return 'R$ 0,00'
-                    
-                    # Se já está formatado, retornar como está
-                    if 'R$' in str(valor):
-                        return str(valor)
-                    
-                    # Converter para float e formatar
-                    valor_float = float(str(valor).replace(',', '.'))
-                    return f"R$ {valor_float:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                except:
-                    return 'R$ 0,00'
-            
-            resultado['Valor da Venda'] = resultado['Valor da Venda'].apply(formatar_moeda_comissao)
+            resultado['Valor da Venda'] = valor_venda
         
         # Ordenar por data (mais recente primeiro)
         resultado = resultado.sort_values('Data da Venda', ascending=False)
@@ -2429,22 +1281,61 @@ if st.session_state.get('dados_carregados', False):
     diferenca_dias = (data_final - data_inicial).days + 1
     st.info(f"📅 Total de dias no período: {diferenca_dias} dias")
     
-    # Carregar dados do Google Sheets (com cache)
+    # Carregar dados do Google Sheets (com cache) - todas as fontes em paralelo
+    # Dados Vendedores e serviços terceirizados entram para aquecer o cache usado na comissão
     with st.spinner("Carregando dados..."):
-        df_vendedores = carregar_dados_google_sheets()
-        df_vendas = carregar_dados_vendas()
-        df_paxs_in = carregar_dados_paxs_in()
-        df_comissao = carregar_dados_comissao()
-        df_meta_diaria = carregar_dados_meta_diaria()
+        dados_fontes, erros_fontes = carregar_em_paralelo({
+            'Vendedores': carregar_dados_google_sheets,
+            'Dados Finais Vendas': carregar_dados_vendas,
+            'Dados In de Escala': carregar_dados_paxs_in,
+            'Comissão': carregar_dados_comissao,
+            'Meta Diaria': carregar_dados_meta_diaria,
+            'Dados Vendedores': carregar_dados_vendedores,
+            'Serviços Terceiros': carregar_servicos_terceiros,
+        })
+    
+    for fonte, erro in erros_fontes.items():
+        st.error(f"Erro ao carregar {fonte}: {erro}")
+    
+    # Horário dos dados servidos (atualizados em segundo plano, sem bloquear a tela)
+    horarios_dados = [h for h in (horario_dados(PLANILHA_PRINCIPAL_ID), horario_dados(PLANILHA_VENDEDORES_ID)) if h is not None]
+    if horarios_dados:
+        st.caption(f"🕒 Dados de {min(horarios_dados).strftime('%d/%m %H:%M')}")
+    
+    # Google indisponível ou sem cota: seguir com os últimos dados bons em vez de esvaziar o painel
+    for planilha_id in (PLANILHA_PRINCIPAL_ID, PLANILHA_VENDEDORES_ID):
+        falha = falha_atualizacao(planilha_id)
+        if falha is not None:
+            st.warning(f"⚠️ Não foi possível atualizar do Google às {falha[0].strftime('%H:%M')} ({falha[1]}). Exibindo os últimos dados salvos.")
+    
+    # Campos obrigatórios ausentes: avisados uma vez aqui, em vez de cada cálculo voltar vazio em silêncio
+    for aba, df_aba in dados_fontes.items():
+        faltando = campos_faltando(aba, df_aba.columns) if isinstance(df_aba, pd.DataFrame) and not df_aba.empty else ()
+        if faltando:
+            st.warning(f"⚠️ A aba '{aba}' não tem as colunas: {', '.join(faltando)}. Os cálculos que dependem delas ficarão vazios.")
+    
+    df_vendedores = dados_fontes.get('Vendedores', pd.DataFrame())
+    df_vendas = dados_fontes.get('Dados Finais Vendas', pd.DataFrame())
+    df_paxs_in = dados_fontes.get('Dados In de Escala', pd.DataFrame())
+    df_comissao = dados_fontes.get('Comissão', pd.DataFrame())
+    df_meta_diaria = dados_fontes.get('Meta Diaria', pd.DataFrame())
+    
+    # Metas da aba Vendedores somadas por (id do vendedor, ano, mês) uma vez só; os grids juntam pelo id
+    metas_vendedores = somar_por_vendedor_mes(df_vendedores, 'Nome Do Vendedor', ['Meta', 'Meta All Inclusive'])
+    
+    # Marcações All Inclusive de Dados Finais Vendas, montadas uma vez para a comissão de todas as abas
+    vendas_all_inclusive = tabela_vendas_all_inclusive(df_vendas)
+    
+    # Recortes do período selecionado (só as partições ano/mês envolvidas) para os cálculos;
+    # df_vendas completo continua sendo usado na busca de vendas All Inclusive da comissão
+    df_vendas_periodo = carregar_periodo(PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL, 'Dados Finais Vendas', ano_inicial, mes_inicial, ano_final, mes_final)
+    df_paxs_in_periodo = carregar_periodo(PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL, 'Dados In de Escala', ano_inicial, mes_inicial, ano_final, mes_final)
+    df_comissao_periodo = carregar_periodo(PLANILHA_VENDEDORES_ID, ABAS_PLANILHA_VENDEDORES, 'Comissão', ano_inicial, mes_inicial, ano_final, mes_final)
     
     if not df_vendedores.empty:
         # Filtrar dados por período (mês e ano)
         if 'mês' in df_vendedores.columns and 'Ano' in df_vendedores.columns:
-            # Converter colunas para numérico para evitar erro de comparação
-            df_vendedores['mês'] = pd.to_numeric(df_vendedores['mês'], errors='coerce')
-            df_vendedores['Ano'] = pd.to_numeric(df_vendedores['Ano'], errors='coerce')
-            
-            # Filtrar pelo período selecionado
+            # Filtrar pelo período selecionado (mês e Ano numéricos desde a ingestão, COLUNAS_PERIODO_ABAS)
             df_filtrado = df_vendedores[
                 (df_vendedores['Ano'] == ano_inicial) & 
                 (df_vendedores['mês'] >= mes_inicial) & 
@@ -2478,7 +1369,8 @@ if st.session_state.get('dados_carregados', False):
                                         df_tipo = df_filtrado[df_filtrado['Tipo de Vendedor'] == tipo]
                                         
                                         # Mostrar colunas Nome Do Vendedor e Tipo de Vendedor
-                                        df_display = df_tipo[['Nome Do Vendedor', 'Tipo de Vendedor']].drop_duplicates().reset_index(drop=True)
+                                        # Uma linha por vendedor (pelo id): grafias diferentes do mesmo nome não duplicam o vendedor
+                                        df_display = unificar_vendedores(df_tipo, 'Nome Do Vendedor', ['Tipo de Vendedor'])
                                         df_display = df_display.rename(columns={'Nome Do Vendedor': 'Vendedor'})
                                         
                                         # Adicionar coluna "Vendas Luck" para Online e Desks
@@ -2486,16 +1378,11 @@ if st.session_state.get('dados_carregados', False):
                                             try:
                                                 vendedores_list = df_display['Vendedor'].tolist()
                                                 vendas_luck_online_desks = calcular_vendas_luck_online_desks(
-                                                    df_vendas, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
+                                                    df_vendas_periodo, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                 )
                                                 
-                                                # Adicionar coluna ao dataframe
-                                                df_display['Vendas Luck'] = df_display['Vendedor'].map(vendas_luck_online_desks).fillna(0)
-                                                
-                                                # Formatar valores como moeda
-                                                df_display['Vendas Luck'] = df_display['Vendas Luck'].apply(
-                                                    lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                )
+                                                # Adicionar coluna ao dataframe (centavos; formatada só na exibição)
+                                                df_display['Vendas Luck'] = df_display['Vendedor'].map(vendas_luck_online_desks).fillna(0).astype('int64')
                                                 
                                             except Exception as e:
                                                 st.error(f"Erro ao calcular Vendas Luck: {e}")
@@ -2505,16 +1392,11 @@ if st.session_state.get('dados_carregados', False):
                                             try:
                                                 vendedores_list = df_display['Vendedor'].tolist()
                                                 vendas_terceiros_online_desks = calcular_vendas_terceiros_online_desks(
-                                                    df_vendas, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
+                                                    df_vendas_periodo, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                 )
                                                 
-                                                # Adicionar coluna ao dataframe
-                                                df_display['Vendas Terceiros'] = df_display['Vendedor'].map(vendas_terceiros_online_desks).fillna(0)
-                                                
-                                                # Formatar valores como moeda
-                                                df_display['Vendas Terceiros'] = df_display['Vendas Terceiros'].apply(
-                                                    lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                )
+                                                # Adicionar coluna ao dataframe (centavos; formatada só na exibição)
+                                                df_display['Vendas Terceiros'] = df_display['Vendedor'].map(vendas_terceiros_online_desks).fillna(0).astype('int64')
                                                 
                                             except Exception as e:
                                                 st.error(f"Erro ao calcular Vendas Terceiros: {e}")
@@ -2527,13 +1409,8 @@ if st.session_state.get('dados_carregados', False):
                                                     df_meta_diaria, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                 )
                                                 
-                                                # Adicionar coluna ao dataframe
-                                                df_display['Meta Diaria'] = df_display['Vendedor'].map(meta_diaria_online_desks).fillna(0)
-                                                
-                                                # Formatar valores como moeda
-                                                df_display['Meta Diaria'] = df_display['Meta Diaria'].apply(
-                                                    lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                )
+                                                # Adicionar coluna ao dataframe (centavos; formatada só na exibição)
+                                                df_display['Meta Diaria'] = df_display['Vendedor'].map(meta_diaria_online_desks).fillna(0).astype('int64')
                                                 
                                             except Exception as e:
                                                 st.error(f"Erro ao calcular Meta Diaria: {e}")
@@ -2546,13 +1423,8 @@ if st.session_state.get('dados_carregados', False):
                                                     df_vendedores, vendedores_list, mes_inicial, ano_inicial, mes_final, ano_final
                                                 )
                                                 
-                                                # Adicionar coluna ao dataframe
-                                                df_display['Meta'] = df_display['Vendedor'].map(meta_online_desks).fillna(0)
-                                                
-                                                # Formatar valores como moeda
-                                                df_display['Meta'] = df_display['Meta'].apply(
-                                                    lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                )
+                                                # Adicionar coluna ao dataframe (centavos; formatada só na exibição)
+                                                df_display['Meta'] = df_display['Vendedor'].map(meta_online_desks).fillna(0).astype('int64')
                                                 
                                             except Exception as e:
                                                 st.error(f"Erro ao calcular Meta: {e}")
@@ -2562,16 +1434,11 @@ if st.session_state.get('dados_carregados', False):
                                             try:
                                                 vendedores_list = df_display['Vendedor'].tolist()
                                                 vendas_luck = calcular_vendas_luck_sem_adicionais(
-                                                    df_vendas, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
+                                                    df_vendas_periodo, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                 )
                                                 
-                                                # Adicionar coluna ao dataframe
-                                                df_display['Vendas Luck Sem Adicionais'] = df_display['Vendedor'].map(vendas_luck).fillna(0)
-                                                
-                                                # Formatar valores como moeda
-                                                df_display['Vendas Luck Sem Adicionais'] = df_display['Vendas Luck Sem Adicionais'].apply(
-                                                    lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                )
+                                                # Adicionar coluna ao dataframe (centavos; formatada só na exibição)
+                                                df_display['Vendas Luck Sem Adicionais'] = df_display['Vendedor'].map(vendas_luck).fillna(0).astype('int64')
                                                 
                                             except Exception as e:
                                                 st.error(f"Erro ao calcular Vendas Luck Sem Adicionais: {e}")
@@ -2581,16 +1448,11 @@ if st.session_state.get('dados_carregados', False):
                                             try:
                                                 vendedores_list = df_display['Vendedor'].tolist()
                                                 vendas_luck_com_adic = calcular_vendas_luck_com_adicionais(
-                                                    df_vendas, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
+                                                    df_vendas_periodo, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                 )
                                                 
-                                                # Adicionar coluna ao dataframe
-                                                df_display['Vendas Luck Com Adicionais'] = df_display['Vendedor'].map(vendas_luck_com_adic).fillna(0)
-                                                
-                                                # Formatar valores como moeda
-                                                df_display['Vendas Luck Com Adicionais'] = df_display['Vendas Luck Com Adicionais'].apply(
-                                                    lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                )
+                                                # Adicionar coluna ao dataframe (centavos; formatada só na exibição)
+                                                df_display['Vendas Luck Com Adicionais'] = df_display['Vendedor'].map(vendas_luck_com_adic).fillna(0).astype('int64')
                                                 
                                             except Exception as e:
                                                 st.error(f"Erro ao calcular Vendas Luck Com Adicionais: {e}")
@@ -2598,17 +1460,9 @@ if st.session_state.get('dados_carregados', False):
                                         # Adicionar coluna "Paxs In" apenas para Transferistas e Guias
                                         if tipo in ['Transferistas', 'Guias'] and not df_paxs_in.empty:
                                             try:
-                                                vendedores_list = df_display['Vendedor'].tolist()
-                                                paxs_in = calcular_paxs_in(
-                                                    df_paxs_in, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
-                                                )
-                                                
-                                                # Adicionar coluna ao dataframe
-                                                df_display['Paxs In'] = df_display['Vendedor'].map(paxs_in).fillna(0)
-                                                
-                                                # Formatar valores como decimal com 1 casa decimal (corrigindo divisão por 100)
-                                                df_display['Paxs In'] = df_display['Paxs In'].apply(
-                                                    lambda x: f"{float(x)/100:.1f}".replace('.', ',') if x > 0 else "0"
+                                                # Soma de Total_Paxs com All Inclusive = Não (Guia casado com o Vendedor pelo id)
+                                                df_display['Paxs In'] = paxs_in_do_grid(
+                                                    df_display, df_paxs_in_periodo, 'Não', dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                 )
                                                 
                                             except Exception as e:
@@ -2618,27 +1472,8 @@ if st.session_state.get('dados_carregados', False):
                                         if tipo in ['Transferistas', 'Guias']:
                                             if 'Vendas Luck Sem Adicionais' in df_display.columns and 'Paxs In' in df_display.columns:
                                                 try:
-                                                    def calcular_ticket_medio(row):
-                                                        try:
-                                                            # Converter Vendas Luck Sem Adicionais para float
-                                                            vendas_str = str(row['Vendas Luck Sem Adicionais']).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                            vendas_float = float(vendas_str) if vendas_str not in ['', '0', '0,00'] else 0
-                                                            
-                                                            # Converter Paxs In para float
-                                                            paxs_str = str(row['Paxs In']).replace(',', '.').strip()
-                                                            paxs_float = float(paxs_str) if paxs_str not in ['', '0', '0,0'] else 0
-                                                            
-                                                            # Calcular ticket médio
-                                                            if paxs_float > 0:
-                                                                ticket_medio = vendas_float / paxs_float
-                                                                return f"R$ {ticket_medio:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                            else:
-                                                                return "R$ 0,00"
-                                                        except:
-                                                            return "R$ 0,00"
-                                                    
-                                                    # Aplicar cálculo de ticket médio
-                                                    df_display['Ticket Médio'] = df_display.apply(calcular_ticket_medio, axis=1)
+                                                    # Ticket médio = vendas / paxs (zero quando não há paxs)
+                                                    df_display['Ticket Médio'] = calcular_ticket_medio(df_display['Vendas Luck Sem Adicionais'], df_display['Paxs In'])
                                                     
                                                 except Exception as e:
                                                     st.error(f"Erro ao calcular Ticket Médio: {e}")
@@ -2646,72 +1481,32 @@ if st.session_state.get('dados_carregados', False):
                                             # Adicionar coluna "Ticket Médio Com Adicionais" apenas para Transferistas e Guias
                                             if 'Vendas Luck Com Adicionais' in df_display.columns and 'Paxs In' in df_display.columns:
                                                 try:
-                                                    def calcular_ticket_medio_com_adicionais(row):
-                                                        try:
-                                                            # Converter Vendas Luck Com Adicionais para float
-                                                            vendas_str = str(row['Vendas Luck Com Adicionais']).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                            vendas_float = float(vendas_str) if vendas_str not in ['', '0', '0,00'] else 0
-                                                            
-                                                            # Converter Paxs In para float
-                                                            paxs_str = str(row['Paxs In']).replace(',', '.').strip()
-                                                            paxs_float = float(paxs_str) if paxs_str not in ['', '0', '0,0'] else 0
-                                                            
-                                                            # Calcular ticket médio com adicionais
-                                                            if paxs_float > 0:
-                                                                ticket_medio_com_adic = vendas_float / paxs_float
-                                                                return f"R$ {ticket_medio_com_adic:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                            else:
-                                                                return "R$ 0,00"
-                                                        except:
-                                                            return "R$ 0,00"
-                                                    
-                                                    # Aplicar cálculo de ticket médio com adicionais
-                                                    df_display['Ticket Médio Com Adicionais'] = df_display.apply(calcular_ticket_medio_com_adicionais, axis=1)
+                                                    # Ticket médio com adicionais = vendas com adicionais / paxs
+                                                    df_display['Ticket Médio Com Adicionais'] = calcular_ticket_medio(df_display['Vendas Luck Com Adicionais'], df_display['Paxs In'])
                                                     
                                                 except Exception as e:
                                                     st.error(f"Erro ao calcular Ticket Médio Com Adicionais: {e}")
                                             
                                             # Adicionar coluna "Meta" apenas para Transferistas e Guias
                                             try:
-                                                def buscar_meta_por_vendedor(row):
-                                                    vendedor = row['Vendedor']
-                                                    meta = buscar_meta_vendedor(df_vendedores, vendedor, mes_inicial, mes_final, ano_inicial, ano_final)
-                                                    # Corrigir formatação da meta
-                                                    if meta > 0:
-                                                        return f"R$ {float(meta):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                    else:
-                                                        return "R$ 0,00"
-                                                # Aplicar busca de meta
-                                                df_display['Meta'] = df_display.apply(buscar_meta_por_vendedor, axis=1)
+                                                # Metas do período (centavos), juntadas pelo id do vendedor
+                                                df_display['Meta'] = somar_periodo_por_vendedor(
+                                                    metas_vendedores, 'Meta', df_display, 'Vendedor', ano_inicial, mes_inicial, ano_final, mes_final
+                                                )
                                             except Exception as e:
                                                 st.error(f"Erro ao buscar Meta: {e}")
 
                                             # Adicionar coluna "Alcance de Meta" apenas para Transferistas e Guias
                                             try:
-                                                def calcular_alcance_meta(row):
-                                                    # Extrai valores das colunas
-                                                    ticket_str = str(row.get('Ticket Médio', 'R$ 0,00')).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                    meta_str = str(row.get('Meta', 'R$ 0,00')).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                    try:
-                                                        ticket = float(ticket_str) if ticket_str not in ['', '0', '0,00'] else 0
-                                                        meta = float(meta_str) if meta_str not in ['', '0', '0,00'] else 0
-                                                        if meta > 0:
-                                                            alcance = ticket / meta
-                                                            return f"{alcance:.2%}".replace('.', ',')
-                                                        else:
-                                                            return "0,00%"
-                                                    except:
-                                                        return "0,00%"
-                                                # Aplicar cálculo de alcance de meta
-                                                df_display['Alcance de Meta'] = df_display.apply(calcular_alcance_meta, axis=1)
+                                                # Alcance = ticket médio / meta (zero quando não há meta)
+                                                sem_valor = pd.Series(0, index=df_display.index)
+                                                df_display['Alcance de Meta'] = calcular_alcance_meta(
+                                                    df_display.get('Ticket Médio', sem_valor), df_display.get('Meta', sem_valor)
+                                                )
                                                 
                                                 # Adicionar coluna Premiação apenas para Transferistas
                                                 if tipo == 'Transferistas':
-                                                    def calcular_premiacao_row(row):
-                                                        alcance_meta = row.get('Alcance de Meta', '0,00%')
-                                                        return calcular_premiacao_transferista(alcance_meta)
-                                                    
-                                                    df_display['Premiação'] = df_display.apply(calcular_premiacao_row, axis=1)
+                                                    df_display['Premiação'] = df_display['Alcance de Meta'].map(calcular_premiacao_transferista)
                                                     
                                                     # Armazenar valores de Premiação em variável global para uso no Grid Detalhes
                                                     globals()['premiacao_por_vendedor'] = dict(zip(df_display['Vendedor'], df_display['Premiação']))
@@ -2720,53 +1515,31 @@ if st.session_state.get('dados_carregados', False):
                                         
                                         st.write(f"**Total de vendedores:** {len(df_display)}")
                                         
-                                        # Mostrar grid com os vendedores
+                                        # Mostrar grid com os vendedores (numérico; formatado só na exibição)
                                         def highlight_alcance_meta(row):
-                                            valor = str(row.get('Alcance de Meta', '0,00%')).replace('%', '').replace(',', '.')
-                                            try:
-                                                valor_float = float(valor)
-                                                if valor_float >= 100.0:
-                                                    return ['background-color: #b6fcb6'] * len(row)
-                                                else:
-                                                    return [''] * len(row)
-                                            except:
+                                            if row.get('Alcance de Meta', 0) >= 1:
+                                                return ['background-color: #b6fcb6'] * len(row)
+                                            else:
                                                 return [''] * len(row)
 
                                         try:
-                                            st.dataframe(
-                                                df_display.style.apply(highlight_alcance_meta, axis=1),
-                                                use_container_width=True,
-                                                hide_index=True
-                                            )
+                                            mostrar_grid(df_display, lambda exibido: exibido.style.apply(highlight_alcance_meta, axis=1))
                                         except Exception as e:
-                                            st.dataframe(
-                                                df_display,
-                                                use_container_width=True,
-                                                hide_index=True
-                                            )
+                                            mostrar_grid(df_display)
                                         
                                         # Cartão com soma de Vendas Luck Sem Adicionais
                                         if tipo in ['Transferistas', 'Guias'] and 'Vendas Luck Sem Adicionais' in df_display.columns:
                                             try:
-                                                # Extrair valores numéricos e somar
-                                                def extrair_valor_vendas(valor_str):
-                                                    try:
-                                                        if pd.isna(valor_str):
-                                                            return 0.0
-                                                        valor_limpo = str(valor_str).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                        return float(valor_limpo) if valor_limpo else 0.0
-                                                    except:
-                                                        return 0.0
-                                                
-                                                total_vendas = df_display['Vendas Luck Sem Adicionais'].apply(extrair_valor_vendas).sum()
-                                                total_vendas_formatado = f"R$ {total_vendas:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                # Somar os centavos do grid (numérico)
+                                                total_vendas = int(df_display['Vendas Luck Sem Adicionais'].sum())
+                                                total_vendas_formatado = formatar_centavos_brl(total_vendas)
                                                 
                                                 # Calcular total de Vendas Luck Com Adicionais
                                                 total_vendas_com_adic = 0
                                                 total_vendas_com_adic_formatado = "R$ 0,00"
                                                 if 'Vendas Luck Com Adicionais' in df_display.columns:
-                                                    total_vendas_com_adic = df_display['Vendas Luck Com Adicionais'].apply(extrair_valor_vendas).sum()
-                                                    total_vendas_com_adic_formatado = f"R$ {total_vendas_com_adic:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                    total_vendas_com_adic = int(df_display['Vendas Luck Com Adicionais'].sum())
+                                                    total_vendas_com_adic_formatado = formatar_centavos_brl(total_vendas_com_adic)
                                                 
                                                 col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
                                                 
@@ -2790,17 +1563,8 @@ if st.session_state.get('dados_carregados', False):
                                                     # Calcular total de Paxs In
                                                     if 'Paxs In' in df_display.columns:
                                                         try:
-                                                            def extrair_valor_paxs(valor_str):
-                                                                try:
-                                                                    if pd.isna(valor_str):
-                                                                        return 0.0
-                                                                    valor_limpo = str(valor_str).replace(',', '.').strip()
-                                                                    return float(valor_limpo) if valor_limpo else 0.0
-                                                                except:
-                                                                    return 0.0
-                                                            
-                                                            total_paxs = df_display['Paxs In'].apply(extrair_valor_paxs).sum()
-                                                            total_paxs_formatado = f"{total_paxs:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                            total_paxs = df_display['Paxs In'].sum()
+                                                            total_paxs_formatado = formatar_numero_brl(total_paxs)
                                                             
                                                             st.markdown(f"""
                                                             <div style="background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin-top: 20px;">
@@ -2817,7 +1581,7 @@ if st.session_state.get('dados_carregados', False):
                                                         try:
                                                             if total_paxs > 0:
                                                                 ticket_medio = total_vendas / total_paxs
-                                                                ticket_medio_formatado = f"R$ {ticket_medio:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                                ticket_medio_formatado = formatar_centavos_brl(ticket_medio)
                                                             else:
                                                                 ticket_medio_formatado = "R$ 0,00"
                                                             
@@ -2834,13 +1598,14 @@ if st.session_state.get('dados_carregados', False):
                                                     # Pegar valor da Meta (primeiro valor da coluna)
                                                     if 'Meta' in df_display.columns:
                                                         try:
-                                                            # Pegar o primeiro valor não nulo da coluna Meta
-                                                            meta_valor = df_display['Meta'].iloc[0] if len(df_display) > 0 else "R$ 0,00"
+                                                            # Pegar o primeiro valor da coluna Meta (centavos)
+                                                            meta_valor = df_display['Meta'].iloc[0] if len(df_display) > 0 else 0
+                                                            meta_valor_formatado = formatar_centavos_brl(meta_valor)
                                                             
                                                             st.markdown(f"""
                                                             <div style="background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin-top: 20px;">
                                                                 <h3 style="margin: 0; color: #0e1117;">🎯 Meta</h3>
-                                                                <h2 style="margin: 10px 0 0 0; color: #1f77b4;">{meta_valor}</h2>
+                                                                <h2 style="margin: 10px 0 0 0; color: #1f77b4;">{meta_valor_formatado}</h2>
                                                             </div>
                                                             """, unsafe_allow_html=True)
                                                         except Exception as e:
@@ -2850,12 +1615,9 @@ if st.session_state.get('dados_carregados', False):
                                                     # Calcular Alcance da Meta (Ticket Médio / Meta)
                                                     if 'Meta' in df_display.columns and 'Paxs In' in df_display.columns:
                                                         try:
-                                                            # Extrair valor numérico da Meta
-                                                            meta_str = str(meta_valor).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                            meta_float = float(meta_str) if meta_str not in ['', '0', '0,00'] else 0
-                                                            
-                                                            if meta_float > 0:
-                                                                alcance_meta = (ticket_medio / meta_float) * 100
+                                                            # Meta e ticket médio em centavos
+                                                            if meta_valor > 0:
+                                                                alcance_meta = (ticket_medio / meta_valor) * 100
                                                                 alcance_meta_formatado = f"{alcance_meta:.2f}%".replace('.', ',')
                                                             else:
                                                                 alcance_meta_formatado = "0,00%"
@@ -2875,7 +1637,7 @@ if st.session_state.get('dados_carregados', False):
                                                         try:
                                                             if total_paxs > 0:
                                                                 ticket_medio_com_adic = total_vendas_com_adic / total_paxs
-                                                                ticket_medio_com_adic_formatado = f"R$ {ticket_medio_com_adic:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                                ticket_medio_com_adic_formatado = formatar_centavos_brl(ticket_medio_com_adic)
                                                             else:
                                                                 ticket_medio_com_adic_formatado = "R$ 0,00"
                                                             
@@ -2896,7 +1658,8 @@ if st.session_state.get('dados_carregados', False):
                                             st.subheader(f"📋 Grid All Inclusive - {tipo}")
                                             
                                             # Criar grid simplificado com apenas Vendedor e Tipo de Vendedor
-                                            df_simples = df_tipo[['Nome Do Vendedor', 'Tipo de Vendedor']].drop_duplicates().reset_index(drop=True)
+                                            # Uma linha por vendedor (pelo id), como no primeiro grid
+                                            df_simples = unificar_vendedores(df_tipo, 'Nome Do Vendedor', ['Tipo de Vendedor'])
                                             df_simples = df_simples.rename(columns={'Nome Do Vendedor': 'Vendedor'})
                                             
                                             # Adicionar coluna "Vendas Luck Sem Adicionais All Inclusive"
@@ -2904,16 +1667,11 @@ if st.session_state.get('dados_carregados', False):
                                                 try:
                                                     vendedores_list = df_simples['Vendedor'].tolist()
                                                     vendas_luck_ai = calcular_vendas_luck_all_inclusive(
-                                                        df_vendas, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
+                                                        df_vendas_periodo, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                     )
                                                     
-                                                    # Adicionar coluna ao dataframe
-                                                    df_simples['Vendas Luck Sem Adicionais All Inclusive'] = df_simples['Vendedor'].map(vendas_luck_ai).fillna(0)
-                                                    
-                                                    # Formatar valores como moeda
-                                                    df_simples['Vendas Luck Sem Adicionais All Inclusive'] = df_simples['Vendas Luck Sem Adicionais All Inclusive'].apply(
-                                                        lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                    )
+                                                    # Adicionar coluna ao dataframe (centavos; formatada só na exibição)
+                                                    df_simples['Vendas Luck Sem Adicionais All Inclusive'] = df_simples['Vendedor'].map(vendas_luck_ai).fillna(0).astype('int64')
                                                     
                                                 except Exception as e:
                                                     st.error(f"Erro ao calcular Vendas Luck All Inclusive: {e}")
@@ -2922,17 +1680,15 @@ if st.session_state.get('dados_carregados', False):
                                             if not df_vendas.empty:
                                                 try:
                                                     vendedores_list = df_simples['Vendedor'].tolist()
+                                                    # A função externa foi escrita contra get_all_records(): recebe a aba
+                                                    # inteira nesse formato (todas as colunas, nomes da planilha, moeda em
+                                                    # texto), filtra o período ela mesma e devolve reais (float) por vendedor
                                                     vendas_luck_com_adic_ai = calcular_vendas_luck_com_adicionais_all_inclusive(
-                                                        df_vendas, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
+                                                        formato_get_all_records(df_vendas), vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                     )
                                                     
-                                                    # Adicionar coluna ao dataframe
-                                                    df_simples['Vendas Luck Com Adicionais All Inclusive'] = df_simples['Vendedor'].map(vendas_luck_com_adic_ai).fillna(0)
-                                                    
-                                                    # Formatar valores como moeda
-                                                    df_simples['Vendas Luck Com Adicionais All Inclusive'] = df_simples['Vendas Luck Com Adicionais All Inclusive'].apply(
-                                                        lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                    )
+                                                    # Adicionar coluna ao dataframe (reais da função externa passados para centavos)
+                                                    df_simples['Vendas Luck Com Adicionais All Inclusive'] = converter_moeda_centavos(df_simples['Vendedor'].map(vendas_luck_com_adic_ai).fillna(0))
                                                     
                                                 except Exception as e:
                                                     st.error(f"Erro ao calcular Vendas Luck Com Adicionais All Inclusive: {e}")
@@ -2940,17 +1696,9 @@ if st.session_state.get('dados_carregados', False):
                                             # Adicionar coluna "Paxs In All Inclusive"
                                             if not df_paxs_in.empty:
                                                 try:
-                                                    vendedores_list = df_simples['Vendedor'].tolist()
-                                                    paxs_in_ai = calcular_paxs_in_all_inclusive(
-                                                        df_paxs_in, vendedores_list, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
-                                                    )
-                                                    
-                                                    # Adicionar coluna ao dataframe
-                                                    df_simples['Paxs In All Inclusive'] = df_simples['Vendedor'].map(paxs_in_ai).fillna(0)
-                                                    
-                                                    # Formatar valores como decimal com 1 casa decimal (corrigindo divisão por 100)
-                                                    df_simples['Paxs In All Inclusive'] = df_simples['Paxs In All Inclusive'].apply(
-                                                        lambda x: f"{float(x)/100:.1f}".replace('.', ',') if x > 0 else "0"
+                                                    # Soma de Total_Paxs com All Inclusive = Sim
+                                                    df_simples['Paxs In All Inclusive'] = paxs_in_do_grid(
+                                                        df_simples, df_paxs_in_periodo, 'Sim', dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final
                                                     )
                                                     
                                                 except Exception as e:
@@ -2959,134 +1707,43 @@ if st.session_state.get('dados_carregados', False):
                                             # Adicionar coluna "Ticket Médio All Inclusive"
                                             if 'Vendas Luck Sem Adicionais All Inclusive' in df_simples.columns and 'Paxs In All Inclusive' in df_simples.columns:
                                                 try:
-                                                    def calcular_ticket_medio_ai(row):
-                                                        try:
-                                                            # Converter Vendas Luck Sem Adicionais All Inclusive para float
-                                                            vendas_str = str(row['Vendas Luck Sem Adicionais All Inclusive']).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                            vendas_float = float(vendas_str) if vendas_str not in ['', '0', '0,00'] else 0
-                                                            
-                                                            # Converter Paxs In All Inclusive para float
-                                                            paxs_str = str(row['Paxs In All Inclusive']).replace(',', '.').strip()
-                                                            paxs_float = float(paxs_str) if paxs_str not in ['', '0', '0,0'] else 0
-                                                            
-                                                            # Calcular ticket médio All Inclusive
-                                                            if paxs_float > 0:
-                                                                ticket_medio_ai = vendas_float / paxs_float
-                                                                return f"R$ {ticket_medio_ai:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                            else:
-                                                                return "R$ 0,00"
-                                                        except:
-                                                            return "R$ 0,00"
-                                                    
-                                                    # Aplicar cálculo de ticket médio All Inclusive
-                                                    df_simples['Ticket Médio All Inclusive'] = df_simples.apply(calcular_ticket_medio_ai, axis=1)
+                                                    # Ticket médio All Inclusive = vendas All Inclusive / paxs All Inclusive
+                                                    df_simples['Ticket Médio All Inclusive'] = calcular_ticket_medio(df_simples['Vendas Luck Sem Adicionais All Inclusive'], df_simples['Paxs In All Inclusive'])
                                                 except Exception as e:
                                                     st.error(f"Erro ao calcular Ticket Médio All Inclusive: {e}")
 
                                             # Adicionar coluna "Ticket Médio All Inclusive com Adicionais"
                                             if 'Vendas Luck Com Adicionais All Inclusive' in df_simples.columns and 'Paxs In All Inclusive' in df_simples.columns:
                                                 try:
-                                                    def calcular_ticket_medio_com_adic_ai(row):
-                                                        try:
-                                                            # Converter Vendas Luck Com Adicionais All Inclusive para float
-                                                            vendas_str = str(row['Vendas Luck Com Adicionais All Inclusive']).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                            vendas = float(vendas_str) if vendas_str else 0
-                                                            
-                                                            # Converter Paxs In All Inclusive para float
-                                                            paxs_str = str(row['Paxs In All Inclusive']).replace(',', '.').strip()
-                                                            paxs = float(paxs_str) if paxs_str else 0
-                                                            
-                                                            # Calcular ticket médio com adicionais All Inclusive
-                                                            if paxs > 0:
-                                                                ticket = vendas / paxs
-                                                                return f"R$ {ticket:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                            else:
-                                                                return "R$ 0,00"
-                                                        except:
-                                                            return "R$ 0,00"
-                                                    
-                                                    # Aplicar cálculo de ticket médio com adicionais All Inclusive
-                                                    df_simples['Ticket Médio All Inclusive com Adicionais'] = df_simples.apply(calcular_ticket_medio_com_adic_ai, axis=1)
+                                                    # Ticket médio com adicionais All Inclusive = vendas com adicionais / paxs
+                                                    df_simples['Ticket Médio All Inclusive com Adicionais'] = calcular_ticket_medio(df_simples['Vendas Luck Com Adicionais All Inclusive'], df_simples['Paxs In All Inclusive'])
                                                 except Exception as e:
                                                     st.error(f"Erro ao calcular Ticket Médio All Inclusive com Adicionais: {e}")
 
                                             # Adicionar coluna "Meta All Inclusive" apenas para Transferistas e Guias
                                             try:
-                                                def buscar_meta_ai_por_vendedor(row):
-                                                    vendedor = row['Vendedor']
-                                                    # Busca e soma metas da coluna "Meta All Inclusive" na aba Vendedores
-                                                    df_vendedor = df_vendedores[df_vendedores['Nome Do Vendedor'] == vendedor].copy()
-                                                    df_vendedor['Ano'] = pd.to_numeric(df_vendedor['Ano'], errors='coerce')
-                                                    df_vendedor['mês'] = pd.to_numeric(df_vendedor['mês'], errors='coerce')
-                                                    df_vendedor = df_vendedor.dropna(subset=['Ano', 'mês'])
-                                                    df_periodo = df_vendedor[
-                                                        (df_vendedor['Ano'] >= ano_inicial) & 
-                                                        (df_vendedor['Ano'] <= ano_final) &
-                                                        (df_vendedor['mês'] >= mes_inicial) & 
-                                                        (df_vendedor['mês'] <= mes_final)
-                                                    ]
-                                                    if 'Meta All Inclusive' in df_periodo.columns:
-                                                        metas_ai = df_periodo['Meta All Inclusive'].apply(formatar_meta)
-                                                        meta_total_ai = metas_ai.sum()
-                                                        if meta_total_ai > 0:
-                                                            return f"R$ {float(meta_total_ai):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                                        else:
-                                                            return "R$ 0,00"
-                                                    else:
-                                                        return "R$ 0,00"
-                                                # Aplicar busca de meta all inclusive
-                                                df_simples['Meta All Inclusive'] = df_simples.apply(buscar_meta_ai_por_vendedor, axis=1)
+                                                # Metas All Inclusive do período (centavos), juntadas pelo id do vendedor
+                                                df_simples['Meta All Inclusive'] = somar_periodo_por_vendedor(
+                                                    metas_vendedores, 'Meta All Inclusive', df_simples, 'Vendedor', ano_inicial, mes_inicial, ano_final, mes_final
+                                                )
                                             except Exception as e:
                                                 st.error(f"Erro ao buscar Meta All Inclusive: {e}")
 
                                             # Adicionar coluna "Alcance de Meta All Inclusive" apenas para Transferistas e Guias
                                             try:
-                                                def calcular_alcance_meta_ai(row):
-                                                    ticket_str = str(row.get('Ticket Médio All Inclusive', 'R$ 0,00')).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                    meta_str = str(row.get('Meta All Inclusive', 'R$ 0,00')).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                    try:
-                                                        ticket = float(ticket_str) if ticket_str not in ['', '0', '0,00'] else 0
-                                                        meta = float(meta_str) if meta_str not in ['', '0', '0,00'] else 0
-                                                        if meta > 0:
-                                                            alcance = ticket / meta
-                                                            return f"{alcance:.2%}".replace('.', ',')
-                                                        else:
-                                                            return "0,00%"
-                                                    except:
-                                                        return "0,00%"
-                                                # Aplicar cálculo de alcance de meta all inclusive
-                                                df_simples['Alcance de Meta All Inclusive'] = df_simples.apply(calcular_alcance_meta_ai, axis=1)
+                                                # Alcance All Inclusive = ticket médio All Inclusive / meta All Inclusive
+                                                sem_valor = pd.Series(0, index=df_simples.index)
+                                                df_simples['Alcance de Meta All Inclusive'] = calcular_alcance_meta(
+                                                    df_simples.get('Ticket Médio All Inclusive', sem_valor), df_simples.get('Meta All Inclusive', sem_valor)
+                                                )
                                             except Exception as e:
                                                 st.error(f"Erro ao calcular Alcance de Meta All Inclusive: {e}")
 
                                             # Adicionar coluna "Premiação All Inclusive" apenas para Transferistas
                                             if tipo == 'Transferistas':
                                                 try:
-                                                    def calcular_premiacao_ai_grid(row):
-                                                        try:
-                                                            # Calcular baseado no Alcance de Meta All Inclusive atual (sem mapeamento fixo)
-                                                            alcance_str = str(row.get('Alcance de Meta All Inclusive', '0,00%')).replace('%', '').replace(',', '.')
-                                                            alcance_float = float(alcance_str) if alcance_str not in ['', '0', '0,00'] else 0
-                                                            
-                                                            # Aplicar lógica de premiação All Inclusive baseada no alcance real
-                                                            if alcance_float >= 150.0:
-                                                                return '5%'
-                                                            elif alcance_float >= 120.0:
-                                                                return '4%'
-                                                            elif alcance_float >= 100.0:
-                                                                return '3%'
-                                                            elif alcance_float >= 90.0:
-                                                                return '2%'
-                                                            elif alcance_float >= 80.0:
-                                                                return '1%'
-                                                            else:
-                                                                return '0%'
-                                                                
-                                                        except Exception:
-                                                            return '0%'
-                                                    
-                                                    # Aplicar cálculo de premiação All Inclusive
-                                                    df_simples['Premiação All Inclusive'] = df_simples.apply(calcular_premiacao_ai_grid, axis=1)
+                                                    # Aplicar cálculo de premiação All Inclusive (mesma escala, sobre o Alcance de Meta All Inclusive)
+                                                    df_simples['Premiação All Inclusive'] = df_simples['Alcance de Meta All Inclusive'].map(calcular_premiacao_transferista)
                                                     
                                                     # Armazenar valores de Premiação All Inclusive em variável global para uso no Grid Detalhes
                                                     globals()['premiacao_ai_por_vendedor'] = dict(zip(df_simples['Vendedor'], df_simples['Premiação All Inclusive']))
@@ -3125,46 +1782,24 @@ if st.session_state.get('dados_carregados', False):
                                             df_simples = df_simples[colunas_ordenadas]
                                             
                                             st.write(f"**Total de vendedores:** {len(df_simples)}")
-                                            # Mostrar grid simplificado
+                                            # Mostrar grid simplificado (numérico; formatado só na exibição)
                                             def highlight_alcance_meta_ai(row):
-                                                valor = str(row.get('Alcance de Meta All Inclusive', '0,00%')).replace('%', '').replace(',', '.')
-                                                try:
-                                                    valor_float = float(valor)
-                                                    if valor_float >= 100.0:
-                                                        return ['background-color: #b6fcb6'] * len(row)
-                                                    else:
-                                                        return [''] * len(row)
-                                                except:
+                                                if row.get('Alcance de Meta All Inclusive', 0) >= 1:
+                                                    return ['background-color: #b6fcb6'] * len(row)
+                                                else:
                                                     return [''] * len(row)
 
                                             try:
-                                                st.dataframe(
-                                                    df_simples.style.apply(highlight_alcance_meta_ai, axis=1),
-                                                    use_container_width=True,
-                                                    hide_index=True
-                                                )
+                                                mostrar_grid(df_simples, lambda exibido: exibido.style.apply(highlight_alcance_meta_ai, axis=1))
                                             except Exception as e:
-                                                st.dataframe(
-                                                    df_simples,
-                                                    use_container_width=True,
-                                                    hide_index=True
-                                                )
+                                                mostrar_grid(df_simples)
                                             
                                             # Cartão com soma de Vendas Luck Sem Adicionais All Inclusive
                                             if 'Vendas Luck Sem Adicionais All Inclusive' in df_simples.columns:
                                                 try:
-                                                    # Extrair valores numéricos e somar
-                                                    def extrair_valor_vendas_ai(valor_str):
-                                                        try:
-                                                            if pd.isna(valor_str):
-                                                                return 0.0
-                                                            valor_limpo = str(valor_str).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                            return float(valor_limpo) if valor_limpo else 0.0
-                                                        except:
-                                                            return 0.0
-                                                    
-                                                    total_vendas_ai = df_simples['Vendas Luck Sem Adicionais All Inclusive'].apply(extrair_valor_vendas_ai).sum()
-                                                    total_vendas_ai_formatado = f"R$ {total_vendas_ai:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                    # Somar os centavos do grid (numérico)
+                                                    total_vendas_ai = int(df_simples['Vendas Luck Sem Adicionais All Inclusive'].sum())
+                                                    total_vendas_ai_formatado = formatar_centavos_brl(total_vendas_ai)
                                                     
                                                     col1_ai, col2_ai, col3_ai, col4_ai, col5_ai, col6_ai = st.columns(6)
                                                     
@@ -3180,8 +1815,8 @@ if st.session_state.get('dados_carregados', False):
                                                         # Calcular total de Vendas Luck Com Adicionais All Inclusive
                                                         if 'Vendas Luck Com Adicionais All Inclusive' in df_simples.columns:
                                                             try:
-                                                                total_vendas_com_adic_ai = df_simples['Vendas Luck Com Adicionais All Inclusive'].apply(extrair_valor_vendas_ai).sum()
-                                                                total_vendas_com_adic_ai_formatado = f"R$ {total_vendas_com_adic_ai:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                                total_vendas_com_adic_ai = int(df_simples['Vendas Luck Com Adicionais All Inclusive'].sum())
+                                                                total_vendas_com_adic_ai_formatado = formatar_centavos_brl(total_vendas_com_adic_ai)
                                                                 
                                                                 st.markdown(f"""
                                                                 <div style="background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin-top: 20px;">
@@ -3196,17 +1831,8 @@ if st.session_state.get('dados_carregados', False):
                                                         # Calcular total de Paxs In All Inclusive
                                                         if 'Paxs In All Inclusive' in df_simples.columns:
                                                             try:
-                                                                def extrair_valor_paxs_ai(valor_str):
-                                                                    try:
-                                                                        if pd.isna(valor_str):
-                                                                            return 0.0
-                                                                        valor_limpo = str(valor_str).replace(',', '.').strip()
-                                                                        return float(valor_limpo) if valor_limpo else 0.0
-                                                                    except:
-                                                                        return 0.0
-                                                                
-                                                                total_paxs_ai = df_simples['Paxs In All Inclusive'].apply(extrair_valor_paxs_ai).sum()
-                                                                total_paxs_ai_formatado = f"{total_paxs_ai:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                                total_paxs_ai = df_simples['Paxs In All Inclusive'].sum()
+                                                                total_paxs_ai_formatado = formatar_numero_brl(total_paxs_ai)
                                                                 
                                                                 st.markdown(f"""
                                                                 <div style="background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin-top: 20px;">
@@ -3223,7 +1849,7 @@ if st.session_state.get('dados_carregados', False):
                                                             try:
                                                                 if total_paxs_ai > 0:
                                                                     ticket_medio_ai = total_vendas_ai / total_paxs_ai
-                                                                    ticket_medio_ai_formatado = f"R$ {ticket_medio_ai:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                                    ticket_medio_ai_formatado = formatar_centavos_brl(ticket_medio_ai)
                                                                 else:
                                                                     ticket_medio_ai_formatado = "R$ 0,00"
                                                                 
@@ -3240,13 +1866,14 @@ if st.session_state.get('dados_carregados', False):
                                                         # Pegar valor da Meta All Inclusive (primeiro valor da coluna)
                                                         if 'Meta All Inclusive' in df_simples.columns:
                                                             try:
-                                                                # Pegar o primeiro valor não nulo da coluna Meta All Inclusive
-                                                                meta_ai_valor = df_simples['Meta All Inclusive'].iloc[0] if len(df_simples) > 0 else "R$ 0,00"
+                                                                # Pegar o primeiro valor da coluna Meta All Inclusive (centavos)
+                                                                meta_ai_valor = df_simples['Meta All Inclusive'].iloc[0] if len(df_simples) > 0 else 0
+                                                                meta_ai_valor_formatado = formatar_centavos_brl(meta_ai_valor)
                                                                 
                                                                 st.markdown(f"""
                                                                 <div style="background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin-top: 20px;">
                                                                     <h3 style="margin: 0; color: #0e1117;">🎯 Meta All Inclusive</h3>
-                                                                    <h2 style="margin: 10px 0 0 0; color: #1f77b4;">{meta_ai_valor}</h2>
+                                                                    <h2 style="margin: 10px 0 0 0; color: #1f77b4;">{meta_ai_valor_formatado}</h2>
                                                                 </div>
                                                                 """, unsafe_allow_html=True)
                                                             except Exception as e:
@@ -3256,12 +1883,9 @@ if st.session_state.get('dados_carregados', False):
                                                         # Calcular Alcance da Meta All Inclusive (Ticket Médio AI / Meta AI)
                                                         if 'Meta All Inclusive' in df_simples.columns and 'Paxs In All Inclusive' in df_simples.columns:
                                                             try:
-                                                                # Extrair valor numérico da Meta All Inclusive
-                                                                meta_ai_str = str(meta_ai_valor).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                                meta_ai_float = float(meta_ai_str) if meta_ai_str not in ['', '0', '0,00'] else 0
-                                                                
-                                                                if meta_ai_float > 0:
-                                                                    alcance_meta_ai_calc = (ticket_medio_ai / meta_ai_float) * 100
+                                                                # Meta All Inclusive e ticket médio em centavos
+                                                                if meta_ai_valor > 0:
+                                                                    alcance_meta_ai_calc = (ticket_medio_ai / meta_ai_valor) * 100
                                                                     alcance_meta_ai_formatado = f"{alcance_meta_ai_calc:.2f}%".replace('.', ',')
                                                                 else:
                                                                     alcance_meta_ai_formatado = "0,00%"
@@ -3289,7 +1913,7 @@ if st.session_state.get('dados_carregados', False):
                                                         try:
                                                             if total_paxs_ai > 0 and 'total_vendas_com_adic_ai' in locals():
                                                                 ticket_medio_com_adic_ai = total_vendas_com_adic_ai / total_paxs_ai
-                                                                ticket_medio_com_adic_ai_formatado = f"R$ {ticket_medio_com_adic_ai:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                                                                ticket_medio_com_adic_ai_formatado = formatar_centavos_brl(ticket_medio_com_adic_ai)
                                                             else:
                                                                 ticket_medio_com_adic_ai_formatado = "R$ 0,00"
                                                             
@@ -3319,7 +1943,7 @@ if st.session_state.get('dados_carregados', False):
                                                 # Passar df_vendas globalmente para uso na função de busca All Inclusive
                                                 globals()['df_vendas'] = df_vendas
                                                 comissao_detalhes = filtrar_comissao_por_periodo_vendedor(
-                                                    df_comissao, 
+                                                    df_comissao_periodo, 
                                                     vendedores_comissao,
                                                     dia_inicial, mes_inicial, ano_inicial, 
                                                     dia_final, mes_final, ano_final
@@ -3333,11 +1957,8 @@ if st.session_state.get('dados_carregados', False):
                                                     else:
                                                         comissao_display = comissao_detalhes
                                                     
-                                                    st.dataframe(
-                                                        comissao_display,
-                                                        use_container_width=True,
-                                                        hide_index=True
-                                                    )
+                                                    # Valores em centavos, formatados só na exibição
+                                                    mostrar_grid(comissao_display)
                                                     st.info(f"📊 Total de registros de comissão: {len(comissao_detalhes)}")
                                                     
                                                     # Resumo por vendedor
@@ -3345,54 +1966,14 @@ if st.session_state.get('dados_carregados', False):
                                                         st.markdown("---")
                                                         st.subheader(f"📈 Resumo de Comissão por Vendedor - {tipo}")
                                                         
-                                                        # Criar coluna numérica temporária para soma
-                                                        def extrair_valor_numerico(valor_str):
-                                                            try:
-                                                                if pd.isna(valor_str):
-                                                                    return 0.0
-                                                                valor_limpo = str(valor_str).replace('R$', '').replace('.', '').replace(',', '.').strip()
-                                                                return float(valor_limpo) if valor_limpo else 0.0
-                                                            except:
-                                                                return 0.0
-                                                        
-                                                        comissao_detalhes['Valor da Venda Numerico'] = comissao_detalhes['Valor da Venda'].apply(extrair_valor_numerico)
-                                                        comissao_detalhes['Valor Comissão Luck Numerico'] = comissao_detalhes['Valor Comissão Luck'].apply(extrair_valor_numerico)
-                                                        comissao_detalhes['Valor Comissão Terceiros Numerico'] = comissao_detalhes['Valor Comissão Terceiros'].apply(extrair_valor_numerico)
-                                                        comissao_detalhes['Valor Comissão Premiação Numerico'] = comissao_detalhes['Valor Comissão Premiação'].apply(extrair_valor_numerico)
-                                                        comissao_detalhes['Valor Comissão Premiação AI Numerico'] = comissao_detalhes['Valor Comissão Premiação All Inclusive'].apply(extrair_valor_numerico)
-                                                        comissao_detalhes['Valor Total de Comissão Numerico'] = comissao_detalhes['Valor Total de Comissão'].apply(extrair_valor_numerico)
-                                                        
-                                                        resumo_vendedor = comissao_detalhes.groupby('Vendedor').agg({
-                                                            'Valor da Venda Numerico': 'sum',
-                                                            'Valor Comissão Luck Numerico': 'sum',
-                                                            'Valor Comissão Terceiros Numerico': 'sum',
-                                                            'Valor Comissão Premiação Numerico': 'sum',
-                                                            'Valor Comissão Premiação AI Numerico': 'sum',
-                                                            'Valor Total de Comissão Numerico': 'sum'
-                                                        }).reset_index()
+                                                        # Agrupar pelo id do vendedor (grafias diferentes do mesmo nome viram uma linha); somas exatas em centavos
+                                                        resumo_vendedor = comissao_detalhes.groupby(ids_vendedores(comissao_detalhes, 'Vendedor').to_numpy()).agg({
+                                                            'Vendedor': 'first',
+                                                            **{coluna: 'sum' for coluna in COLUNAS_CENTAVOS_COMISSAO}
+                                                        }).sort_values('Vendedor').reset_index(drop=True)
                                                         
                                                         resumo_vendedor.columns = ['Vendedor', 'Valor Total de Venda', 'Valor Total Comissão Luck', 'Valor Total Comissão Terceiros', 'Valor Total Comissão Premiação', 'Valor Total Comissão Premiação All Inclusive', 'Valor Total de Comissão']
                                                         
-                                                        # Formatar valores como moeda
-                                                        resumo_vendedor['Valor Total de Venda'] = resumo_vendedor['Valor Total de Venda'].apply(
-                                                            lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') if pd.notna(x) else 'R$ 0,00'
-                                                        )
-                                                        resumo_vendedor['Valor Total Comissão Luck'] = resumo_vendedor['Valor Total Comissão Luck'].apply(
-                                                            lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') if pd.notna(x) else 'R$ 0,00'
-                                                        )
-                                                        resumo_vendedor['Valor Total Comissão Terceiros'] = resumo_vendedor['Valor Total Comissão Terceiros'].apply(
-                                                            lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') if pd.notna(x) else 'R$ 0,00'
-                                                        )
-                                                        resumo_vendedor['Valor Total Comissão Premiação'] = resumo_vendedor['Valor Total Comissão Premiação'].apply(
-                                                            lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') if pd.notna(x) else 'R$ 0,00'
-                                                        )
-                                                        resumo_vendedor['Valor Total Comissão Premiação All Inclusive'] = resumo_vendedor['Valor Total Comissão Premiação All Inclusive'].apply(
-                                                            lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') if pd.notna(x) else 'R$ 0,00'
-                                                        )
-                                                        resumo_vendedor['Valor Total de Comissão'] = resumo_vendedor['Valor Total de Comissão'].apply(
-                                                            lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') if pd.notna(x) else 'R$ 0,00'
-                                                        )
-                                                        
                                                         # Ocultar colunas de premiação para Guias
                                                         if tipo == 'Guias':
                                                             colunas_ocultar_resumo = ['Valor Total Comissão Premiação', 'Valor Total Comissão Premiação All Inclusive']
@@ -3400,11 +1981,7 @@ if st.session_state.get('dados_carregados', False):
                                                         else:
                                                             resumo_display = resumo_vendedor
                                                         
-                                                        st.dataframe(
-                                                            resumo_display,
-                                                            use_container_width=True,
-                                                            hide_index=True
-                                                        )
+                                                        mostrar_grid(resumo_display)
                                                 else:
                                                     st.info(f"📋 Nenhuma comissão encontrada para {tipo} no período selecionado")
                                             else:
@@ -3419,8 +1996,7 @@ if st.session_state.get('dados_carregados', False):
                                                     )
 
                                             # ========== GRÁFICOS DE TICKET MÉDIO ========== 
-                                            import matplotlib.pyplot as plt
-                                            import matplotlib.cm as cm
+                                            graficos = importar_tardio('graficos')
 
                                             # Título do período
                                             periodo_titulo = f"Período: {dia_inicial:02d}/{mes_inicial:02d}/{ano_inicial} a {dia_final:02d}/{mes_final:02d}/{ano_final}"
@@ -3430,18 +2006,8 @@ if st.session_state.get('dados_carregados', False):
                                                 st.markdown("---")
                                                 st.subheader(f"🎟️ Ticket Médio - {tipo} ({periodo_titulo})")
                                                 vendedores = df_display['Vendedor'].tolist()
-                                                valores = [float(str(v).replace('R$', '').replace('.', '').replace(',', '.').strip()) if str(v) not in ['', '0', '0,00'] else 0 for v in df_display['Ticket Médio']]
-                                                largura = max(8, len(vendedores) * 0.6)
-                                                fig, ax = plt.subplots(figsize=(largura, 4))
-                                                colors = cm.get_cmap('tab10', len(vendedores))
-                                                bars = ax.bar(vendedores, valores, color=[colors(i) for i in range(len(vendedores))])
-                                                ax.set_ylabel('Ticket Médio (R$)')
-                                                ax.set_xlabel('Vendedor')
-                                                ax.set_title(f'Ticket Médio por Vendedor - {tipo}')
-                                                ax.set_xticklabels(vendedores, rotation=45, ha='right')
-                                                # Adicionar legenda com valor
-                                                for bar, valor in zip(bars, valores):
-                                                    ax.text(bar.get_x() + bar.get_width()/2, bar.get_height(), f"R$ {valor:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'), ha='center', va='bottom', fontsize=9)
+                                                valores = df_display['Ticket Médio'].tolist()
+                                                fig = graficos.grafico_ticket_medio(vendedores, valores, f'Ticket Médio por Vendedor - {tipo}', 'Ticket Médio (R$)', 'tab10')
                                                 st.pyplot(fig)
 
                                             # Gráfico 2: Ticket Médio All Inclusive
@@ -3449,18 +2015,8 @@ if st.session_state.get('dados_carregados', False):
                                                 st.markdown("---")
                                                 st.subheader(f"🎟️ Ticket Médio All Inclusive - {tipo} ({periodo_titulo})")
                                                 vendedores_ai = df_simples['Vendedor'].tolist()
-                                                valores_ai = [float(str(v).replace('R$', '').replace('.', '').replace(',', '.').strip()) if str(v) not in ['', '0', '0,00'] else 0 for v in df_simples['Ticket Médio All Inclusive']]
-                                                largura_ai = max(8, len(vendedores_ai) * 0.6)
-                                                fig2, ax2 = plt.subplots(figsize=(largura_ai, 4))
-                                                colors_ai = cm.get_cmap('tab20', len(vendedores_ai))
-                                                bars_ai = ax2.bar(vendedores_ai, valores_ai, color=[colors_ai(i) for i in range(len(vendedores_ai))])
-                                                ax2.set_ylabel('Ticket Médio All Inclusive (R$)')
-                                                ax2.set_xlabel('Vendedor')
-                                                ax2.set_title(f'Ticket Médio All Inclusive por Vendedor - {tipo}')
-                                                ax2.set_xticklabels(vendedores_ai, rotation=45, ha='right')
-                                                # Adicionar legenda com valor
-                                                for bar, valor in zip(bars_ai, valores_ai):
-                                                    ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height(), f"R$ {valor:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'), ha='center', va='bottom', fontsize=9)
+                                                valores_ai = df_simples['Ticket Médio All Inclusive'].tolist()
+                                                fig2 = graficos.grafico_ticket_medio(vendedores_ai, valores_ai, f'Ticket Médio All Inclusive por Vendedor - {tipo}', 'Ticket Médio All Inclusive (R$)', 'tab20')
                                                 st.pyplot(fig2)
                                         
                                         # ========== ARMAZENAR DADOS NO SESSION STATE ==========
@@ -3643,15 +2199,7 @@ if st.session_state.get('dados_carregados', False):
                                     st.markdown("---")
                                     st.info(f"📦 {len(pdfs_gerados)} relatórios gerados. Baixe todos de uma vez:")
                                     
-                                    import zipfile
-                                    zip_buffer = io.BytesIO()
-                                    
-                                    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                                        for pdf_info in pdfs_gerados:
-                                            # Adicionar cada PDF ao ZIP
-                                            zip_file.writestr(pdf_info['nome_arquivo'], pdf_info['buffer'].getvalue())
-                                    
-                                    zip_buffer.seek(0)
+                                    zip_buffer = importar_tardio('relatorios_pdf').compactar_pdfs_zip(pdfs_gerados)
                                     
                                     # Formatar período para nome do arquivo ZIP
                                     periodo_arquivo = periodo_texto.replace('/', '-').replace(' ', '_')
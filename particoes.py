@@ -0,0 +1,117 @@
+import pandas as pd
+from ingestao import SUFIXO_DATA, SUFIXO_ANO, SUFIXO_MES, MESES_PARA_NUMEROS, COLUNA_DATA, COLUNA_ANO, COLUNA_MES, converter_datas
+from esquemas import cabecalho_canonico
+
+# Colunas (nomes canônicos, esquemas.py) que definem a partição (ano, mês) de cada aba
+# Vendas e Paxs In usam as colunas ano/mês (as mesmas dos filtros de período);
+# a Comissão usa a Data da Venda
+COLUNAS_PARTICAO = {
+    'Dados Finais Vendas': {'ano': 'ano', 'mes': 'mês'},
+    'Dados In de Escala': {'ano': 'ano', 'mes': 'mês'},
+    'Comissão': {'data': 'Data da Venda'},
+}
+ABAS_PARTICIONADAS = set(COLUNAS_PARTICAO)
+
+# Função para calcular o ano e o mês de cada linha de uma aba particionada
+def anos_meses(df, aba):
+    """Retorna (ano, mes) como Series numéricas alinhadas ao df (NaN quando não dá para definir)"""
+    colunas = COLUNAS_PARTICAO[aba]
+
+    if 'data' in colunas:
+        coluna = colunas['data']
+        if coluna not in df.columns:
+            return None
+        # Ano e mês da data já convertidos na ingestão
+        if f"{coluna}{SUFIXO_ANO}" in df.columns and f"{coluna}{SUFIXO_MES}" in df.columns:
+            return df[f"{coluna}{SUFIXO_ANO}"], df[f"{coluna}{SUFIXO_MES}"]
+        coluna_convertida = f"{coluna}{SUFIXO_DATA}"
+        datas = df[coluna_convertida] if coluna_convertida in df.columns else converter_datas(df[coluna])
+        return datas.dt.year, datas.dt.month
+
+    # Ano e mês da data montada na ingestão (a mesma usada nos filtros de período)
+    if COLUNA_ANO in df.columns and COLUNA_MES in df.columns:
+        return df[COLUNA_ANO], df[COLUNA_MES]
+
+    coluna_ano, coluna_mes = colunas['ano'], colunas['mes']
+    if coluna_ano not in df.columns or coluna_mes not in df.columns:
+        return None
+    ano = pd.to_numeric(df[coluna_ano], errors='coerce')
+    mes = df[coluna_mes].astype(object).map(MESES_PARA_NUMEROS)
+    return ano, mes
+
+# Função para dividir a aba em partições por (ano, mês)
+def particionar(df, aba):
+    """Retorna dict (ano, mes) -> DataFrame, mantendo os rótulos de linha originais
+
+    Linhas sem ano/mês válidos ficam fora: os filtros de período nunca as selecionam.
+    A chave None guarda um DataFrame vazio com as colunas, para períodos sem dados.
+    """
+    particoes = {None: df.iloc[0:0]}
+    chaves = anos_meses(df, aba) if not df.empty else None
+    if chaves is None:
+        # Sem colunas de partição: uma partição única com tudo
+        particoes[('todos', 'todos')] = df
+        return particoes
+
+    ano, mes = chaves
+    for (ano_particao, mes_particao), parte in df.groupby([ano, mes], sort=True, observed=True):
+        particoes[(int(ano_particao), int(mes_particao))] = parte
+    return particoes
+
+# Função para juntar só as partições do período
+def selecionar_periodo(particoes, ano_inicial, mes_inicial, ano_final, mes_final):
+    """DataFrame com as linhas dos meses entre (ano_inicial, mes_inicial) e (ano_final, mes_final)
+
+    As partições são compartilhadas e nunca alteradas: o recorte é uma visão rasa
+    (copy-on-write), então os dados só são copiados se o chamador alterar alguma coluna.
+
+    Inclui todas as linhas que os filtros por ano/mês/dia dos cálculos podem aceitar;
+    esses filtros continuam sendo aplicados depois sobre este recorte.
+    """
+    if ('todos', 'todos') in particoes:
+        return particoes[('todos', 'todos')].copy(deep=False)
+
+    inicio, fim = (ano_inicial, mes_inicial), (ano_final, mes_final)
+    selecionadas = [parte for chave, parte in particoes.items() if chave is not None and inicio <= chave <= fim]
+    if not selecionadas:
+        return particoes[None].copy(deep=False)
+
+    # Voltar à ordem original das linhas da planilha (detalhes e PDFs seguem essa ordem)
+    return pd.concat(selecionadas).sort_index()
+
+# Função para calcular a chave de partição de cada linha da matriz de valores
+def chaves_particao_valores(aba, valores):
+    """Lista 'AAAA-MM' (ou 'sem_data') por linha de dados da matriz, para gravar o snapshot por mês"""
+    if aba not in COLUNAS_PARTICAO or len(valores) < 2:
+        return None
+
+    cabecalho = cabecalho_canonico(aba, valores[0])
+    colunas_usadas = COLUNAS_PARTICAO[aba].values()
+    indices = {coluna: cabecalho.index(coluna) for coluna in colunas_usadas if coluna in cabecalho}
+    if not indices:
+        return None
+
+    df = pd.DataFrame({
+        coluna: [linha[indice] if indice < len(linha) else '' for linha in valores[1:]]
+        for coluna, indice in indices.items()
+    })
+    chaves = anos_meses(df, aba)
+    if chaves is None:
+        return None
+
+    return chaves_particao(*chaves).tolist()
+
+# Função para montar a chave 'AAAA-MM' de cada linha a partir do ano e do mês
+def chaves_particao(ano, mes):
+    """Series de 'AAAA-MM' (ou 'sem_data' quando falta o ano ou o mês), alinhada ao ano"""
+    return pd.Series([
+        f"{int(a):04d}-{int(m):02d}" if pd.notna(a) and pd.notna(m) else 'sem_data'
+        for a, m in zip(ano, mes)
+    ], index=ano.index, dtype=object)
+
+# Função para marcar as linhas dentro do período pela data montada na ingestão
+def mascara_periodo(df, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final):
+    """Série booleana: COLUNA_DATA entre as datas inicial e final (inclusive); NaT fica de fora"""
+    inicio = pd.Timestamp(ano_inicial, mes_inicial, dia_inicial)
+    fim = pd.Timestamp(ano_final, mes_final, dia_final)
+    return df[COLUNA_DATA].between(inicio, fim)
@@ -0,0 +1,585 @@
+import threading
+from datetime import datetime, timedelta
+import pandas as pd
+import streamlit as st
+import gspread
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from google.oauth2.service_account import Credentials
+from cache_disco import carregar_snapshot, carregar_conferencia, salvar_conferencia
+from ingestao import ESQUEMAS_ABAS, montar_dataframe_tipado, juntar_dataframes_tipados
+from esquemas import nomes_aceitos
+from requisicoes_google import executar_requisicao
+from carregamento import executar_uma_vez
+
+# Escopos usados por todas as leituras do painel
+ESCOPOS_GOOGLE = ['https://spreadsheets.google.com/feeds',
+                  'https://www.googleapis.com/auth/drive']
+
+# Arquivo de credenciais para desenvolvimento local
+ARQUIVO_CREDENCIAIS = 'bustling-day-459711-q8-e889589cda14.json'
+
+# Planilha de valores finais (Vendedores, Dados Finais Vendas, Dados In de Escala, Meta Diaria, serviços terceirizados)
+PLANILHA_PRINCIPAL_ID = '1tkjltVrS_8SI4assF0Wlp2CwHhCZbmMt2Lfwi9BVuxY'
+
+# Planilha de vendedores (Dados Vendedores, Comissão)
+PLANILHA_VENDEDORES_ID = '1--dYU8SplKM8wdYtag2MzdggWujtsgAx2lRCmFBPlJs'
+
+# ID da aba de serviços terceirizados na planilha principal
+SERVICOS_TERCEIROS_GID = 1111997089
+
+# Abas lidas em uma única chamada por planilha (título ou gid)
+ABAS_PLANILHA_PRINCIPAL = ('Vendedores', 'Dados Finais Vendas', 'Dados In de Escala', 'Meta Diaria', SERVICOS_TERCEIROS_GID)
+ABAS_PLANILHA_VENDEDORES = ('Dados Vendedores', 'Comissão')
+
+# Abas que só crescem com novas linhas no fim: sincronizadas de forma incremental
+ABAS_INCREMENTAIS = {'Dados Finais Vendas', 'Comissão'}
+
+# Quantidade de linhas finais já conhecidas que são conferidas a cada sincronização
+LINHAS_CONFERENCIA = 5
+
+# Edições no meio da aba não aparecem na conferência final: recarregar tudo periodicamente
+INTERVALO_RECARGA_COMPLETA = timedelta(hours=1)
+
+# Abas grandes: leituras completas feitas em janelas de linhas, uma requisição por janela.
+# Cada janela é tipada (montar_dataframe_tipado) assim que chega e o texto bruto é descartado,
+# então a resposta JSON e a matriz em memória ficam limitadas ao tamanho do bloco
+ABAS_EM_BLOCOS = {'Dados Finais Vendas', 'Comissão'}
+TAMANHO_BLOCO_LINHAS = 5000
+
+# Abas repassadas inteiras a código de fora deste repositório: a função externa de vendas All
+# Inclusive com adicionais (funcao_vendas_luck_com_adic_ai) recebe 'Dados Finais Vendas' como
+# get_all_records() devolvia e as colunas que ela lê não estão declaradas no esquema
+ABAS_SEM_PROJECAO = {'Dados Finais Vendas'}
+
+# Colunas realmente usadas pelo painel nas abas largas (as do esquema de ingestão, com todos os
+# nomes alternativos aceitos). Só essas colunas são baixadas; as demais abas são lidas por inteiro
+COLUNAS_PROJETADAS = {aba: nomes_aceitos(aba) for aba in ESQUEMAS_ABAS if aba not in ABAS_SEM_PROJECAO}
+
+# Cliente e planilhas abertas compartilhados por todas as sessões do processo
+_lock_conexao = threading.Lock()
+_cliente = None
+_planilhas_abertas = {}
+_abas_abertas = {}
+
+# Estado da sincronização incremental: (planilha_id, aba) -> {'valores', 'cabecalho', 'final',
+# 'total_linhas', 'recarga_completa_em'}; cabeçalho e linhas finais no texto da API, para a conferência
+_lock_incremental = threading.Lock()
+_estado_incremental = {}
+# Cabeçalho completo das abas projetadas, resolvido uma vez por processo
+_cabecalhos = {}
+# Progresso das leituras em blocos: (planilha_id, aba) -> {'linhas', 'blocos', 'concluida'}
+_progresso_leituras = {}
+
+# Função para carregar credenciais (Streamlit Cloud ou local)
+def get_google_credentials():
+    """Carrega credenciais do Google - Streamlit Secrets ou arquivo local"""
+    try:
+        # Tentar carregar do Streamlit Secrets (produção)
+        if hasattr(st, 'secrets') and 'gcp_service_account' in st.secrets:
+            return Credentials.from_service_account_info(
+                st.secrets["gcp_service_account"],
+                scopes=ESCOPOS_GOOGLE
+            )
+    except:
+        pass
+
+    # Fallback: arquivo local (desenvolvimento)
+    try:
+        return Credentials.from_service_account_file(
+            ARQUIVO_CREDENCIAIS,
+            scopes=ESCOPOS_GOOGLE
+        )
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar credenciais: {e}")
+        st.info("💡 Configure os secrets no Streamlit Cloud ou adicione o arquivo JSON localmente")
+        return None
+
+# Função para obter o cliente gspread do processo
+def obter_cliente():
+    """Retorna o cliente gspread único do processo, autenticando apenas na primeira chamada"""
+    global _cliente
+
+    with _lock_conexao:
+        if _cliente is None:
+            creds = get_google_credentials()
+            if not creds:
+                return None
+            # A sessão autorizada do gspread renova o token sozinha quando ele expira,
+            # então o cliente pode ser reutilizado durante toda a vida do processo
+            _cliente = gspread.authorize(creds)
+        return _cliente
+
+# Função para abrir (ou reutilizar) uma planilha pelo ID
+def abrir_planilha(planilha_id):
+    """Retorna o Spreadsheet do pool, abrindo-o apenas uma vez por processo"""
+    cliente = obter_cliente()
+    if cliente is None:
+        return None
+
+    with _lock_conexao:
+        planilha = _planilhas_abertas.get(planilha_id)
+    if planilha is not None:
+        return planilha
+
+    # Requisição fora do lock: abrir uma planilha não trava as demais; sessões que pedirem
+    # a mesma planilha ao mesmo tempo esperam a mesma abertura
+    def abrir():
+        planilha = executar_requisicao(cliente.open_by_key, planilha_id)
+        with _lock_conexao:
+            return _planilhas_abertas.setdefault(planilha_id, planilha)
+
+    return executar_uma_vez(('abrir_planilha', planilha_id), abrir)
+
+# Função para obter uma aba pelo nome ou pelo gid
+def obter_aba(planilha_id, aba=None, gid=None):
+    """Retorna a aba (Worksheet) do pool, buscando os metadados da planilha apenas uma vez"""
+    chave = (planilha_id, aba if aba is not None else gid)
+
+    with _lock_conexao:
+        worksheet = _abas_abertas.get(chave)
+    if worksheet is not None:
+        return worksheet
+
+    planilha = abrir_planilha(planilha_id)
+    if planilha is None:
+        return None
+
+    def buscar():
+        if aba is not None:
+            worksheet = executar_requisicao(planilha.worksheet, aba)
+        else:
+            worksheet = executar_requisicao(planilha.get_worksheet_by_id, gid)
+        with _lock_conexao:
+            return _abas_abertas.setdefault(chave, worksheet)
+
+    return executar_uma_vez(('obter_aba',) + chave, buscar)
+
+# Função para consultar a versão da planilha sem baixar valores
+def versao_planilha(planilha_id):
+    """modifiedTime do arquivo no Drive: muda a cada edição em qualquer aba"""
+    planilha = abrir_planilha(planilha_id)
+    if planilha is None:
+        return None
+    return executar_requisicao(planilha.get_lastUpdateTime)
+
+# Função para descartar cliente e planilhas em cache
+def limpar_conexoes():
+    """Descarta o cliente e o pool de planilhas (força nova autenticação na próxima leitura)"""
+    global _cliente
+
+    with _lock_conexao:
+        _cliente = None
+        _planilhas_abertas.clear()
+        _abas_abertas.clear()
+
+# Função para ler várias abas da mesma planilha em uma única requisição
+def ler_valores_em_lote(planilha_id, abas):
+    """Busca os valores de todas as abas informadas com um único values_batch_get
+
+    abas: sequência de títulos (str) ou gids (int) da mesma planilha
+    Só as abas em blocos (ABAS_EM_BLOCOS) e as recargas de abas editadas no meio fazem outras leituras.
+    Retorna dict aba -> matriz de valores (lista de linhas), na mesma ordem de abas; as abas em
+    blocos vêm como DataFrame já tipado (o mesmo de montar_dataframe_tipado sobre a matriz).
+    Abas em COLUNAS_PROJETADAS trazem apenas as colunas usadas pelo painel.
+    """
+    planilha = abrir_planilha(planilha_id)
+    if planilha is None:
+        return None
+
+    # Abas identificadas por gid precisam do título para montar o intervalo A1
+    titulos = {aba: _titulo_aba(planilha_id, aba) if isinstance(aba, int) else aba for aba in abas}
+
+    # Cabeçalho ainda não resolvido neste processo: essas abas vêm inteiras no mesmo lote
+    # (todas as colunas da aba, um superconjunto das projetadas) e são recortadas aqui
+    sem_cabecalho = {aba for aba in abas if aba in COLUNAS_PROJETADAS and _obter_cabecalho(planilha_id, aba) is None}
+
+    pedidos = []
+    for aba in abas:
+        pedidos.extend(_pedidos_aba(planilha_id, aba, titulos[aba]))
+    # Leituras completas das abas grandes saem do lote e são feitas em blocos depois
+    em_blocos = {aba for aba, tipo, _, _ in pedidos if tipo == 'completa' and aba in ABAS_EM_BLOCOS}
+    lidos = _buscar_em_lote(planilha, [pedido for pedido in pedidos if not (pedido[0] in em_blocos and pedido[1] == 'completa')])
+
+    valores_abas = {}
+    recarregar = []
+    for aba in abas:
+        partes = lidos.get(aba, {})
+
+        # Cabeçalho mudou (colunas inseridas, removidas ou renomeadas): reler a aba inteira
+        if 'cabecalho' in partes and not _cabecalho_confere(planilha_id, aba, _primeira_linha(partes['cabecalho'])):
+            recarregar.append(aba)
+            continue
+
+        if aba in em_blocos:
+            valores_abas[aba], base = _ler_em_blocos(planilha, planilha_id, aba, titulos[aba], projetar=aba in sem_cabecalho)
+            _registrar_recarga_completa(planilha_id, aba, valores_abas[aba], base)
+            continue
+
+        if aba in sem_cabecalho and 'completa' in partes:
+            partes['completa'] = _projetar_valores(planilha_id, aba, partes['completa'])
+
+        if 'completa' in partes:
+            valores_abas[aba] = partes['completa']
+            _registrar_recarga_completa(planilha_id, aba, partes['completa'])
+            continue
+
+        valores = _aplicar_incremento(planilha_id, aba, partes)
+        if valores is None:
+            recarregar.append(aba)
+        else:
+            valores_abas[aba] = valores
+
+    # Linhas antigas ou cabeçalho mudaram: buscar as abas inteiras de novo. É a única situação
+    # com uma segunda requisição de valores, e só acontece quando a aba foi editada no meio
+    if recarregar:
+        pedidos = []
+        for aba in recarregar:
+            if aba not in ABAS_EM_BLOCOS:
+                pedidos.extend(_pedidos_completos(planilha_id, aba, titulos[aba]))
+        lidos = _buscar_em_lote(planilha, pedidos)
+        for aba in recarregar:
+            base = None
+            if aba in ABAS_EM_BLOCOS:
+                valores_abas[aba], base = _ler_em_blocos(planilha, planilha_id, aba, titulos[aba])
+            else:
+                valores_abas[aba] = lidos.get(aba, {}).get('completa', [])
+            _registrar_recarga_completa(planilha_id, aba, valores_abas[aba], base)
+
+    return {aba: valores_abas[aba] for aba in abas if aba in valores_abas}
+
+def _titulo_aba(planilha_id, gid):
+    """Título da aba de gid informado; WorksheetNotFound com a planilha e o gid se ela não existir"""
+    try:
+        worksheet = obter_aba(planilha_id, gid=gid)
+    except gspread.exceptions.WorksheetNotFound:
+        worksheet = None
+    if worksheet is None:
+        raise gspread.exceptions.WorksheetNotFound(f"Aba de gid {gid} não encontrada na planilha {planilha_id}")
+    return worksheet.title
+
+# Função para consultar o progresso das leituras em blocos
+def progresso_leituras():
+    """Retorna dict (planilha_id, aba) -> {'linhas', 'blocos', 'concluida'} da última leitura em blocos"""
+    with _lock_incremental:
+        return {chave: dict(progresso) for chave, progresso in _progresso_leituras.items()}
+
+def _registrar_progresso(planilha_id, aba, linhas, blocos, concluida=False):
+    with _lock_incremental:
+        _progresso_leituras[(planilha_id, aba)] = {'linhas': linhas, 'blocos': blocos, 'concluida': concluida}
+
+def _total_linhas_aba(planilha, titulo):
+    """Linhas da grade da aba (rowCount), consultadas na hora: a aba pode ter crescido desde que foi aberta"""
+    metadados = executar_requisicao(
+        planilha.fetch_sheet_metadata,
+        params={'fields': 'sheets.properties(title,gridProperties.rowCount)'}
+    )
+    for folha in metadados.get('sheets', []):
+        propriedades = folha.get('properties', {})
+        if propriedades.get('title') == titulo:
+            return propriedades.get('gridProperties', {}).get('rowCount', 0)
+    return 0
+
+def _ler_em_blocos(planilha, planilha_id, aba, titulo, projetar=False):
+    """Lê a aba inteira em janelas de TAMANHO_BLOCO_LINHAS linhas, até o fim da grade da aba
+
+    Cada janela vira um DataFrame tipado antes da próxima ser pedida; as partes são juntadas
+    no fim (juntar_dataframes_tipados). projetar: a primeira janela vem com todas as colunas
+    (cabeçalho ainda desconhecido) e é recortada; as seguintes já pedem só as projetadas.
+    Retorna (DataFrame, base da conferência incremental).
+    """
+    total_grade = _total_linhas_aba(planilha, titulo)
+    partes = []
+    cabecalho = None
+    final = []
+    # Linhas vazias ainda não anexadas: só entram se aparecerem linhas com valores depois delas
+    pendentes = 0
+    linhas = 0
+    blocos = 0
+    for inicio in range(1, total_grade + 1, TAMANHO_BLOCO_LINHAS):
+        fim = min(inicio + TAMANHO_BLOCO_LINHAS - 1, total_grade)
+        lidos = _buscar_em_lote(planilha, _pedidos_completos(planilha_id, aba, titulo, (inicio, fim)))
+        bloco = lidos.get(aba, {}).get('completa', [])
+        blocos += 1
+
+        linhas_janela = fim - inicio + 1
+        if cabecalho is None:
+            if projetar:
+                bloco = _projetar_valores(planilha_id, aba, bloco)
+            if not bloco:
+                break  # Aba vazia
+            cabecalho, bloco = bloco[0], bloco[1:]
+            linhas_janela -= 1
+
+        if bloco:
+            # Linhas vazias no meio da aba continuam no DataFrame, como numa leitura única
+            janela = [[] for _ in range(pendentes)] + bloco
+            partes.append(montar_dataframe_tipado([cabecalho] + janela, aba, compactar=False))
+            final = (final + janela)[-LINHAS_CONFERENCIA:]
+            linhas += len(janela)
+            pendentes = 0
+        pendentes += linhas_janela - len(bloco)
+        _registrar_progresso(planilha_id, aba, linhas, blocos)
+
+    if cabecalho is None:
+        df = pd.DataFrame()
+    elif partes:
+        df = juntar_dataframes_tipados(partes, aba)
+    else:
+        df = montar_dataframe_tipado([cabecalho], aba)
+    _registrar_progresso(planilha_id, aba, linhas, blocos, concluida=True)
+    base = {'cabecalho': cabecalho or [], 'final': final, 'total_linhas': linhas + 1 if cabecalho is not None else 0}
+    return df, base
+
+def _buscar_em_lote(planilha, pedidos):
+    """Executa os pedidos (aba, tipo, intervalo, largura) em um único values_batch_get
+
+    A leitura é feita por colunas para que faixas de colunas diferentes da mesma aba
+    possam ser juntadas lado a lado. Retorna dict aba -> tipo -> matriz de linhas.
+    """
+    if not pedidos:
+        return {}
+
+    resposta = executar_requisicao(
+        planilha.values_batch_get,
+        [intervalo for _, _, intervalo, _ in pedidos],
+        params={'majorDimension': 'COLUMNS'}
+    )
+    intervalos_lidos = resposta.get('valueRanges', [])
+
+    colunas_lidas = {}
+    for (aba, tipo, _, largura), intervalo in zip(pedidos, intervalos_lidos):
+        colunas = intervalo.get('values', [])
+        # A API omite colunas vazias no fim da faixa: manter a posição das faixas seguintes
+        if largura is not None:
+            colunas = colunas + [[] for _ in range(largura - len(colunas))]
+        colunas_lidas.setdefault(aba, {}).setdefault(tipo, []).extend(colunas)
+
+    return {
+        aba: {tipo: _colunas_para_linhas(colunas) for tipo, colunas in tipos.items()}
+        for aba, tipos in colunas_lidas.items()
+    }
+
+def _colunas_para_linhas(colunas):
+    """Transpõe a leitura por colunas para a matriz de linhas usada pelo restante do painel"""
+    total_linhas = max((len(coluna) for coluna in colunas), default=0)
+    return [
+        [coluna[i] if i < len(coluna) else '' for coluna in colunas]
+        for i in range(total_linhas)
+    ]
+
+def _primeira_linha(valores):
+    return valores[0] if valores else []
+
+def _letra_coluna(indice):
+    """Letra da coluna a partir do índice (0 -> A)"""
+    return rowcol_to_a1(1, indice + 1).rstrip('0123456789')
+
+def _aparar(linha):
+    """Remove células vazias do fim da linha (a API não as devolve, o snapshot sim)"""
+    linha = list(linha)
+    while linha and linha[-1] == '':
+        linha.pop()
+    return linha
+
+def _obter_cabecalho(planilha_id, aba):
+    with _lock_incremental:
+        return _cabecalhos.get((planilha_id, aba))
+
+def _guardar_cabecalho(planilha_id, aba, cabecalho):
+    with _lock_incremental:
+        _cabecalhos[(planilha_id, aba)] = list(cabecalho)
+
+def _projetar_valores(planilha_id, aba, valores):
+    """Guarda o cabeçalho completo da aba lida por inteiro e mantém só as colunas projetadas"""
+    _guardar_cabecalho(planilha_id, aba, _primeira_linha(valores))
+    indices = _indices_projetados(planilha_id, aba)
+    if indices is None:
+        return valores
+
+    projetados = [[linha[i] if i < len(linha) else '' for i in indices] for linha in valores]
+    # Linhas que só tinham valores em colunas descartadas
+    while projetados and not any(projetados[-1]):
+        projetados.pop()
+    return projetados
+
+def _indices_projetados(planilha_id, aba):
+    """Índices (na ordem da aba) das colunas usadas, ou None para ler a aba inteira"""
+    if aba not in COLUNAS_PROJETADAS:
+        return None
+    cabecalho = _obter_cabecalho(planilha_id, aba) or []
+    usadas = set(COLUNAS_PROJETADAS[aba])
+    indices = [i for i, nome in enumerate(cabecalho) if str(nome).strip() in usadas]
+    return indices or None
+
+def _faixas_colunas(indices):
+    """Agrupa índices consecutivos em faixas (inicio, fim) para reduzir o número de intervalos"""
+    faixas = []
+    for indice in indices:
+        if faixas and faixas[-1][1] == indice - 1:
+            faixas[-1] = (faixas[-1][0], indice)
+        else:
+            faixas.append((indice, indice))
+    return faixas
+
+def _cabecalho_confere(planilha_id, aba, cabecalho):
+    """Compara o cabeçalho lido com o que foi usado para montar os valores conhecidos"""
+    if aba in COLUNAS_PROJETADAS:
+        conhecido = _obter_cabecalho(planilha_id, aba)
+        if _aparar(cabecalho) != _aparar(conhecido or []):
+            _guardar_cabecalho(planilha_id, aba, cabecalho)
+            return False
+        return True
+
+    with _lock_incremental:
+        estado = _estado_incremental.get((planilha_id, aba))
+    return estado is None or _aparar(cabecalho) == _aparar(estado['cabecalho'])
+
+def _pedidos_completos(planilha_id, aba, titulo, linhas=None):
+    """Intervalos para ler a aba inteira (apenas as colunas projetadas, se houver)
+
+    linhas: (primeira, ultima) para ler só uma janela de linhas
+    """
+    primeira, ultima = linhas if linhas is not None else (1, '')
+    indices = _indices_projetados(planilha_id, aba)
+    if indices is None:
+        intervalo = f"{primeira}:{ultima}" if linhas is not None else None
+        return [(aba, 'completa', absolute_range_name(titulo, intervalo), None)]
+
+    return [
+        (aba, 'completa', absolute_range_name(titulo, f"{_letra_coluna(inicio)}{primeira}:{_letra_coluna(fim)}{ultima}"), fim - inicio + 1)
+        for inicio, fim in _faixas_colunas(indices)
+    ]
+
+def _pedidos_aba(planilha_id, aba, titulo):
+    """Intervalos da aba: completa, ou cabeçalho + conferência + linhas novas quando incremental"""
+    # Cabeçalho desconhecido: a aba inteira, sem projeção (a primeira linha é o cabeçalho)
+    if aba in COLUNAS_PROJETADAS and _obter_cabecalho(planilha_id, aba) is None:
+        return _pedidos_completos(planilha_id, aba, titulo)
+
+    pedidos = []
+    indices = _indices_projetados(planilha_id, aba)
+    estado = _obter_estado_incremental(planilha_id, aba, indices)
+
+    if indices is not None or estado is not None:
+        pedidos.append((aba, 'cabecalho', absolute_range_name(titulo, '1:1'), None))
+
+    if estado is None:
+        return pedidos + _pedidos_completos(planilha_id, aba, titulo)
+
+    total_linhas = estado['total_linhas']
+    inicio_conferencia = max(2, total_linhas - LINHAS_CONFERENCIA + 1)
+    faixas = _faixas_colunas(indices) if indices is not None else [(0, len(estado['cabecalho']) - 1)]
+
+    for inicio, fim in faixas:
+        largura = fim - inicio + 1
+        coluna_inicio, coluna_fim = _letra_coluna(inicio), _letra_coluna(fim)
+        pedidos.append((aba, 'conferencia', absolute_range_name(titulo, f"{coluna_inicio}{inicio_conferencia}:{coluna_fim}{total_linhas}"), largura))
+        pedidos.append((aba, 'novas', absolute_range_name(titulo, f"{coluna_inicio}{total_linhas + 1}:{coluna_fim}"), largura))
+    return pedidos
+
+def _obter_estado_incremental(planilha_id, aba, indices=None):
+    """Retorna o estado incremental da aba, semeado pelo snapshot em disco após reinício"""
+    if aba not in ABAS_INCREMENTAIS:
+        return None
+
+    chave = (planilha_id, aba)
+    with _lock_incremental:
+        estado = _estado_incremental.get(chave)
+    if estado is None:
+        estado = _estado_do_snapshot(planilha_id, aba)
+        if estado is None:
+            return None
+        with _lock_incremental:
+            estado = _estado_incremental.setdefault(chave, estado)
+
+    # Sem linhas de dados ou recarga completa vencida: buscar a aba inteira
+    if estado['total_linhas'] < 2 or datetime.now() - estado['recarga_completa_em'] > INTERVALO_RECARGA_COMPLETA:
+        return None
+
+    # Valores conhecidos montados com outra projeção de colunas (ex.: snapshot antigo)
+    if indices is not None:
+        cabecalho = _obter_cabecalho(planilha_id, aba)
+        if _aparar(estado['cabecalho']) != _aparar([cabecalho[i] for i in indices]):
+            return None
+    return estado
+
+def _estado_do_snapshot(planilha_id, aba):
+    """Estado incremental a partir do snapshot em disco, ou None se não der para conferir"""
+    snapshot = carregar_snapshot(planilha_id, aba)
+    if snapshot is None or snapshot[1] is None:
+        return None
+    valores, recarga_completa_em = snapshot
+
+    if isinstance(valores, pd.DataFrame):
+        # Snapshot tipado: o texto do cabeçalho e das linhas finais fica na base gravada a cada
+        # leitura. O snapshot só é regravado quando o conteúdo muda: total diferente, leituras diferentes
+        base = carregar_conferencia(planilha_id, aba)
+        if base is None or base['total_linhas'] != len(valores) + 1:
+            return None
+    elif valores:
+        base = _base_conferencia(valores)
+    else:
+        return None
+    return dict(base, valores=valores, recarga_completa_em=recarga_completa_em)
+
+def _base_conferencia(valores):
+    """Cabeçalho, últimas linhas e total de linhas de uma matriz de valores"""
+    return {
+        'cabecalho': _primeira_linha(valores),
+        'final': valores[max(1, len(valores) - LINHAS_CONFERENCIA):],
+        'total_linhas': len(valores),
+    }
+
+def _anexar_linhas(aba, estado, novas):
+    """Valores conhecidos com as linhas novas no fim (tipadas, se os valores forem um DataFrame)"""
+    valores = estado['valores']
+    if isinstance(valores, pd.DataFrame):
+        novas = montar_dataframe_tipado([estado['cabecalho']] + novas, aba, compactar=False)
+        return juntar_dataframes_tipados([valores, novas], aba)
+    return valores + novas
+
+def _guardar_estado(planilha_id, aba, estado):
+    """Troca o estado incremental da aba; a base dos valores tipados também vai para o disco"""
+    with _lock_incremental:
+        _estado_incremental[(planilha_id, aba)] = estado
+    if isinstance(estado['valores'], pd.DataFrame):
+        salvar_conferencia(planilha_id, aba, {chave: estado[chave] for chave in ('cabecalho', 'final', 'total_linhas')})
+
+def _aplicar_incremento(planilha_id, aba, partes):
+    """Anexa as linhas novas aos valores conhecidos, ou retorna None se as linhas antigas mudaram"""
+    chave = (planilha_id, aba)
+    with _lock_incremental:
+        estado = _estado_incremental.get(chave)
+    if estado is None:
+        return None
+
+    conhecidas = [_aparar(linha) for linha in estado['final']]
+    conferidas = [_aparar(linha) for linha in partes.get('conferencia', [])]
+    # A API omite linhas vazias no fim do intervalo
+    conferidas += [[] for _ in range(len(conhecidas) - len(conferidas))]
+
+    if conferidas != conhecidas:
+        return None
+
+    novas = partes.get('novas', [])
+    if not novas:
+        return estado['valores']
+
+    estado = dict(
+        estado,
+        valores=_anexar_linhas(aba, estado, novas),
+        final=(estado['final'] + novas)[-LINHAS_CONFERENCIA:],
+        total_linhas=estado['total_linhas'] + len(novas),
+    )
+    _guardar_estado(planilha_id, aba, estado)
+    return estado['valores']
+
+def _registrar_recarga_completa(planilha_id, aba, valores, base=None):
+    """Guarda os valores da aba recém-lida por inteiro como base da próxima sincronização
+
+    base: cabeçalho, linhas finais e total (de _ler_em_blocos); sem ela, vem da matriz de valores
+    """
+    if aba not in ABAS_INCREMENTAIS:
+        return
+    base = base if base is not None else _base_conferencia(valores)
+    _guardar_estado(planilha_id, aba, dict(base, valores=valores, recarga_completa_em=datetime.now()))
@@ -0,0 +1,390 @@
+import io
+import zipfile
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib import colors as rl_colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, KeepTogether
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+
+# Geração dos relatórios em PDF e do ZIP com vários relatórios
+# (importado só no primeiro uso pelo painel: reportlab é pesado para o início do script)
+
+def gerar_pdf_estatistico(vendedor, periodo_texto, dados_grid1, dados_grid2, dados_resumo):
+    """Gera PDF com relatório estatístico do vendedor"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=15*mm, leftMargin=15*mm, topMargin=15*mm, bottomMargin=15*mm)
+    elementos = []
+    styles = getSampleStyleSheet()
+    
+    # Estilo customizado
+    titulo_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=14,
+        textColor=rl_colors.HexColor('#1f77b4'),
+        spaceAfter=6,
+        alignment=TA_CENTER
+    )
+    
+    subtitulo_style = ParagraphStyle(
+        'CustomSubtitle',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=rl_colors.grey,
+        spaceAfter=8,
+        alignment=TA_CENTER
+    )
+    
+    secao_style = ParagraphStyle(
+        'CustomSection',
+        parent=styles['Heading2'],
+        fontSize=11,
+        textColor=rl_colors.HexColor('#2ca02c'),
+        spaceAfter=4,
+        spaceBefore=6
+    )
+    
+    # Título
+    elementos.append(Paragraph("RELATÓRIO ESTATÍSTICO", titulo_style))
+    elementos.append(Paragraph(f"Vendedor: <b>{vendedor}</b> | Período: {periodo_texto}", subtitulo_style))
+    elementos.append(Spacer(1, 4*mm))
+    
+    # Seção 1: Vendas Luck Sem Adicionais
+    elementos.append(Paragraph("📊 VENDAS LUCK SEM ADICIONAIS", secao_style))
+    
+    if dados_grid1:
+        data_grid1 = [
+            ['Métrica', 'Valor'],
+            ['Vendas Luck Sem Adicionais', dados_grid1.get('Vendas Luck Sem Adicionais', 'R$ 0,00')],
+            ['Paxs In', dados_grid1.get('Paxs In', '0')],
+            ['Ticket Médio', dados_grid1.get('Ticket Médio', 'R$ 0,00')],
+            ['Meta', dados_grid1.get('Meta', 'R$ 0,00')],
+            ['Alcance de Meta', dados_grid1.get('Alcance de Meta', '0,00%')],
+        ]
+        
+        if 'Premiação' in dados_grid1:
+            data_grid1.append(['Premiação', dados_grid1.get('Premiação', '0%')])
+        
+        table1 = Table(data_grid1, colWidths=[90*mm, 60*mm])
+        table1.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#1f77b4')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
+            ('GRID', (0, 0), (-1, -1), 0.5, rl_colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [rl_colors.white, rl_colors.lightgrey]),
+        ]))
+        elementos.append(table1)
+    else:
+        elementos.append(Paragraph("Sem dados disponíveis", styles['Normal']))
+    
+    elementos.append(Spacer(1, 4*mm))
+    
+    # Seção 2: All Inclusive
+    elementos.append(Paragraph("📊 ALL INCLUSIVE", secao_style))
+    
+    if dados_grid2:
+        data_grid2 = [
+            ['Métrica', 'Valor'],
+            ['Vendas Luck Sem Adicionais AI', dados_grid2.get('Vendas Luck Sem Adicionais All Inclusive', 'R$ 0,00')],
+            ['Paxs In All Inclusive', dados_grid2.get('Paxs In All Inclusive', '0')],
+            ['Ticket Médio All Inclusive', dados_grid2.get('Ticket Médio All Inclusive', 'R$ 0,00')],
+            ['Meta All Inclusive', dados_grid2.get('Meta All Inclusive', 'R$ 0,00')],
+            ['Alcance de Meta All Inclusive', dados_grid2.get('Alcance de Meta All Inclusive', '0,00%')],
+        ]
+        
+        if 'Premiação All Inclusive' in dados_grid2:
+            data_grid2.append(['Premiação All Inclusive', dados_grid2.get('Premiação All Inclusive', '0%')])
+        
+        table2 = Table(data_grid2, colWidths=[90*mm, 60*mm])
+        table2.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#1f77b4')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
+            ('GRID', (0, 0), (-1, -1), 0.5, rl_colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [rl_colors.white, rl_colors.lightgrey]),
+        ]))
+        elementos.append(table2)
+    else:
+        elementos.append(Paragraph("Sem dados disponíveis", styles['Normal']))
+    
+    elementos.append(Spacer(1, 4*mm))
+    
+    # Seção 3: Resumo de Comissão
+    elementos.append(Paragraph("💰 RESUMO DE COMISSÃO", secao_style))
+    
+    if dados_resumo:
+        data_resumo = [
+            ['Descrição', 'Valor'],
+            ['Valor Total de Venda', dados_resumo.get('Valor Total de Venda', 'R$ 0,00')],
+            ['Valor Total Comissão Luck', dados_resumo.get('Valor Total Comissão Luck', 'R$ 0,00')],
+            ['Valor Total Comissão Terceiros', dados_resumo.get('Valor Total Comissão Terceiros', 'R$ 0,00')],
+        ]
+        
+        if 'Valor Total Comissão Premiação' in dados_resumo:
+            data_resumo.append(['Valor Total Comissão Premiação', dados_resumo.get('Valor Total Comissão Premiação', 'R$ 0,00')])
+        
+        if 'Valor Total Comissão Premiação All Inclusive' in dados_resumo:
+            data_resumo.append(['Valor Total Comissão Premiação AI', dados_resumo.get('Valor Total Comissão Premiação All Inclusive', 'R$ 0,00')])
+        
+        data_resumo.append(['VALOR TOTAL DE COMISSÃO', dados_resumo.get('Valor Total de Comissão', 'R$ 0,00')])
+        
+        table3 = Table(data_resumo, colWidths=[90*mm, 60*mm])
+        table3.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#2ca02c')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
+            ('GRID', (0, 0), (-1, -1), 0.5, rl_colors.black),
+            ('FONTSIZE', (0, 1), (-1, -2), 8),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -2), [rl_colors.white, rl_colors.lightgrey]),
+            ('BACKGROUND', (0, -1), (-1, -1), rl_colors.HexColor('#2ca02c')),
+            ('TEXTCOLOR', (0, -1), (-1, -1), rl_colors.whitesmoke),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 10),
+        ]))
+        elementos.append(table3)
+    else:
+        elementos.append(Paragraph("Sem dados disponíveis", styles['Normal']))
+    
+    # Construir PDF
+    doc.build(elementos)
+    buffer.seek(0)
+    return buffer
+
+def gerar_pdf_comissao(vendedor, periodo_texto, dados_detalhes, dados_resumo, tipo_vendedor):
+    """Gera PDF com relatório de comissão detalhado do vendedor"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), rightMargin=10*mm, leftMargin=10*mm, topMargin=10*mm, bottomMargin=10*mm)
+    elementos = []
+    styles = getSampleStyleSheet()
+    
+    # Estilos
+    titulo_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=14,
+        textColor=rl_colors.HexColor('#1f77b4'),
+        spaceAfter=4,
+        alignment=TA_CENTER
+    )
+    
+    subtitulo_style = ParagraphStyle(
+        'CustomSubtitle',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=rl_colors.grey,
+        spaceAfter=6,
+        alignment=TA_CENTER
+    )
+    
+    secao_style = ParagraphStyle(
+        'CustomSection',
+        parent=styles['Heading2'],
+        fontSize=11,
+        textColor=rl_colors.HexColor('#d62728'),
+        spaceAfter=4,
+        spaceBefore=4
+    )
+    
+    # Título
+    elementos.append(Paragraph("RELATÓRIO DE COMISSÃO", titulo_style))
+    elementos.append(Paragraph(f"Vendedor: <b>{vendedor}</b> | Período: {periodo_texto}", subtitulo_style))
+    elementos.append(Spacer(1, 2*mm))
+    
+    # Detalhes das Vendas
+    elementos.append(Paragraph("📋 DETALHES DAS VENDAS", secao_style))
+    
+    if dados_detalhes is not None and not dados_detalhes.empty:
+        # Calcular largura disponível
+        largura_disponivel = landscape(A4)[0] - 20*mm  # 277mm disponível
+        
+        # Preparar cabeçalhos com larguras específicas otimizadas para caber na página
+        colunas_config = [
+            ('Data da Venda', 18*mm),
+            ('Código da Reserva', 22*mm),
+            ('Serviço', 38*mm),
+            ('Valor da Venda', 18*mm),
+            ('Venda All Inclusive', 15*mm),
+            ('Tipo de Serviço', 18*mm),
+            ('Comissão Luck', 15*mm),
+            ('Comissão Terceiros', 18*mm),
+        ]
+        
+        # Adicionar colunas de premiação apenas para Transferistas
+        if tipo_vendedor == 'Transferistas':
+            colunas_config.extend([
+                ('Premiação', 15*mm),
+                ('Premiação All Inclusive', 18*mm),
+            ])
+        
+        colunas_config.extend([
+            ('Valor Comissão Luck', 20*mm),
+            ('Valor Comissão Terceiros', 22*mm),
+        ])
+        
+        if tipo_vendedor == 'Transferistas':
+            colunas_config.extend([
+                ('Valor Comissão Premiação', 22*mm),
+                ('Valor Comissão Premiação All Inclusive', 25*mm),
+            ])
+        
+        colunas_config.append(('Valor Total de Comissão', 22*mm))
+        
+        # Filtrar apenas colunas que existem
+        colunas_existentes = []
+        col_widths = []
+        for col_nome, col_largura in colunas_config:
+            if col_nome in dados_detalhes.columns:
+                colunas_existentes.append(col_nome)
+                col_widths.append(col_largura)
+        
+        # Ajustar larguras proporcionalmente se exceder a largura disponível
+        largura_total = sum(col_widths)
+        if largura_total > largura_disponivel:
+            fator_ajuste = largura_disponivel / largura_total
+            col_widths = [w * fator_ajuste for w in col_widths]
+        
+        # Criar estilo para células com quebra de texto
+        cell_style = ParagraphStyle(
+            'CellStyle',
+            fontSize=6,
+            leading=7,
+            wordWrap='CJK',
+            alignment=TA_CENTER
+        )
+        
+        # Processar dados em lotes de 25 linhas por página
+        total_registros = len(dados_detalhes)
+        linhas_por_pagina = 25
+        
+        for inicio in range(0, total_registros, linhas_por_pagina):
+            fim = min(inicio + linhas_por_pagina, total_registros)
+            
+            # Se não for a primeira página, adicionar quebra
+            if inicio > 0:
+                elementos.append(PageBreak())
+                elementos.append(Paragraph("📋 DETALHES DAS VENDAS (continuação)", secao_style))
+            
+            # Criar cabeçalho da tabela com quebra de linha
+            header_row = []
+            for col in colunas_existentes:
+                header_row.append(Paragraph(f"<b>{col}</b>", 
+                    ParagraphStyle('HeaderStyle', fontSize=6, leading=7, wordWrap='CJK', 
+                                 alignment=TA_CENTER, textColor=rl_colors.whitesmoke)))
+            data_table = [header_row]
+            
+            # Adicionar linhas deste lote
+            for idx, row in dados_detalhes.iloc[inicio:fim].iterrows():
+                linha = []
+                for col in colunas_existentes:
+                    valor = str(row.get(col, ''))
+                    # Sempre usar Paragraph para garantir quebra de texto
+                    linha.append(Paragraph(valor, cell_style))
+                data_table.append(linha)
+            
+            # Criar tabela
+            table_detalhes = Table(data_table, colWidths=col_widths, repeatRows=1)
+            table_detalhes.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#d62728')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 6),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 4),
+                ('TOPPADDING', (0, 0), (-1, 0), 4),
+                ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
+                ('GRID', (0, 0), (-1, -1), 0.5, rl_colors.grey),
+                ('FONTSIZE', (0, 1), (-1, -1), 6),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [rl_colors.white, rl_colors.lightgrey]),
+                ('LEFTPADDING', (0, 0), (-1, -1), 2),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+                ('TOPPADDING', (0, 1), (-1, -1), 3),
+                ('BOTTOMPADDING', (0, 1), (-1, -1), 3),
+            ]))
+            elementos.append(table_detalhes)
+            elementos.append(Spacer(1, 3*mm))
+        
+        # Informação sobre total de registros
+        if total_registros > linhas_por_pagina:
+            elementos.append(Paragraph(f"<i>Total de {total_registros} registros exibidos</i>", 
+                                      ParagraphStyle('Italic', fontSize=8, textColor=rl_colors.grey)))
+    else:
+        elementos.append(Paragraph("Sem dados de comissão disponíveis", styles['Normal']))
+    
+    # Criar elementos do resumo para KeepTogether
+    elementos_resumo = []
+    elementos_resumo.append(Spacer(1, 8*mm))
+    elementos_resumo.append(Paragraph("💰 RESUMO FINAL DE COMISSÃO", secao_style))
+    elementos_resumo.append(Spacer(1, 3*mm))
+    
+    if dados_resumo:
+        data_resumo = [
+            ['Descrição', 'Valor'],
+            ['Valor Total de Venda', dados_resumo.get('Valor Total de Venda', 'R$ 0,00')],
+            ['Valor Total Comissão Luck', dados_resumo.get('Valor Total Comissão Luck', 'R$ 0,00')],
+            ['Valor Total Comissão Terceiros', dados_resumo.get('Valor Total Comissão Terceiros', 'R$ 0,00')],
+        ]
+        
+        if tipo_vendedor == 'Transferistas':
+            if 'Valor Total Comissão Premiação' in dados_resumo:
+                data_resumo.append(['Valor Total Comissão Premiação', dados_resumo.get('Valor Total Comissão Premiação', 'R$ 0,00')])
+            
+            if 'Valor Total Comissão Premiação All Inclusive' in dados_resumo:
+                data_resumo.append(['Valor Total Comissão Premiação AI', dados_resumo.get('Valor Total Comissão Premiação All Inclusive', 'R$ 0,00')])
+        
+        data_resumo.append(['VALOR TOTAL DE COMISSÃO', dados_resumo.get('Valor Total de Comissão', 'R$ 0,00')])
+        
+        table_resumo = Table(data_resumo, colWidths=[120*mm, 80*mm])
+        table_resumo.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#d62728')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, rl_colors.black),
+            ('FONTSIZE', (0, 1), (-1, -2), 12),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -2), [rl_colors.white, rl_colors.lightgrey]),
+            ('BACKGROUND', (0, -1), (-1, -1), rl_colors.HexColor('#d62728')),
+            ('TEXTCOLOR', (0, -1), (-1, -1), rl_colors.whitesmoke),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 16),
+        ]))
+        elementos_resumo.append(table_resumo)
+    else:
+        elementos_resumo.append(Paragraph("Sem dados de resumo disponíveis", styles['Normal']))
+    
+    # Usar KeepTogether para manter o resumo na mesma página
+    elementos.append(KeepTogether(elementos_resumo))
+    
+    # Construir PDF
+    doc.build(elementos)
+    buffer.seek(0)
+    return buffer
+
+# Função para juntar vários PDFs em um arquivo ZIP
+def compactar_pdfs_zip(pdfs_gerados):
+    """Retorna um BytesIO com o ZIP dos PDFs (lista de dicts com 'nome_arquivo' e 'buffer')"""
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for pdf_info in pdfs_gerados:
+            # Adicionar cada PDF ao ZIP
+            zip_file.writestr(pdf_info['nome_arquivo'], pdf_info['buffer'].getvalue())
+    zip_buffer.seek(0)
+    return zip_buffer
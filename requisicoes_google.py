@@ -0,0 +1,102 @@
+import random
+import threading
+import time
+from collections import deque
+import requests
+from gspread.exceptions import APIError
+
+# Orçamento de requisições por minuto compartilhado por todas as sessões do processo
+# (a cota de leitura do Sheets é de 60 por minuto por usuário; sobra folga para o Drive)
+REQUISICOES_POR_MINUTO = 50
+JANELA_ORCAMENTO = 60.0
+
+# Novas tentativas para erros transitórios (429 e 5xx) e falhas de conexão
+MAX_TENTATIVAS = 5
+ESPERA_INICIAL = 1.0
+ESPERA_MAXIMA = 32.0
+STATUS_TRANSITORIOS = {429, 500, 502, 503, 504}
+
+# Horários das requisições dentro da janela atual
+_lock_orcamento = threading.Lock()
+_requisicoes_recentes = deque()
+
+# Métricas desde o início do processo
+_lock_metricas = threading.Lock()
+_metricas = {
+    'requisicoes': 0,         # chamadas feitas ao Google (incluindo novas tentativas)
+    'novas_tentativas': 0,    # repetições após erro transitório
+    'erros_429': 0,           # respostas de cota excedida
+    'erros_5xx': 0,           # erros do servidor
+    'erros_conexao': 0,       # timeouts e quedas de conexão
+    'falhas': 0,              # chamadas que terminaram em erro (definitivo ou após as tentativas)
+    'limitadas': 0,           # chamadas que esperaram pelo orçamento por minuto
+    'espera_orcamento_s': 0.0,
+    'espera_novas_tentativas_s': 0.0,
+}
+
+def _contar(metrica, quantidade=1):
+    with _lock_metricas:
+        _metricas[metrica] += quantidade
+
+# Função para consultar as métricas das requisições
+def metricas_requisicoes():
+    """Retorna uma cópia das métricas de requisições, novas tentativas e limitação"""
+    with _lock_metricas:
+        return dict(_metricas)
+
+def _aguardar_orcamento():
+    """Bloqueia até haver espaço no orçamento de requisições do último minuto"""
+    esperou = 0.0
+    while True:
+        with _lock_orcamento:
+            agora = time.monotonic()
+            while _requisicoes_recentes and agora - _requisicoes_recentes[0] >= JANELA_ORCAMENTO:
+                _requisicoes_recentes.popleft()
+            if len(_requisicoes_recentes) < REQUISICOES_POR_MINUTO:
+                _requisicoes_recentes.append(agora)
+                break
+            espera = JANELA_ORCAMENTO - (agora - _requisicoes_recentes[0])
+
+        time.sleep(espera)
+        esperou += espera
+
+    if esperou:
+        _contar('limitadas')
+        _contar('espera_orcamento_s', esperou)
+
+def _erro_transitorio(erro):
+    """Identifica erros que valem nova tentativa e registra o tipo nas métricas"""
+    if isinstance(erro, APIError):
+        status = erro.response.status_code
+        if status == 429:
+            _contar('erros_429')
+        elif status >= 500:
+            _contar('erros_5xx')
+        return status in STATUS_TRANSITORIOS
+    if isinstance(erro, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        _contar('erros_conexao')
+        return True
+    return False
+
+# Função para executar uma chamada ao Google respeitando cota e erros transitórios
+def executar_requisicao(funcao, *args, **kwargs):
+    """Chama funcao(*args, **kwargs) dentro do orçamento por minuto, com backoff exponencial e jitter
+
+    Erros definitivos (404, 403, credenciais) são repassados na hora; os transitórios
+    são repetidos até MAX_TENTATIVAS antes de serem repassados.
+    """
+    for tentativa in range(MAX_TENTATIVAS):
+        _aguardar_orcamento()
+        _contar('requisicoes')
+        try:
+            return funcao(*args, **kwargs)
+        except Exception as e:
+            if not _erro_transitorio(e) or tentativa == MAX_TENTATIVAS - 1:
+                _contar('falhas')
+                raise
+
+        # Full jitter: espera aleatória até o teto exponencial, para as sessões não baterem juntas
+        espera = random.uniform(0, min(ESPERA_MAXIMA, ESPERA_INICIAL * 2 ** tentativa))
+        _contar('novas_tentativas')
+        _contar('espera_novas_tentativas_s', espera)
+        time.sleep(espera)
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+import cache_disco
+from ingestao import montar_dataframe_tipado
+
+
+# Várias sessões abrindo o painel ao mesmo tempo leem os snapshots em disco uma vez só
+def test_snapshot_carregado_uma_vez_entre_sessoes(monkeypatch):
+    leituras = []
+
+    def carregar_snapshots(planilha_id, abas):
+        leituras.append(planilha_id)
+        time.sleep(0.2)
+        return {'valores': {'Aba': [['a']]}, 'versoes': {'Aba': 'v1'}, 'buscado_em': datetime.now(), 'versao_planilha': None}
+
+    monkeypatch.setattr(cache_disco, '_valores_memoria', {})
+    monkeypatch.setattr(cache_disco, '_carregar_snapshots_com_horario', carregar_snapshots)
+    monkeypatch.setattr(cache_disco, '_iniciar_atualizacao', lambda *args: None)
+
+    resultados = []
+    threads = [
+        threading.Thread(target=lambda: resultados.append(
+            cache_disco.obter_valores_com_snapshot('P', ['Aba'], buscar=None)
+        ))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert leituras == ['P']
+    assert len(resultados) == 8
+    assert all(valores is resultados[0][0] for valores, _ in resultados)
+
+
+CABECALHO_PAXS = ['dia', 'mês', 'ano', 'Guia', 'Total_Paxs', 'All Inclusive']
+MATRIZ_PAXS = [
+    CABECALHO_PAXS,
+    ['10', 'Janeiro', '2025', 'Ana', '1', 'Não'],
+    ['20', 'Dezembro', '2024', 'Bia', '2', 'Não'],
+    ['', 'Janeiro', '', 'Caio', '3', 'Sim'],
+    ['5', 'Janeiro', '2025', 'Bia', '4', 'Não'],
+]
+
+
+@pytest.fixture
+def diretorio_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache_disco, 'DIRETORIO_CACHE', str(tmp_path))
+    return tmp_path
+
+
+def _arquivos(planilha_id, aba):
+    return sorted(os.path.basename(caminho) for caminho in cache_disco.arquivos_snapshot(planilha_id, aba))
+
+
+def _interromper_antes_do_cabecalho(monkeypatch):
+    """Faz a gravação parar depois das partições, antes do cabeçalho (que é gravado por último)"""
+    gravar = cache_disco._gravar_parquet
+
+    def gravar_ate_o_cabecalho(df, caminho, *args, **kwargs):
+        if os.path.basename(caminho) == f"{cache_disco.ARQUIVO_CABECALHO}.parquet":
+            raise OSError('processo encerrado')
+        return gravar(df, caminho, *args, **kwargs)
+
+    monkeypatch.setattr(cache_disco, '_gravar_parquet', gravar_ate_o_cabecalho)
+
+
+# Matriz de textos: um arquivo por mês (linhas sem data em sem_data), relida na ordem da planilha
+def test_snapshot_por_mes_da_matriz(diretorio_cache, monkeypatch):
+    cache_disco.salvar_snapshot('P', 'Dados In de Escala', MATRIZ_PAXS)
+    assert _arquivos('P', 'Dados In de Escala') == ['2024-12.parquet', '2025-01.parquet', '_cabecalho.parquet', 'sem_data.parquet']
+    valores, buscado_em = cache_disco.carregar_snapshot('P', 'Dados In de Escala')
+    assert valores == MATRIZ_PAXS
+    assert buscado_em is not None
+
+    # Gravação interrompida com um mês novo: as partições não batem com o total do cabeçalho
+    _interromper_antes_do_cabecalho(monkeypatch)
+    with pytest.raises(OSError):
+        cache_disco.salvar_snapshot('P', 'Dados In de Escala', MATRIZ_PAXS + [['1', 'Março', '2025', 'Ana', '9', 'Não']])
+    assert '2025-03.parquet' in _arquivos('P', 'Dados In de Escala')
+    assert cache_disco.carregar_snapshot('P', 'Dados In de Escala') is None
+
+
+# DataFrame tipado: mesmos tipos e mesma ordem na volta; meses sem mudança não são regravados
+def test_snapshot_por_mes_tipado(diretorio_cache, monkeypatch):
+    df = montar_dataframe_tipado(MATRIZ_PAXS, 'Dados In de Escala')
+    cache_disco.salvar_snapshot('P', 'Dados In de Escala', df)
+    assert _arquivos('P', 'Dados In de Escala') == ['2024-12.parquet', '2025-01.parquet', '_cabecalho.parquet', 'sem_data.parquet']
+    relido, _ = cache_disco.carregar_snapshot('P', 'Dados In de Escala')
+    assert_frame_equal(relido, df)
+
+    caminho_dezembro = os.path.join(cache_disco.diretorio_particoes('P', 'Dados In de Escala'), '2024-12.parquet')
+    gravado_em = os.stat(caminho_dezembro).st_mtime_ns
+    maior = montar_dataframe_tipado(MATRIZ_PAXS + [['1', 'Março', '2025', 'Ana', '9', 'Não']], 'Dados In de Escala')
+    cache_disco.salvar_snapshot('P', 'Dados In de Escala', maior)
+    assert os.stat(caminho_dezembro).st_mtime_ns == gravado_em
+    assert_frame_equal(cache_disco.carregar_snapshot('P', 'Dados In de Escala')[0], maior)
+
+    # Gravação interrompida com uma linha a menos: sobra uma partição antiga e o total não bate
+    _interromper_antes_do_cabecalho(monkeypatch)
+    with pytest.raises(OSError):
+        cache_disco.salvar_snapshot('P', 'Dados In de Escala', df)
+    assert cache_disco.carregar_snapshot('P', 'Dados In de Escala') is None
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+import carregamento
+from carregamento import contadores_voo_unico, executar_uma_vez
+
+SESSOES = 6
+
+
+@pytest.fixture(autouse=True)
+def contadores_limpos(monkeypatch):
+    monkeypatch.setattr(carregamento, '_buscas_em_andamento', {})
+    monkeypatch.setattr(carregamento, '_contadores_voo_unico', {})
+
+
+def _esperar_agrupadas(chave, quantidade):
+    """Espera as outras sessões entrarem na busca em andamento antes de liberá-la"""
+    limite = time.monotonic() + 5
+    while contadores_voo_unico().get(chave, {}).get('agrupadas', 0) < quantidade:
+        assert time.monotonic() < limite, 'as sessões não chegaram a se agrupar'
+        time.sleep(0.001)
+
+
+def _chamar_em_sessoes(chave, funcao):
+    """Chama executar_uma_vez em SESSOES threads; retorna dict sessão -> resultado ou exceção"""
+    saidas = {}
+
+    def sessao(numero):
+        try:
+            saidas[numero] = executar_uma_vez(chave, funcao)
+        except Exception as e:
+            saidas[numero] = e
+
+    threads = [threading.Thread(target=sessao, args=(numero,)) for numero in range(SESSOES)]
+    for thread in threads:
+        thread.start()
+    _esperar_agrupadas(chave, SESSOES - 1)
+    return threads, saidas
+
+
+# Sessões simultâneas: uma execução, o mesmo objeto para todas
+def test_chamadas_simultaneas_compartilham_uma_execucao():
+    liberar = threading.Event()
+    execucoes = []
+
+    def buscar():
+        execucoes.append(threading.current_thread().name)
+        liberar.wait(5)
+        return {'valores': [1, 2, 3]}
+
+    threads, saidas = _chamar_em_sessoes(('buscar', 'P'), buscar)
+    liberar.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(execucoes) == 1
+    assert len(saidas) == SESSOES
+    assert all(saida is saidas[0] for saida in saidas.values())
+    assert contadores_voo_unico()[('buscar', 'P')] == {'execucoes': 1, 'agrupadas': SESSOES - 1}
+
+
+# O erro da execução chega a todas as sessões que esperavam (a mesma exceção)
+def test_erro_repassado_a_todas_as_chamadas():
+    liberar = threading.Event()
+    erro = RuntimeError('cota esgotada')
+
+    def buscar():
+        liberar.wait(5)
+        raise erro
+
+    threads, saidas = _chamar_em_sessoes(('buscar', 'P'), buscar)
+    liberar.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(saida is erro for saida in saidas.values())
+    assert contadores_voo_unico()[('buscar', 'P')] == {'execucoes': 1, 'agrupadas': SESSOES - 1}
+
+
+# Terminada a busca, a próxima chamada executa de novo; chaves diferentes não se agrupam
+def test_chamadas_seguidas_executam_de_novo():
+    assert executar_uma_vez('a', lambda: 1) == 1
+    assert executar_uma_vez('a', lambda: 2) == 2
+    assert executar_uma_vez('b', lambda: 3) == 3
+    with pytest.raises(ValueError):
+        executar_uma_vez('a', lambda: int('x'))
+    assert executar_uma_vez('a', lambda: 4) == 4
+
+    assert contadores_voo_unico() == {
+        'a': {'execucoes': 4, 'agrupadas': 0},
+        'b': {'execucoes': 1, 'agrupadas': 0},
+    }
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from exibicao import configuracao_colunas, dados_exibicao
+
+
+# A tabela recebe números: moeda em reais (float), o resto como no grid
+def test_dados_exibicao_moeda_em_reais():
+    grid = pd.DataFrame({
+        'Vendedor': ['Ana', 'Bia'],
+        'Vendas Luck': pd.Series([123456, 5], dtype='int64'),
+        'Paxs In': [12.5, 0.0],
+        'Alcance de Meta': [1.2, 0.5],
+    })
+    exibido = dados_exibicao(grid)
+    assert exibido['Vendas Luck'].tolist() == [1234.56, 0.05]
+    assert exibido['Paxs In'].tolist() == [12.5, 0.0]
+    assert exibido['Alcance de Meta'].tolist() == [1.2, 0.5]
+    assert grid['Vendas Luck'].tolist() == [123456, 5]
+
+    configuracoes = configuracao_colunas(grid)
+    assert set(configuracoes) == {'Vendas Luck', 'Paxs In', 'Alcance de Meta'}
+    assert configuracoes['Vendas Luck']['label'] == 'Vendas Luck (R$)'
+    assert configuracoes['Vendas Luck']['type_config']['format'] == 'localized'
+    assert configuracoes['Alcance de Meta']['type_config']['format'] == 'percent'
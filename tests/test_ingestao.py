@@ -0,0 +1,22 @@
+from ingestao import formato_get_all_records, juntar_dataframes_tipados, montar_dataframe_tipado
+
+CABECALHO_VENDAS = ['Dia', 'Mês', 'ano', 'Vendedor', 'Valor Real', 'Valor Final', 'Tipo de Serviço', 'All Inclusive', 'Observação']
+
+
+def _linha(dia, observacao):
+    return [dia, 'Março', '2025', 'Ana', 'R$ 1.234,56', 'R$ 10,00', 'Passeio', 'Sim', observacao]
+
+
+# A função externa de vendas All Inclusive com adicionais lê a aba como get_all_records() devolvia
+def test_formato_get_all_records_com_nomes_da_planilha():
+    partes = [
+        montar_dataframe_tipado([CABECALHO_VENDAS, _linha('1', 'a')], 'Dados Finais Vendas', compactar=False),
+        montar_dataframe_tipado([CABECALHO_VENDAS, _linha('2', 'b')], 'Dados Finais Vendas', compactar=False),
+    ]
+    df = juntar_dataframes_tipados(partes, 'Dados Finais Vendas')
+    assert 'dia' in df.columns and 'Valor Real Centavos' in df.columns
+
+    registros = formato_get_all_records(df[df['dia'] == 2])
+    assert registros.columns.tolist() == CABECALHO_VENDAS
+    assert registros.index.tolist() == [0]
+    assert registros.iloc[0].tolist() == [2, 'Março', 2025, 'Ana', 'R$ 1.234,56', 'R$ 10,00', 'Passeio', 'Sim', 'b']
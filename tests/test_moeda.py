@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from moeda import (
+    converter_moeda_centavos, valor_moeda_centavos, aplicar_percentual_centavos,
+    centavos_para_reais, formatar_centavos_brl,
+)
+
+
+# Meio centavo: arredondado para longe do zero, sem o erro do float (2.675 * 100 = 267.4999...)
+@pytest.mark.parametrize('texto, centavos', [
+    ('R$ 0,005', 1),
+    ('R$ 0,004', 0),
+    ('R$ 2,675', 268),
+    ('R$ 1,125', 113),
+    ('-R$ 0,005', -1),
+])
+def test_meio_centavo_em_texto(texto, centavos):
+    assert valor_moeda_centavos(texto) == centavos
+    assert converter_moeda_centavos(pd.Series([texto])).tolist() == [centavos]
+
+
+def test_meio_centavo_em_coluna_float_igual_ao_texto():
+    serie = pd.Series([2.675, 1.125, 0.125, -0.125, np.nan])
+    assert converter_moeda_centavos(serie).tolist() == [268, 113, 13, -13, 0]
+
+
+@pytest.mark.parametrize('texto', ['-R$ 1.234,56', 'R$ -1.234,56', '-R$\xa01.234,56', '- R$ 1.234,56'])
+def test_negativos(texto):
+    assert valor_moeda_centavos(texto) == -123456
+
+
+def test_negativo_formatado():
+    assert formatar_centavos_brl(-123456) == 'R$ -1.234,56'
+    assert formatar_centavos_brl(-5) == 'R$ -0,05'
+
+
+def test_espaco_nao_separavel_da_planilha():
+    assert valor_moeda_centavos('R$\xa01.234,56') == 123456
+
+
+def test_valores_grandes_sem_perda():
+    texto = 'R$ 98.765.432.109.876,54'
+    assert valor_moeda_centavos(texto) == 9876543210987654
+    assert converter_moeda_centavos(pd.Series([texto])).dtype == 'int64'
+    assert formatar_centavos_brl(9876543210987654) == 'R$ 98.765.432.109.876,54'
+
+
+def test_invalidos_e_vazios_viram_zero():
+    serie = pd.Series(['', 'abc', None, 'R$', pd.NA], dtype=object)
+    assert converter_moeda_centavos(serie).tolist() == [0, 0, 0, 0, 0]
+
+
+def test_coluna_inteira_em_reais():
+    assert converter_moeda_centavos(pd.Series([3, -2])).tolist() == [300, -200]
+
+
+def test_coluna_mista_do_numericise():
+    serie = pd.Series(['R$ 1,10', 2, 0.1, 'R$ 1,10'], dtype=object)
+    assert converter_moeda_centavos(serie).tolist() == [110, 200, 10, 110]
+
+
+def test_total_exato():
+    # Em float, somar 0,10 dez mil vezes não dá 1000,00 exatos
+    serie = pd.Series(['R$ 0,10'] * 10000 + ['R$ 0,20'] * 10000)
+    total = converter_moeda_centavos(serie).sum()
+    assert total == 300000
+    assert formatar_centavos_brl(total) == 'R$ 3.000,00'
+
+
+@pytest.mark.parametrize('centavos, percentual, parcela', [
+    (12345, '5%', 617),        # 617,25
+    (50, '5%', 3),             # 2,5: meio centavo para cima, não para o par
+    (10000, '3,5%', 350),      # vírgula decimal
+    (10000, '3.5%', 350),
+    (33333, '33,3333%', 11111),
+    (12345, 5, 617),           # número em pontos percentuais
+    (-50, '5%', -3),
+    (12345, '', 0),
+    (12345, 'abc', 0),
+])
+def test_parcela_de_comissao(centavos, percentual, parcela):
+    resultado = aplicar_percentual_centavos(pd.Series([centavos]), pd.Series([percentual], dtype=object))
+    assert resultado.tolist() == [parcela]
+    assert resultado.dtype == 'int64'
+
+
+def test_parcelas_e_total_de_comissao_batem():
+    vendas = pd.Series([10001, 20002, 30003, 99999], index=[7, 3, 9, 1])
+    luck = aplicar_percentual_centavos(vendas, pd.Series(['10%', '0%', '7,5%', '12%'], index=vendas.index))
+    premiacao = aplicar_percentual_centavos(vendas, pd.Series(['1%', '2%', '0%', '1,5%'], index=vendas.index))
+    assert luck.index.tolist() == [7, 3, 9, 1]
+    assert luck.tolist() == [1000, 0, 2250, 12000]
+    assert premiacao.tolist() == [100, 400, 0, 1500]
+    total = luck + premiacao
+    assert total.tolist() == [1100, 400, 2250, 13500]
+    assert total.sum() == luck.sum() + premiacao.sum() == 17250
+
+
+def test_centavos_para_reais_so_na_exibicao():
+    assert centavos_para_reais(123456) == 1234.56
+    assert centavos_para_reais(pd.Series([100, None])).tolist() == [1.0, 0.0]
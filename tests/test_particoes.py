@@ -0,0 +1,92 @@
+import pandas as pd
+
+from ingestao import montar_dataframe_tipado
+from particoes import chaves_particao, mascara_periodo, particionar, selecionar_periodo
+
+CABECALHO_PAXS = ['dia', 'mês', 'ano', 'Guia', 'Total_Paxs', 'All Inclusive']
+
+
+def _paxs(linhas):
+    return montar_dataframe_tipado([CABECALHO_PAXS] + linhas, 'Dados In de Escala')
+
+
+# Linhas fora de ordem na planilha, virada de ano e linhas sem data válida
+LINHAS_PAXS = [
+    ['10', 'Janeiro', '2025', 'Ana', '1', 'Não'],
+    ['20', 'Dezembro', '2024', 'Bia', '2', 'Não'],
+    ['5', 'Janeiro', '2025', 'Caio', '3', 'Sim'],
+    ['', 'Janeiro', '2025', 'Ana', '4', 'Não'],
+    ['31', 'Novembro', '2024', 'Bia', '5', 'Não'],
+    ['1', 'Fevereiro', '2025', 'Ana', '6', 'Não'],
+    ['2', 'Mes Errado', '2024', 'Caio', '7', 'Não'],
+]
+
+
+def test_particionar_por_ano_e_mes():
+    df = _paxs(LINHAS_PAXS)
+    particoes = particionar(df, 'Dados In de Escala')
+
+    assert set(particoes) == {None, (2024, 12), (2025, 1), (2025, 2)}
+    assert particoes[(2025, 1)].index.tolist() == [0, 2]
+    assert particoes[(2024, 12)].index.tolist() == [1]
+    # Sem data (dia vazio, 31/11, mês inválido): nenhum período seleciona essas linhas
+    assert sum(len(parte) for parte in particoes.values()) == 4
+    assert particoes[None].empty and particoes[None].columns.equals(df.columns)
+
+
+def test_selecionar_periodo_na_virada_do_ano_volta_a_ordem_da_planilha():
+    df = _paxs(LINHAS_PAXS)
+    particoes = particionar(df, 'Dados In de Escala')
+
+    periodo = selecionar_periodo(particoes, 2024, 12, 2025, 1)
+    assert periodo.index.tolist() == [0, 1, 2]
+    assert periodo['Guia'].astype(str).tolist() == ['Ana', 'Bia', 'Caio']
+
+    assert selecionar_periodo(particoes, 2025, 1, 2025, 2).index.tolist() == [0, 2, 5]
+    sem_dados = selecionar_periodo(particoes, 2023, 1, 2023, 12)
+    assert sem_dados.empty and sem_dados.columns.equals(df.columns)
+
+
+# Aba sem as colunas de partição: uma partição só, devolvida em qualquer período
+def test_selecionar_periodo_sem_colunas_de_particao():
+    df = pd.DataFrame({'Guia': ['Ana', 'Bia']})
+    particoes = particionar(df, 'Dados In de Escala')
+    assert selecionar_periodo(particoes, 2025, 1, 2025, 1)['Guia'].tolist() == ['Ana', 'Bia']
+
+
+def test_chaves_particao_sem_data():
+    ano = pd.Series([2025, 2024, float('nan'), 2025], index=[3, 1, 7, 9])
+    mes = pd.Series([1, 12, 5, float('nan')], index=[3, 1, 7, 9])
+    chaves = chaves_particao(ano, mes)
+    assert chaves.index.tolist() == [3, 1, 7, 9]
+    assert chaves.tolist() == ['2025-01', '2024-12', 'sem_data', 'sem_data']
+
+
+# Período inclusivo nas duas pontas, atravessando o mês; datas inválidas nunca entram
+def test_mascara_periodo_inclusiva():
+    df = _paxs([
+        ['14', 'Março', '2025', 'Ana', '1', 'Não'],
+        ['15', 'Março', '2025', 'Ana', '1', 'Não'],
+        ['31', 'Março', '2025', 'Ana', '1', 'Não'],
+        ['1', 'Abril', '2025', 'Ana', '1', 'Não'],
+        ['10', 'Abril', '2025', 'Ana', '1', 'Não'],
+        ['11', 'Abril', '2025', 'Ana', '1', 'Não'],
+        ['15', 'Março', '2024', 'Ana', '1', 'Não'],
+        ['31', 'Abril', '2025', 'Ana', '1', 'Não'],
+        ['', 'Março', '2025', 'Ana', '1', 'Não'],
+        ['20', 'Mes Errado', '2025', 'Ana', '1', 'Não'],
+        ['20', 'Março', '', 'Ana', '1', 'Não'],
+    ])
+    mascara = mascara_periodo(df, 15, 3, 2025, 10, 4, 2025)
+    assert mascara.index.equals(df.index)
+    assert mascara.tolist() == [False, True, True, True, True, False, False, False, False, False, False]
+
+
+# Um dia só: início e fim iguais
+def test_mascara_periodo_de_um_dia():
+    df = _paxs([
+        ['9', 'Abril', '2025', 'Ana', '1', 'Não'],
+        ['10', 'Abril', '2025', 'Ana', '1', 'Não'],
+        ['11', 'Abril', '2025', 'Ana', '1', 'Não'],
+    ])
+    assert mascara_periodo(df, 10, 4, 2025, 10, 4, 2025).tolist() == [False, True, False]
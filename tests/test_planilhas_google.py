@@ -0,0 +1,228 @@
+import re
+
+import gspread
+import pytest
+from gspread.utils import a1_to_rowcol
+from pandas.testing import assert_frame_equal
+
+import planilhas_google as pg
+from ingestao import montar_dataframe_tipado
+
+
+class PlanilhaFalsa:
+    """Spreadsheet em memória: values_batch_get por colunas e metadados com o tamanho da grade"""
+
+    def __init__(self, abas, linhas_extras=0):
+        self.abas = abas  # título -> matriz de linhas (cabeçalho na primeira)
+        self.linhas_extras = linhas_extras
+        self.chamadas = []
+
+    def values_batch_get(self, intervalos, params=None):
+        self.chamadas.append(list(intervalos))
+        return {'valueRanges': [self._ler(intervalo) for intervalo in intervalos]}
+
+    def fetch_sheet_metadata(self, params=None):
+        return {'sheets': [
+            {'properties': {'title': titulo, 'gridProperties': {'rowCount': len(grade) + self.linhas_extras}}}
+            for titulo, grade in self.abas.items()
+        ]}
+
+    def get_worksheet_by_id(self, gid):
+        raise gspread.exceptions.WorksheetNotFound(gid)
+
+    def _ler(self, intervalo):
+        titulo, faixa = re.match(r"'(.*)'(?:!(.*))?$", intervalo).groups()
+        grade = self.abas[titulo]
+        largura = max((len(linha) for linha in grade), default=0)
+        linha_inicial, coluna_inicial, linha_final, coluna_final = 1, 1, len(grade), largura
+        if faixa:
+            inicio, fim = faixa.split(':')
+            if inicio.isdigit():
+                linha_inicial, linha_final = int(inicio), int(fim) if fim else len(grade)
+            else:
+                letras_inicio, numero_inicio = re.match(r'([A-Z]+)(\d*)', inicio).groups()
+                letras_fim, numero_fim = re.match(r'([A-Z]+)(\d*)', fim).groups()
+                coluna_inicial = a1_to_rowcol(f"{letras_inicio}1")[1]
+                coluna_final = a1_to_rowcol(f"{letras_fim}1")[1]
+                linha_inicial = int(numero_inicio) if numero_inicio else 1
+                linha_final = int(numero_fim) if numero_fim else len(grade)
+        colunas = []
+        for coluna in range(coluna_inicial - 1, coluna_final):
+            celulas = [
+                grade[linha][coluna] if linha < len(grade) and coluna < len(grade[linha]) else ''
+                for linha in range(linha_inicial - 1, min(linha_final, len(grade)))
+            ]
+            # A API omite células vazias no fim de cada coluna e colunas vazias no fim da faixa
+            while celulas and celulas[-1] == '':
+                celulas.pop()
+            colunas.append(celulas)
+        while colunas and not colunas[-1]:
+            colunas.pop()
+        return {'values': colunas} if colunas else {}
+
+
+@pytest.fixture
+def instalar_planilha(monkeypatch):
+    """Coloca a planilha falsa no pool como 'P', sem snapshots nem conferência em disco"""
+    def instalar(planilha):
+        pg.limpar_conexoes()
+        monkeypatch.setattr(pg, '_cabecalhos', {})
+        monkeypatch.setattr(pg, '_estado_incremental', {})
+        monkeypatch.setattr(pg, '_progresso_leituras', {})
+        monkeypatch.setattr(pg, 'obter_cliente', lambda: object())
+        monkeypatch.setattr(pg, 'carregar_snapshot', lambda *args: None)
+        monkeypatch.setattr(pg, 'carregar_conferencia', lambda *args: None)
+        monkeypatch.setattr(pg, 'salvar_conferencia', lambda *args: None)
+        pg._planilhas_abertas['P'] = planilha
+        return planilha
+    yield instalar
+    pg.limpar_conexoes()
+
+
+# Aba por gid que não existe mais na planilha: erro com o gid e a planilha, não AttributeError
+def test_gid_inexistente_tem_erro_claro(instalar_planilha):
+    instalar_planilha(PlanilhaFalsa({'Meta Diaria': [['Vendedor', 'Data', 'Meta Diaria']]}))
+    with pytest.raises(gspread.exceptions.WorksheetNotFound, match='gid 123 .* planilha P'):
+        pg.ler_valores_em_lote('P', ['Meta Diaria', 123])
+
+
+CABECALHO_COMISSAO = ['Extra', 'Data da Venda', 'Vendedor', 'Código da Reserva', 'Serviço', 'Valor da Venda']
+ABAS_VENDEDORES = ('Dados Vendedores', 'Comissão')
+
+
+def _linha_comissao(i):
+    return [f"x{i}", f"{1 + i % 28:02d}/03/2025", ['Ana', 'Bia'][i % 2], f"R{i}", 'Passeio', f"R$ {i},00"]
+
+
+def _planilha_comissao(total):
+    return PlanilhaFalsa({
+        'Dados Vendedores': [['Vendedor', 'mês', 'Ano'], ['Ana', '3', '2025']],
+        'Comissão': [list(CABECALHO_COMISSAO)] + [_linha_comissao(i) for i in range(total)],
+    })
+
+
+def _esperado(grade):
+    """O DataFrame de uma leitura única da aba, só com as colunas usadas pelo painel"""
+    cabecalho = grade[0]
+    indices = [i for i, nome in enumerate(cabecalho) if nome in pg.COLUNAS_PROJETADAS['Comissão']]
+    return montar_dataframe_tipado([[linha[i] if i < len(linha) else '' for i in indices] for linha in grade], 'Comissão')
+
+
+def _ler_comissao(planilha):
+    """DataFrame da Comissão e quantas chamadas de values_batch_get a leitura fez"""
+    antes = len(planilha.chamadas)
+    valores = pg.ler_valores_em_lote('P', ABAS_VENDEDORES)
+    return valores['Comissão'], len(planilha.chamadas) - antes
+
+
+# Linhas novas no fim: uma única chamada (cabeçalho, conferência e linhas novas) e só elas são tipadas
+def test_incremento_anexa_linhas_novas(instalar_planilha):
+    planilha = instalar_planilha(_planilha_comissao(12))
+    grade = planilha.abas['Comissão']
+    _ler_comissao(planilha)
+
+    grade.extend(_linha_comissao(100 + i) for i in range(3))
+    df, chamadas = _ler_comissao(planilha)
+    assert chamadas == 1
+    assert any(intervalo.endswith('!B14:F') for intervalo in planilha.chamadas[-1])
+    assert_frame_equal(df, _esperado(grade))
+
+    # Nada mudou: a mesma chamada, sem linhas novas, devolve os valores conhecidos
+    df_igual, chamadas = _ler_comissao(planilha)
+    assert chamadas == 1
+    assert df_igual is df
+
+
+# Edição nas linhas conferidas: a aba é relida por inteiro
+def test_edicao_na_janela_de_conferencia_recarrega(instalar_planilha):
+    planilha = instalar_planilha(_planilha_comissao(12))
+    grade = planilha.abas['Comissão']
+    _ler_comissao(planilha)
+
+    grade[-2] = grade[-2][:5] + ['R$ 999,00']
+    df, chamadas = _ler_comissao(planilha)
+    assert chamadas > 1
+    assert_frame_equal(df, _esperado(grade))
+    assert df['Valor da Venda Centavos'].iloc[-2] == 99900
+
+
+# Linha removida no fim: a conferência vem mais curta e a aba é relida
+def test_remocao_de_linha_recarrega(instalar_planilha):
+    planilha = instalar_planilha(_planilha_comissao(12))
+    grade = planilha.abas['Comissão']
+    _ler_comissao(planilha)
+
+    del grade[-1]
+    df, chamadas = _ler_comissao(planilha)
+    assert chamadas > 1
+    assert len(df) == 11
+    assert_frame_equal(df, _esperado(grade))
+
+
+# Coluna inserida antes das usadas: o cabeçalho não confere, a projeção é refeita e a aba relida
+def test_mudanca_de_cabecalho_recarrega(instalar_planilha):
+    planilha = instalar_planilha(_planilha_comissao(12))
+    grade = planilha.abas['Comissão']
+    _ler_comissao(planilha)
+
+    for posicao, linha in enumerate(grade):
+        linha.insert(1, 'Nova' if posicao == 0 else f"n{posicao}")
+    grade.append(['x', 'n', '15/03/2025', 'Caio', 'R200', 'Transfer', 'R$ 7,00'])
+    df, chamadas = _ler_comissao(planilha)
+    assert chamadas > 1
+    assert_frame_equal(df, _esperado(grade))
+    assert df['Vendedor'].iloc[-1] == 'Caio'
+
+    # A próxima leitura volta a ser incremental, já com a projeção nova
+    _, chamadas = _ler_comissao(planilha)
+    assert chamadas == 1
+
+
+def _ler_em_blocos(planilha, tamanho_bloco, monkeypatch):
+    monkeypatch.setattr(pg, 'TAMANHO_BLOCO_LINHAS', tamanho_bloco)
+    # Sem cabeçalho conhecido a leitura traz todas as colunas da aba
+    df, base = pg._ler_em_blocos(planilha, 'P', 'Comissão', 'Comissão')
+    return df, base, pg.progresso_leituras()[('P', 'Comissão')]
+
+
+# Janela inteira vazia no meio da aba: a leitura continua e as linhas vazias ficam no lugar
+def test_blocos_continuam_depois_de_janela_vazia(instalar_planilha, monkeypatch):
+    planilha = instalar_planilha(_planilha_comissao(14))
+    grade = planilha.abas['Comissão']
+    for posicao in range(5, 11):
+        grade[posicao] = []
+    planilha.linhas_extras = 3
+
+    df, base, progresso = _ler_em_blocos(planilha, 4, monkeypatch)
+    assert_frame_equal(df, montar_dataframe_tipado(grade, 'Comissão'))
+    assert (df['Vendedor'].iloc[4:10] == '').all()
+    assert base['total_linhas'] == len(grade)
+    assert [pg._aparar(linha) for linha in base['final']] == [pg._aparar(linha) for linha in grade[-pg.LINHAS_CONFERENCIA:]]
+    # 15 linhas e 3 em branco na grade: 5 janelas de 4 linhas, sem pedir além da grade
+    assert progresso == {'linhas': 14, 'blocos': 5, 'concluida': True}
+
+
+# Total de linhas múltiplo exato do bloco: nenhuma janela extra depois da última
+def test_blocos_com_total_multiplo_do_bloco(instalar_planilha, monkeypatch):
+    planilha = instalar_planilha(_planilha_comissao(11))
+
+    df, base, progresso = _ler_em_blocos(planilha, 4, monkeypatch)
+    assert_frame_equal(df, montar_dataframe_tipado(planilha.abas['Comissão'], 'Comissão'))
+    assert base['total_linhas'] == 12
+    assert progresso == {'linhas': 11, 'blocos': 3, 'concluida': True}
+    assert [intervalos[0].split('!')[1] for intervalos in planilha.chamadas] == ['1:4', '5:8', '9:12']
+
+
+# Tipar janela a janela e juntar no fim dá o mesmo DataFrame (e as mesmas categorias) de uma leitura única
+def test_blocos_iguais_a_leitura_unica(instalar_planilha, monkeypatch):
+    planilha = instalar_planilha(_planilha_comissao(30))
+    grade = planilha.abas['Comissão']
+    grade[7] = ['x7', '01/02/2025', 'Caio', 'R7', 'Transfer', 'R$ 1.234,56']
+    grade[25] = ['x25', '02/04/2025', 'Duda', 'R25', 'Ingresso', '']
+
+    em_blocos, _, _ = _ler_em_blocos(planilha, 4, monkeypatch)
+    leitura_unica, _, _ = _ler_em_blocos(planilha, 1000, monkeypatch)
+    assert_frame_equal(em_blocos, leitura_unica)
+    assert_frame_equal(em_blocos, montar_dataframe_tipado(grade, 'Comissão'))
+    # Categorias das janelas juntadas: 'Transfer' e 'Ingresso' aparecem em janelas diferentes
+    assert sorted(em_blocos['Serviço'].cat.categories) == ['Ingresso', 'Passeio', 'Transfer']
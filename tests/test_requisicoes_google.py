@@ -0,0 +1,115 @@
+import json
+from collections import deque
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+import requisicoes_google as rg
+
+
+class RelogioFalso:
+    """Substitui o módulo time: sleep só avança o relógio e fica registrado"""
+
+    def __init__(self):
+        self.agora = 1000.0
+        self.esperas = []
+
+    def monotonic(self):
+        return self.agora
+
+    def sleep(self, segundos):
+        self.esperas.append(segundos)
+        self.agora += segundos
+
+
+def _erro_api(status):
+    resposta = requests.Response()
+    resposta.status_code = status
+    resposta._content = json.dumps({'error': {'code': status, 'message': 'erro', 'status': 'ERRO'}}).encode()
+    return APIError(resposta)
+
+
+def _falhar(*erros, resultado='ok'):
+    """Função que levanta os erros na ordem e depois devolve resultado; conta as chamadas"""
+    pendentes = list(erros)
+
+    def funcao():
+        funcao.chamadas += 1
+        if pendentes:
+            raise pendentes.pop(0)
+        return resultado
+
+    funcao.chamadas = 0
+    return funcao
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = RelogioFalso()
+    monkeypatch.setattr(rg, 'time', relogio)
+    # Jitter no teto: a espera de cada tentativa é o próprio teto exponencial
+    monkeypatch.setattr(rg.random, 'uniform', lambda minimo, maximo: maximo)
+    monkeypatch.setattr(rg, '_requisicoes_recentes', deque())
+    monkeypatch.setattr(rg, '_metricas', dict.fromkeys(rg._metricas, 0))
+    return relogio
+
+
+# 429, 5xx e quedas de conexão são repetidos; o resultado da tentativa seguinte é devolvido
+@pytest.mark.parametrize('erro', [
+    _erro_api(429), _erro_api(500), _erro_api(503),
+    requests.exceptions.ConnectionError(), requests.exceptions.Timeout(),
+])
+def test_erros_transitorios_sao_repetidos(relogio, erro):
+    funcao = _falhar(erro)
+    assert rg.executar_requisicao(funcao) == 'ok'
+    assert funcao.chamadas == 2
+    assert relogio.esperas == [rg.ESPERA_INICIAL]
+    assert rg.metricas_requisicoes()['novas_tentativas'] == 1
+
+
+# 403, 404 e erros que não são da API são repassados na primeira tentativa, sem espera
+@pytest.mark.parametrize('erro', [_erro_api(403), _erro_api(404), _erro_api(400), ValueError('credenciais')])
+def test_erros_definitivos_sao_repassados(relogio, erro):
+    funcao = _falhar(erro)
+    with pytest.raises(type(erro)):
+        rg.executar_requisicao(funcao)
+    assert funcao.chamadas == 1
+    assert relogio.esperas == []
+    assert rg.metricas_requisicoes()['falhas'] == 1
+
+
+# Backoff exponencial limitado a ESPERA_MAXIMA; depois de MAX_TENTATIVAS o erro é repassado
+def test_backoff_limitado_e_tentativas_esgotadas(relogio, monkeypatch):
+    monkeypatch.setattr(rg, 'MAX_TENTATIVAS', 8)
+    funcao = _falhar(*[_erro_api(503) for _ in range(8)])
+    with pytest.raises(APIError):
+        rg.executar_requisicao(funcao)
+    assert funcao.chamadas == 8
+    assert relogio.esperas == [1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 32.0]
+    metricas = rg.metricas_requisicoes()
+    assert metricas['erros_5xx'] == 8
+    assert metricas['falhas'] == 1
+    assert metricas['espera_novas_tentativas_s'] == sum(relogio.esperas)
+
+
+# Orçamento em janela deslizante: a 51ª chamada do minuto espera a mais antiga sair da janela
+def test_orcamento_por_minuto_em_janela_deslizante(relogio):
+    for i in range(rg.REQUISICOES_POR_MINUTO):
+        rg.executar_requisicao(lambda: None)
+        relogio.agora += 0.5
+    assert relogio.esperas == []
+
+    # A primeira chamada foi em 1000.0 e o relógio está em 1025.0: faltam 35 s para ela sair
+    rg.executar_requisicao(lambda: None)
+    assert relogio.esperas == [35.0]
+    assert relogio.agora == 1060.0
+
+    # A janela desliza: a próxima só espera a segunda chamada (1000.5) sair
+    rg.executar_requisicao(lambda: None)
+    assert relogio.esperas == [35.0, 0.5]
+
+    metricas = rg.metricas_requisicoes()
+    assert metricas['limitadas'] == 2
+    assert metricas['espera_orcamento_s'] == 35.5
+    assert metricas['requisicoes'] == rg.REQUISICOES_POR_MINUTO + 2
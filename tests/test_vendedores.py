@@ -0,0 +1,56 @@
+import pandas as pd
+
+from ingestao import montar_dataframe_tipado
+from vendedores import dimensao_da_fonte, paxs_in_do_grid
+
+CABECALHO_PAXS = ['dia', 'mês', 'ano', 'Guia', 'Total_Paxs', 'All Inclusive']
+
+
+def _paxs(linhas):
+    return montar_dataframe_tipado([CABECALHO_PAXS] + linhas, 'Dados In de Escala')
+
+
+# Total_Paxs vem da planilha como '3,00': são 3 paxs (numericise dava 300, e o grid dividia por 100)
+def test_paxs_in_do_grid_a_partir_da_matriz():
+    df_paxs = _paxs([
+        ['1', 'Março', '2025', 'Ana', '3,00', 'Não'],
+        ['2', 'Março', '2025', 'ana ', '12,5', 'Não'],
+        ['3', 'Março', '2025', 'Bia', '7', 'Não'],
+        ['4', 'Março', '2025', 'Bia', '2,00', 'Sim'],
+        ['5', 'Abril', '2025', 'Ana', '100,00', 'Não'],
+    ])
+    grid = pd.DataFrame({'Vendedor': ['Ana', 'Bia', 'Caio']})
+
+    paxs_in = paxs_in_do_grid(grid, df_paxs, 'Não', 1, 3, 2025, 31, 3, 2025)
+    assert paxs_in.tolist() == [15.5, 7.0, 0.0]
+
+    paxs_in_ai = paxs_in_do_grid(grid, df_paxs, 'Sim', 1, 3, 2025, 31, 3, 2025)
+    assert paxs_in_ai.tolist() == [0.0, 2.0, 0.0]
+
+
+def test_paxs_in_do_grid_sem_dados():
+    grid = pd.DataFrame({'Vendedor': ['Ana']}, index=[4])
+    paxs_in = paxs_in_do_grid(grid, pd.DataFrame(), 'Não', 1, 3, 2025, 31, 3, 2025)
+    assert paxs_in.index.tolist() == [4]
+    assert paxs_in.tolist() == [0.0]
+
+
+# O leitor do Google devolve as abas em blocos já tipadas; as demais como matriz
+def test_dimensao_da_fonte_com_matriz_e_dataframe():
+    comissao = montar_dataframe_tipado([
+        ['Data da Venda', 'Vendedor', 'Código da Reserva', 'Serviço', 'Valor da Venda'],
+        ['01/03/2025', 'Ana ', 'R1', 'Passeio', 'R$ 10,00'],
+        ['02/03/2025', 'Caio', 'R2', 'Passeio', 'R$ 5,00'],
+    ], 'Comissão')
+    valores = {
+        'Vendedores': [['Nome Do Vendedor', 'Tipo de Vendedor'], ['Ana', 'Guias'], ['Bia', 'Guias']],
+        'Comissão': comissao,
+    }
+
+    def leitor(planilha_id, abas):
+        return {aba: valores[aba] for aba in abas}
+
+    dimensao, _ = dimensao_da_fonte(leitor, [('P', ['Vendedores', 'Comissão'])])
+    assert sorted(dimensao['nome']) == ['Ana', 'Bia', 'Caio']
+    ana = dimensao[dimensao['nome'] == 'Ana'].iloc[0]
+    assert sorted(ana['abas']) == ['Comissão', 'Vendedores']
@@ -0,0 +1,155 @@
+import pandas as pd
+from ingestao import (
+    COLUNA_DATA, COLUNAS_NOME_ABAS, SEM_VENDEDOR, centavos_moeda, id_vendedor, ids_vendedores, montar_dataframe_tipado, nomes_normalizados
+)
+from esquemas import tem_colunas
+from particoes import mascara_periodo
+
+# Colunas da dimensão de vendedores
+COLUNAS_DIMENSAO = ['id_vendedor', 'nome', 'nome_normalizado', 'grafias', 'abas']
+
+# Função para montar a dimensão de vendedores de todas as abas
+def montar_dimensao_vendedores(fontes):
+    """Junta os nomes de vendedor das abas em uma tabela com um id por vendedor
+
+    fontes: iterável de (aba, df, coluna). Retorna (dimensao, ids_por_grafia): a dimensão
+    tem uma linha por id_vendedor, com o nome mais frequente, as grafias e as abas onde
+    aparece; ids_por_grafia leva cada grafia encontrada ao seu id.
+    """
+    partes = []
+    for aba, df, coluna in fontes:
+        if df is None or df.empty or coluna not in df.columns:
+            continue
+        partes.append(pd.DataFrame({
+            'id_vendedor': ids_vendedores(df, coluna).to_numpy(),
+            'grafia': df[coluna].astype(object).to_numpy(),
+            'nome_normalizado': nomes_normalizados(df, coluna).to_numpy(),
+            'aba': aba,
+        }))
+
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS_DIMENSAO), {}
+
+    nomes = pd.concat(partes, ignore_index=True)
+    nomes = nomes[nomes['id_vendedor'] != SEM_VENDEDOR]
+    nomes['grafia'] = nomes['grafia'].astype(str).str.strip()
+
+    contagem = nomes.groupby(['id_vendedor', 'grafia'], sort=False).size().rename('linhas').reset_index()
+    # Nome exibido: a grafia mais usada (empate: a primeira encontrada)
+    canonicos = contagem.sort_values('linhas', ascending=False, kind='stable').drop_duplicates('id_vendedor')
+
+    dimensao = pd.DataFrame({
+        'nome': canonicos.set_index('id_vendedor')['grafia'],
+        'nome_normalizado': nomes.groupby('id_vendedor')['nome_normalizado'].first(),
+        'grafias': contagem.groupby('id_vendedor')['grafia'].agg(sorted),
+        'abas': nomes.groupby('id_vendedor')['aba'].agg(lambda abas: sorted(set(abas))),
+    })
+    dimensao.index.name = 'id_vendedor'
+    dimensao = dimensao.reset_index().sort_values('nome', ignore_index=True)
+
+    ids_por_grafia = dict(zip(contagem['grafia'], contagem['id_vendedor']))
+    return dimensao[COLUNAS_DIMENSAO], ids_por_grafia
+
+# Função para somar uma coluna por vendedor
+def somar_por_vendedor(df, coluna_vendedor, coluna_valor, vendedores_list):
+    """Soma coluna_valor por id de vendedor e devolve dict vendedor -> soma (0 quando não houver linhas)"""
+    if df.empty:
+        return {vendedor: 0 for vendedor in vendedores_list}
+    somas = df[coluna_valor].groupby(ids_vendedores(df, coluna_vendedor).to_numpy(), sort=False).sum()
+    return {vendedor: somas.get(id_vendedor(vendedor), 0) for vendedor in vendedores_list}
+
+# Função para filtrar as linhas dos vendedores da lista
+def filtrar_vendedores(df, coluna_vendedor, vendedores_list):
+    """Linhas cujo vendedor tem o mesmo id de algum nome da lista"""
+    ids_lista = {id_vendedor(vendedor) for vendedor in vendedores_list}
+    return df[ids_vendedores(df, coluna_vendedor).isin(ids_lista).to_numpy()]
+
+# Função para montar a coluna de Paxs In de um grid de vendedores
+def paxs_in_do_grid(df_grid, df_paxs, all_inclusive, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final):
+    """Series alinhada a df_grid com a soma de Total_Paxs de cada vendedor (Guia) no período
+
+    all_inclusive: 'Sim' ou 'Não', valor da coluna All Inclusive das linhas somadas.
+    Total_Paxs já chega em paxs da ingestão ('3,00' -> 3.0); sem linhas, 0.
+    """
+    if df_paxs.empty or not tem_colunas(df_paxs, [COLUNA_DATA, 'Guia', 'Total_Paxs', 'All Inclusive']):
+        return pd.Series(0.0, index=df_grid.index)
+    mask_periodo = mascara_periodo(df_paxs, dia_inicial, mes_inicial, ano_inicial, dia_final, mes_final, ano_final)
+    df_filtrado = df_paxs[mask_periodo & (df_paxs['All Inclusive'] == all_inclusive)]
+    paxs = somar_por_vendedor(df_filtrado, 'Guia', 'Total_Paxs', df_grid['Vendedor'].tolist())
+    return df_grid['Vendedor'].map(paxs).fillna(0).astype(float)
+
+# Função para somar colunas de moeda por vendedor e mês
+def somar_por_vendedor_mes(df, coluna_vendedor, colunas_valor, coluna_ano='Ano', coluna_mes='mês'):
+    """Soma em centavos de cada coluna por (id_vendedor, ano, mes), em um único groupby
+
+    Colunas ausentes ficam de fora; linhas sem ano ou mês numéricos também (nenhum período as aceita).
+    """
+    colunas_valor = [coluna for coluna in colunas_valor if coluna in df.columns]
+    if df.empty or not colunas_valor or coluna_ano not in df.columns or coluna_mes not in df.columns:
+        return pd.DataFrame(columns=colunas_valor, dtype='int64')
+    valores = pd.DataFrame({coluna: centavos_moeda(df, coluna) for coluna in colunas_valor})
+    chaves = [
+        ids_vendedores(df, coluna_vendedor).rename('id_vendedor'),
+        pd.to_numeric(df[coluna_ano], errors='coerce').rename('ano'),
+        pd.to_numeric(df[coluna_mes], errors='coerce').rename('mes'),
+    ]
+    return valores.groupby(chaves, sort=True).sum()
+
+# Função para juntar aos vendedores de um grid a soma dos meses do período
+def somar_periodo_por_vendedor(somas, coluna_valor, df, coluna_vendedor, ano_inicial, mes_inicial, ano_final, mes_final):
+    """Series alinhada a df com a soma de coluna_valor (de somar_por_vendedor_mes) no período
+
+    O período é o mesmo dos filtros da aba Vendedores: ano entre ano_inicial e ano_final e
+    mês entre mes_inicial e mes_final. A junção é pelo id do vendedor; sem linhas, 0.
+    """
+    ids = ids_vendedores(df, coluna_vendedor)
+    if coluna_valor not in somas.columns or somas.empty:
+        return pd.Series(0, index=df.index, dtype='int64')
+    ano = somas.index.get_level_values('ano')
+    mes = somas.index.get_level_values('mes')
+    no_periodo = somas.loc[(ano >= ano_inicial) & (ano <= ano_final) & (mes >= mes_inicial) & (mes <= mes_final), coluna_valor]
+    por_id = no_periodo.groupby(level='id_vendedor').sum()
+    return ids.map(por_id).fillna(0).astype('int64')
+
+# Função para separar as linhas de cada vendedor
+def linhas_por_vendedor(df, coluna_vendedor):
+    """Dict id_vendedor -> DataFrame com as linhas desse vendedor (um único groupby)"""
+    if df.empty:
+        return {}
+    return dict(tuple(df.groupby(ids_vendedores(df, coluna_vendedor).to_numpy(), sort=False)))
+
+# Função para deixar uma linha por vendedor
+def unificar_vendedores(df, coluna_vendedor, outras_colunas=()):
+    """Remove grafias repetidas do mesmo vendedor, mantendo a primeira grafia encontrada"""
+    colunas = [coluna_vendedor, *outras_colunas]
+    unicos = df[colunas].copy()
+    unicos['id_vendedor'] = ids_vendedores(df, coluna_vendedor).to_numpy()
+    unicos = unicos.drop_duplicates(['id_vendedor', *outras_colunas])
+    return unicos[colunas].reset_index(drop=True)
+
+# Função para montar a dimensão de vendedores a partir das abas lidas da fonte configurada
+def dimensao_da_fonte(leitor, abas_por_planilha):
+    """abas_por_planilha: iterável de (planilha_id, abas). Usa só as abas com colunas de nome"""
+    fontes = []
+    for planilha_id, abas in abas_por_planilha:
+        abas_nomes = [aba for aba in abas if aba in COLUNAS_NOME_ABAS]
+        for aba, valores in leitor(planilha_id, abas_nomes).items():
+            # Abas lidas em blocos já chegam tipadas do leitor do Google
+            df = valores if isinstance(valores, pd.DataFrame) else montar_dataframe_tipado(valores, aba)
+            coluna = next((coluna for coluna in COLUNAS_NOME_ABAS[aba] if coluna in df.columns), None)
+            if coluna is not None:
+                fontes.append((aba, df, coluna))
+    return montar_dimensao_vendedores(fontes)
+
+if __name__ == '__main__':
+    # python vendedores.py  (lê da fonte de PAINEL_FONTE_DADOS)
+    from fontes_dados import obter_leitor_valores
+    from planilhas_google import (
+        PLANILHA_PRINCIPAL_ID, PLANILHA_VENDEDORES_ID, ABAS_PLANILHA_PRINCIPAL, ABAS_PLANILHA_VENDEDORES
+    )
+    dimensao, _ = dimensao_da_fonte(obter_leitor_valores(), (
+        (PLANILHA_PRINCIPAL_ID, ABAS_PLANILHA_PRINCIPAL), (PLANILHA_VENDEDORES_ID, ABAS_PLANILHA_VENDEDORES)
+    ))
+    for linha in dimensao.itertuples(index=False):
+        grafias = ' | '.join(linha.grafias)
+        print(f"{linha.id_vendedor:>20}  {linha.nome:<35} {', '.join(linha.abas):<60} {grafias}")